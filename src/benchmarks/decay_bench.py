@@ -0,0 +1,315 @@
+# benchmarks/decay_bench.py
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import resource
+import tempfile
+import subprocess
+import pandas as pd
+from datetime import datetime, timedelta
+from config import BASE_DIR, STORAGE_BACKEND, DECAY_MODE, CHAO_NAMES, EYE_TYPES, MOUTH_TYPES, GRADES
+from storage.schema import FILE_COUNTS, STAT_NAMES
+
+RESULTS_FILE = BASE_DIR / "benchmarks" / "decay_results.jsonl"
+# Metrics compared against the previous run with the same parameters; higher is worse for all of them.
+COMPARED = ("build_seconds", "sweep_seconds", "peak_rss_kb", "files_read", "files_written")
+
+
+# ------------------- Stub bot -------------------
+class FakeMember:
+    def __init__(self, user_id, name):
+        self.id = user_id
+        self.name = name
+        self.display_name = name.title()
+
+
+class FakeGuild:
+    def __init__(self, guild_id, name, members):
+        self.id = guild_id
+        self.name = name
+        self.members = {m.id: m for m in members}
+        self.system_channel = None
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+
+class FakeBot:
+    """Just enough of commands.Bot for DataUtils and ChaoDecay: guilds, cogs, readiness."""
+
+    def __init__(self, guilds):
+        self.guilds = guilds
+        self.cogs = {}
+
+    def get_guild(self, guild_id):
+        return next((g for g in self.guilds if g.id == guild_id), None)
+
+    def get_cog(self, name):
+        return self.cogs.get(name)
+
+    def get_user(self, user_id):
+        return None
+
+    async def wait_until_ready(self):
+        return None
+
+
+def fake_guilds(guilds, users):
+    return [
+        FakeGuild(900_000 + g, f"Bench Guild {g}", [FakeMember(800_000 + g * 10_000 + u, f"bench{g}_{u}") for u in range(users)])
+        for g in range(guilds)
+    ]
+
+
+# ------------------- Population -------------------
+def chao_history(rng, days, now, idle_hours):
+    """`days` daily rows for one hatched chao, newest last, with decay clocks up to idle_hours old."""
+    rows = []
+    for age in range(days - 1, -1, -1):
+        day = now - timedelta(days=age)
+        row = {
+            'date': day.strftime("%Y-%m-%d"),
+            'birth_date': (now - timedelta(days=days)).strftime("%Y-%m-%d"),
+            'Form': '1', 'Type': 'neutral_normal_1', 'hatched': 1, 'evolved': 0,
+            'evolve_cacoon': 0, 'reincarnate_cacoon': 0, 'death_cacoon': 0,
+            'dead': 0, 'immortal': 0, 'reincarnations': 0,
+            'eyes': rng.choice(EYE_TYPES), 'mouth': rng.choice(MOUTH_TYPES),
+            'dark_hero': 0, 'illness_ticks': 0, 'swim_fly': 0, 'run_power': 0,
+            'belly_ticks': rng.randint(0, 10), 'happiness_ticks': rng.randint(0, 10),
+            'energy_ticks': rng.randint(0, 10), 'hp_ticks': rng.randint(1, 10),
+        }
+        for stat in ('belly', 'happiness', 'energy', 'hp'):
+            row[f'last_{stat}_update'] = day - timedelta(minutes=rng.randint(0, idle_hours * 60))
+        for stat in STAT_NAMES:
+            row.update({
+                f'{stat}_grade': rng.choice(GRADES), f'{stat}_level': rng.randint(0, 99),
+                f'{stat}_ticks': rng.randint(0, 9), f'{stat}_exp': rng.randint(0, 3000),
+            })
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def generate_population(data_utils, guilds, chao_per_user, days, idle_hours=24, seed=0):
+    """
+    Writes a synthetic population through DataUtils' own writers (folders via
+    get_path, histories via write_chao_stats/write_inventory). Returns the chao count.
+    """
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    count = 0
+    for guild in guilds:
+        for member in guild.members.values():
+            inv_path = data_utils.get_path(guild.id, guild.name, member, 'user_data', 'inventory.parquet')
+            data_utils.write_inventory(inv_path, pd.DataFrame([{
+                'date': now.strftime("%Y-%m-%d"), 'rings': rng.randint(0, 5000), 'Chao Egg': 0, 'Garden Nut': 5,
+            }]))
+            for name in rng.sample(CHAO_NAMES, chao_per_user):
+                stats_path = data_utils.get_path(guild.id, guild.name, member, os.path.join('chao_data', name), f"{name}_stats.parquet")
+                data_utils.write_chao_stats(stats_path, chao_history(rng, days, now, idle_hours))
+                count += 1
+    if data_utils.cache_enabled:
+        data_utils.flush()
+    return count
+
+
+# ------------------- Measurement -------------------
+def _rss_kb():
+    """Current and peak resident set size of this process in KiB (Linux /proc; peak only elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            fields = dict(line.split(":", 1) for line in f)
+        return int(fields["VmRSS"].split()[0]), int(fields["VmHWM"].split()[0])
+    except (OSError, KeyError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak, peak
+
+
+def _reset_peak_rss():
+    """Resets VmHWM so the reported peak covers the decay run, not the generator (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _tree_snapshot(root):
+    """{path: (mtime_ns, size)} of every file under root."""
+    snapshot = {}
+    for folder, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(folder, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_decay(bot, data_utils, mode, workers, sweeps, horizon, notices_file):
+    """
+    Loads ChaoDecay against the stub bot, builds its schedule and runs the real
+    decay_loop body for every deadline up to `horizon` seconds from now (or
+    until `sweeps` batches ran). Lazy mode only schedules future HP drops, so
+    it needs a horizon to have anything to do. Returns metrics.
+    """
+    from cogs.chao_decay import ChaoDecay
+
+    decay = ChaoDecay(bot, workers=workers, notices_file=notices_file)
+    decay.decay_loop.cancel()
+    decay.notify_loop.cancel()
+    decay.lazy = mode == "lazy"
+    bot.cogs["ChaoDecay"] = decay
+    await decay.cog_load()
+
+    _reset_peak_rss()
+    files_before = dict(FILE_COUNTS)
+    tree_before = _tree_snapshot(data_utils.database_path)
+    started = time.perf_counter()
+    scheduled = await data_utils.run_io(decay._build_schedule)
+    decay.started_at = datetime.now()
+    build_seconds = time.perf_counter() - started
+
+    until = datetime.now() + timedelta(seconds=horizon)
+    started = time.perf_counter()
+    waited = 0.0
+    batches = 0
+    while batches < sweeps:
+        next_due = decay.schedule.next_due()
+        if next_due is None or next_due > until:
+            break
+        delay = (next_due - datetime.now()).total_seconds()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+        await decay.decay_loop.coro(decay)
+        batches += 1
+    if data_utils.cache_enabled:
+        await data_utils.run_io(data_utils.flush)
+    sweep_seconds = time.perf_counter() - started - waited
+
+    worker_files = dict(decay.workers.file_counts) if decay.workers else {"read": 0, "written": 0}
+    rss, peak = _rss_kb()
+    # Bytes on disk that changed, whoever wrote them (cog, write-behind flush or workers).
+    tree_after = _tree_snapshot(data_utils.database_path)
+    touched = [p for p, meta in tree_after.items() if tree_before.get(p) != meta]
+    decay.cog_unload()
+    if decay.workers:
+        # Let the worker processes exit so RUSAGE_CHILDREN covers them.
+        decay.workers.shutdown(wait=True)
+    history = list(decay.sweep_history)
+    return {
+        "scheduled": scheduled,
+        "batches": batches,
+        "build_seconds": round(build_seconds, 3),
+        "sweep_seconds": round(sweep_seconds, 3),
+        "chao_processed": sum(r["chao"] for r in history),
+        "chao_written": sum(r["written"] for r in history),
+        "bytes_written": sum(tree_after[p][1] for p in touched),
+        "files_touched": len(touched),
+        "hp_drops": sum(r["hp_drops"] for r in history),
+        "files_read": FILE_COUNTS["read"] - files_before["read"] + worker_files["read"],
+        "files_written": FILE_COUNTS["written"] - files_before["written"] + worker_files["written"],
+        "rss_kb": rss,
+        "peak_rss_kb": peak,
+        "worker_peak_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss if workers else 0,
+    }
+
+
+def compare(result, results_file):
+    """Prints the change against the previous stored run with the same parameters."""
+    previous = None
+    if os.path.exists(results_file):
+        with open(results_file) as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if row.get("params") == result["params"]:
+                    previous = row
+    if previous is None:
+        print("[decay_bench] No earlier run with these parameters to compare against.")
+        return
+    print(f"[decay_bench] Compared with {previous.get('revision')} ({previous.get('at')}):")
+    for key in COMPARED:
+        old, new = previous["metrics"].get(key), result["metrics"].get(key)
+        if old:
+            change = (new - old) / old * 100
+            flag = "  <-- regression" if change > 10 else ""
+            print(f"  {key}: {old} -> {new} ({change:+.1f}%){flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic chao population and benchmark ChaoDecay against it.")
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--users", type=int, default=20, help="users per guild")
+    parser.add_argument("--chao", type=int, default=3, help="chao per user")
+    parser.add_argument("--days", type=int, default=30, help="days of history per chao")
+    parser.add_argument("--idle-hours", type=int, default=24, help="how stale the newest decay clocks may be")
+    parser.add_argument("--mode", choices=("lazy", "loops"), default=DECAY_MODE)
+    parser.add_argument("--backend", choices=("segments", "parquet", "sqlite"), default=STORAGE_BACKEND)
+    parser.add_argument("--workers", type=int, default=0, help="decay worker processes (0: I/O pool)")
+    parser.add_argument("--sweeps", type=int, default=50, help="max decay batches to run")
+    parser.add_argument("--horizon", type=int, default=0, help="also wait for deadlines up to this many seconds ahead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dir", help="build the tree here instead of a temporary folder (kept afterwards)")
+    parser.add_argument("--results", default=str(RESULTS_FILE), help="JSON lines file results are appended to")
+    args = parser.parse_args(argv)
+
+    from cogs.data_utils import DataUtils
+
+    root = args.dir or tempfile.mkdtemp(prefix="chao_bench_")
+    database_dir = os.path.join(root, "database")
+    guilds = fake_guilds(args.guilds, args.users)
+    bot = FakeBot(guilds)
+
+    async def run():
+        data_utils = DataUtils(bot, database_path=database_dir, backend=args.backend)
+        bot.cogs["DataUtils"] = data_utils
+        started = time.perf_counter()
+        population = await data_utils.run_io(generate_population, data_utils, guilds, args.chao, args.days, args.idle_hours, args.seed)
+        print(f"[decay_bench] Generated {population} chao in {time.perf_counter() - started:.1f}s under {database_dir}.")
+        metrics = await run_decay(bot, data_utils, args.mode, args.workers, args.sweeps, args.horizon,
+                                  os.path.join(root, "hp_notices.json"))
+        data_utils.cog_unload()
+        return population, metrics
+
+    try:
+        population, metrics = asyncio.run(run())
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    params = {k: getattr(args, k) for k in ("guilds", "users", "chao", "days", "idle_hours", "mode", "backend", "workers", "sweeps", "horizon", "seed")}
+    result = {
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "params": params,
+        "metrics": {"population": population, **metrics},
+    }
+    print(json.dumps(result["metrics"], indent=2))
+    compare(result, args.results)
+    os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+    with open(args.results, "a") as f:
+        f.write(json.dumps(result) + "\n")
+    print(f"[decay_bench] Result appended to {args.results}.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
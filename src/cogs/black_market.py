@@ -5,6 +5,7 @@ from discord.ext import commands
 from discord.ui import View, Button
 from views.market_view import MarketView  # Import MarketView from the views directory
 from config import DEFAULT_PRICES  # Import the default prices from config.py
+from storage.records import Inventory
 
 class BlackMarket(commands.Cog):
     def __init__(self, bot):
@@ -64,8 +65,6 @@ class BlackMarket(commands.Cog):
                     embed=embed,
                     icon_path=self.BLACK_MARKET_ICON_PATH,
                     thumbnail_path=self.BLACK_MARKET_THUMBNAIL_PATH,
-                    page_1_path=self.BLACK_MARKET_FRUITS_PAGE_1_PATH,
-                    page_2_path=self.BLACK_MARKET_FRUITS_PAGE_2_PATH,
                     black_market_cog=self,
                     total_pages=3
                 )
@@ -77,23 +76,16 @@ class BlackMarket(commands.Cog):
 
     async def market(self, interaction: discord.Interaction, *, market_type: str = None):
         try:
-            page_1_output_path = "black_market_fruits_page_1_temp.png"
-            page_2_output_path = "black_market_fruits_page_2_temp.png"
-
-            self.image_utils.paste_black_market_prices_page1(
+            # Page 2 is rendered by MarketView when the user flips to it.
+            page_1_image = self.image_utils.paste_black_market_prices_page1(
                 self.BLACK_MARKET_FRUITS_PAGE_1_PATH,
-                page_1_output_path,
-                self.fruit_prices
-            )
-            self.image_utils.paste_black_market_prices_page2(
-                self.BLACK_MARKET_FRUITS_PAGE_2_PATH,
-                page_2_output_path,
+                None,
                 self.fruit_prices
             )
 
             icon_file = discord.File(self.BLACK_MARKET_ICON_PATH, filename="Black_Market.png")
             thumb_file = discord.File(self.BLACK_MARKET_THUMBNAIL_PATH, filename="black_market.png")
-            page_1_file = discord.File(page_1_output_path, filename="black_market_fruits_page_1.png")
+            page_1_file = discord.File(page_1_image, filename="black_market_fruits_page_1.png")
 
             embed = discord.Embed(color=self.embed_color)
             embed.set_author(name="Black Market", icon_url="attachment://Black_Market.png")
@@ -107,8 +99,6 @@ class BlackMarket(commands.Cog):
                 embed=embed,
                 icon_path=self.BLACK_MARKET_ICON_PATH,
                 thumbnail_path=self.BLACK_MARKET_THUMBNAIL_PATH,
-                page_1_path=page_1_output_path,
-                page_2_path=page_2_output_path,
                 black_market_cog=self,
                 total_pages=3
             )
@@ -147,21 +137,22 @@ class BlackMarket(commands.Cog):
         actual_item_name = fruit_prices_normalized[item_name_normalized]
 
         guild_id, guild_name, user = str(interaction.guild.id), interaction.guild.name, interaction.user
-        inv_path = self.data_utils.get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
-        inv_df = self.data_utils.load_inventory(inv_path)
-        current_inv = inv_df.iloc[-1].to_dict() if not inv_df.empty else {'rings': 0}
-        rings = current_inv.get('rings', 0)
-
-        price = self.fruit_prices[actual_item_name] * quantity
-        if rings < price:
-            return await self.send_embed(
-                interaction,
-                f"{interaction.user.mention}, not enough rings. You need {price} rings, but you only have {rings}."
-            )
+        inv_path = await self.data_utils.aget_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
+        async with self.data_utils.io_lock(inv_path):
+            inv_df = await self.data_utils.aload_inventory(inv_path)
+            current_inv = Inventory.from_frame(inv_df) if not inv_df.empty else Inventory(rings=0)
+            rings = current_inv.get('rings', 0)
+
+            price = self.fruit_prices[actual_item_name] * quantity
+            if rings < price:
+                return await self.send_embed(
+                    interaction,
+                    f"{interaction.user.mention}, not enough rings. You need {price} rings, but you only have {rings}."
+                )
 
-        current_inv['rings'] = rings - price
-        current_inv[actual_item_name] = current_inv.get(actual_item_name, 0) + quantity
-        self.data_utils.save_inventory(inv_path, inv_df, current_inv)
+            current_inv['rings'] = rings - price
+            current_inv[actual_item_name] = current_inv.get(actual_item_name, 0) + quantity
+            await self.data_utils.asave_inventory(inv_path, inv_df, current_inv)
 
         description = (
             f"{interaction.user.mention} bought {quantity}x {actual_item_name} for {price} rings!\n"
@@ -180,11 +171,5 @@ class BlackMarket(commands.Cog):
             for fruit in self.fruit_prices.keys() if current.lower() in fruit.lower()
         ]
 
-    async def cog_unload(self):
-        temp_files = ["black_market_fruits_page_1_temp.png", "black_market_fruits_page_2_temp.png"]
-        for temp_file in temp_files:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-
 async def setup(bot):
     await bot.add_cog(BlackMarket(bot))
@@ -11,6 +11,8 @@ from config import (
     FRUIT_STATS_ADJUSTMENTS, SWIM_FLY_THRESHOLD, RUN_POWER_THRESHOLD,
     HERO_BG_PATH, DARK_BG_PATH, NEUTRAL_BG_PATH, EGG_BG_PATH, GRADES
 )
+from storage.records import ChaoState, Inventory
+from decorators import request_context
 
 class Chao(commands.Cog):
     def __init__(self, bot):
@@ -78,11 +80,11 @@ class Chao(commands.Cog):
 
     async def chao(self, interaction: discord.Interaction):
         guild_id, guild_name, user = str(interaction.guild.id), interaction.guild.name, interaction.user
-        if self.data_utils.is_user_initialized(guild_id, guild_name, user):
+        if await self.data_utils.ais_user_initialized(guild_id, guild_name, user):
             return await interaction.response.send_message(f"{interaction.user.mention}, you have already started using the Chao Bot.")
-        inv_path = self.data_utils.get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
-        self.data_utils.save_inventory(inv_path, self.data_utils.load_inventory(inv_path),
-                                       {'rings': 500, 'Chao Egg': 1, 'Garden Nut': 5})
+        inv_path = await self.data_utils.aget_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
+        await self.data_utils.asave_inventory(inv_path, await self.data_utils.aload_inventory(inv_path),
+                                              {'rings': 500, 'Chao Egg': 1, 'Garden Nut': 5})
         embed = discord.Embed(
             title="Welcome to Chao Bot!",
             description=("**Chao Bot** is a W.I.P. bot that lets you hatch, raise, and train your own Chao!\n\n"
@@ -100,23 +102,20 @@ class Chao(commands.Cog):
 
     async def give_rings(self, interaction: discord.Interaction):
         guild_id, guild_name, user = str(interaction.guild.id), interaction.guild.name, interaction.user
-        inv_path = self.data_utils.get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
-        inv_df = self.data_utils.load_inventory(inv_path)
-        inv = inv_df.iloc[-1].to_dict() if not inv_df.empty else {'rings': 0}
-        inv['rings'] = inv.get('rings', 0) + 1000000
-        self.data_utils.save_inventory(inv_path, inv_df, inv)
+        inv_path = await self.data_utils.aget_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
+        async with self.data_utils.io_lock(inv_path):
+            inv_df = await self.data_utils.aload_inventory(inv_path)
+            inv = Inventory.from_frame(inv_df) if not inv_df.empty else Inventory(rings=0)
+            inv['rings'] = inv.get('rings', 0) + 1000000
+            await self.data_utils.asave_inventory(inv_path, inv_df, inv)
         await interaction.response.send_message(f"{interaction.user.mention} has been given 1,000,000 rings! Current rings: {inv['rings']}")
         print(f"[give_rings] 1,000,000 Rings added to {user.id}. New balance: {inv['rings']}")
 
     async def list_chao(self, interaction: discord.Interaction):
-        guild_id, user = str(interaction.guild.id), interaction.user
-        guild_folder = self.data_utils.update_server_folder(interaction.guild)
-        user_folder = self.data_utils.get_user_folder(guild_folder, user)
-        chao_dir = os.path.join(user_folder, 'chao_data')
-        if not os.path.exists(chao_dir):
-            return await interaction.response.send_message(f"{user.mention}, you don't have any Chao yet.")
-
-        chao_list = [d for d in os.listdir(chao_dir) if os.path.isdir(os.path.join(chao_dir, d))]
+        user = interaction.user
+        guild_folder = await self.data_utils.run_io(self.data_utils.update_server_folder, interaction.guild)
+        await self.data_utils.run_io(self.data_utils.get_user_folder, guild_folder, user)
+        chao_list = await self.data_utils.run_io(self.data_utils.chao_manifest, interaction.guild.id, user.id)
         if not chao_list:
             return await interaction.response.send_message(f"{user.mention}, you don't have any Chao yet.")
 
@@ -140,16 +139,11 @@ class Chao(commands.Cog):
         )
 
         alive_chao_count = 0
-        for cn in chao_list:
-            stats_file = os.path.join(chao_dir, cn, f"{cn}_stats.parquet")
-            if not os.path.exists(stats_file):
-                embed.add_field(name=cn, value="No stats available", inline=False)
-                continue
-            
-            data = self.data_utils.load_chao_stats(stats_file).iloc[-1].to_dict()
-
-            if data.get("dead", False):
+        for entry in chao_list:
+            if entry["dead"]:
                 continue
+            cn = entry["name"]
+            data = ChaoState.from_frame(await self.data_utils.aload_chao_stats(entry["stats_path"]))
 
             chao_type = data.get("Type", "unknown")
             ct = tm.get(chao_type, "Unknown")
@@ -164,12 +158,12 @@ class Chao(commands.Cog):
         await interaction.response.send_message(embed=embed)
 
     async def grades(self, interaction: discord.Interaction, chao_name: str):
-        guild_id, guild_name, user = str(interaction.guild.id), interaction.guild.name, interaction.user
-        chao_dir = self.data_utils.get_path(guild_id, guild_name, user, 'chao_data', chao_name)
-        stats_file = os.path.join(chao_dir, f"{chao_name}_stats.parquet")
-        if not os.path.exists(stats_file):
-            return await interaction.response.send_message(f"{interaction.user.mention}, no Chao named **{chao_name}** exists.")
-        latest = self.data_utils.load_chao_stats(stats_file).iloc[-1].to_dict()
+        async with request_context(interaction, self.data_utils) as req:
+            chao_name = await req.chao_name(chao_name) or chao_name
+            if not await req.chao_exists(chao_name):
+                return await interaction.response.send_message(f"{interaction.user.mention}, no Chao named **{chao_name}** exists.")
+            _, latest = await req.load_chao(chao_name)
+            chao_dir = await req.chao_dir(chao_name)
         grades_dict = {s: latest.get(f"{s}_grade", "F") for s in ["power", "swim", "fly", "run", "stamina"]}
         thumb = os.path.join(chao_dir, f"{chao_name}_thumbnail.png")
         embed = discord.Embed(title=f"{chao_name}'s Grades", description="Current grades:", color=discord.Color.blue())
@@ -186,37 +180,30 @@ class Chao(commands.Cog):
         return random.choices(['F', 'E', 'D', 'C', 'B', 'A', 'S'], [4, 20, 25, 35, 10, 5, 1], k=1)[0]
 
     async def hatch(self, interaction: discord.Interaction):
-        guild_id, user_id = str(interaction.guild.id), str(interaction.user.id)
-        chao_dir = self.data_utils.get_path(guild_id, interaction.guild.name, interaction.user, 'chao_data', '')
-        inv_path = self.data_utils.get_path(guild_id, interaction.guild.name, interaction.user, 'user_data', 'inventory.parquet')
-        inv_df = self.data_utils.load_inventory(inv_path)
-        inv = inv_df.iloc[-1].to_dict() if not inv_df.empty else {}
+        guild_id = str(interaction.guild.id)
+        chao_dir = await self.data_utils.aget_path(guild_id, interaction.guild.name, interaction.user, 'chao_data', '')
+        inv_path = await self.data_utils.aget_path(guild_id, interaction.guild.name, interaction.user, 'user_data', 'inventory.parquet')
         # Look for a reincarnated chao that is still an egg (hatched == 0)
-        reincarnated = None
-        for folder in os.listdir(chao_dir):
-            fp = os.path.join(chao_dir, folder)
-            if not os.path.isdir(fp):
-                continue
-            stats_file = os.path.join(fp, f"{folder}_stats.parquet")
-            if os.path.exists(stats_file):
-                df_temp = self.data_utils.load_chao_stats(stats_file)
-                if df_temp.empty:
-                    continue
-                ls = df_temp.iloc[-1].to_dict()
-                if ls.get("hatched", 0) == 0:
-                    reincarnated = folder
-                    break
+        entries = await self.data_utils.run_io(self.data_utils.chao_manifest, interaction.guild.id, interaction.user.id)
+        reincarnated = next((e["name"] for e in entries if not e["hatched"]), None)
+
+        # Spend the egg under the inventory's lock so a concurrent ring award or purchase isn't lost.
+        async with self.data_utils.io_lock(inv_path):
+            inv_df = await self.data_utils.aload_inventory(inv_path)
+            inv = Inventory.from_frame(inv_df) if not inv_df.empty else Inventory()
+            if inv.get('Chao Egg', 0) < 1:
+                if reincarnated:
+                    return await interaction.response.send_message(f"{interaction.user.mention}, you need at least 1 Chao Egg to hatch this reincarnated chao!")
+                return await interaction.response.send_message(f"{interaction.user.mention}, you do not have any Chao Eggs to hatch.")
+            inv['Chao Egg'] = max(inv.get('Chao Egg', 0) - 1, 0)
+            await self.data_utils.asave_inventory(inv_path, inv_df, inv)
 
         if reincarnated:
             chao_name = reincarnated
             chao_path = os.path.join(chao_dir, chao_name)
             stats_file = os.path.join(chao_path, f"{chao_name}_stats.parquet")
-            if inv.get('Chao Egg', 0) < 1:
-                return await interaction.response.send_message(f"{interaction.user.mention}, you need at least 1 Chao Egg to hatch this reincarnated chao!")
-            inv['Chao Egg'] = max(inv.get('Chao Egg', 0) - 1, 0)
-            self.data_utils.save_inventory(inv_path, inv_df, inv)
-            df_temp = self.data_utils.load_chao_stats(stats_file)
-            ls = df_temp.iloc[-1].to_dict()
+            df_temp = await self.data_utils.aload_chao_stats(stats_file)
+            ls = ChaoState.from_frame(df_temp)
             ls["hatched"] = 1
             ls["date"] = datetime.now().strftime("%Y-%m-%d")
 
@@ -235,7 +222,7 @@ class Chao(commands.Cog):
             old_eyes = ls.get("eyes", "happy")
             final_eyes = old_eyes.split("_", 1)[1] if "_" in old_eyes else old_eyes
             ls["Alignment"], ls["eyes"], ls["mouth"] = "neutral", final_eyes, ls.get("mouth", "happy")
-            self.data_utils.save_chao_stats(stats_file, df_temp, ls)
+            await self.data_utils.asave_chao_stats(stats_file, df_temp, ls)
             eyes_img = os.path.join(self.EYES_DIR, f"neutral_{final_eyes}.png")
             if not os.path.exists(eyes_img):
                 eyes_img = os.path.join(self.EYES_DIR, "neutral.png")
@@ -243,28 +230,23 @@ class Chao(commands.Cog):
             if not os.path.exists(mouth_img):
                 mouth_img = os.path.join(self.MOUTH_DIR, "happy.png")
             thumb = os.path.join(chao_path, f"{chao_name}_thumbnail.png")
-            self.image_utils.combine_images_with_face(self.BACKGROUND_PATH, self.NEUTRAL_PATH, eyes_img, mouth_img, thumb)
+            thumb_png = self.image_utils.combine_images_with_face(self.BACKGROUND_PATH, self.NEUTRAL_PATH, eyes_img, mouth_img, thumb)
             embed = discord.Embed(
                 title="Your Reincarnated Chao has Hatched!",
                 description=f"{interaction.user.mention}, your **reincarnated** chao **{chao_name}** has hatched and is now a baby!\nUse `/rename` to change its name.",
                 color=discord.Color.blue()
             )
             embed.set_thumbnail(url=f"attachment://{chao_name.replace(' ', '_')}_thumbnail.png")
-            return await interaction.response.send_message(file=discord.File(thumb, filename=f"{chao_name.replace(' ', '_')}_thumbnail.png"), embed=embed)
+            return await interaction.response.send_message(file=discord.File(thumb_png, filename=f"{chao_name.replace(' ', '_')}_thumbnail.png"), embed=embed)
         
         # Normal hatching
-        if inv.get('Chao Egg', 0) < 1:
-            return await interaction.response.send_message(f"{interaction.user.mention}, you do not have any Chao Eggs to hatch.")
-        inv['Chao Egg'] = max(inv.get('Chao Egg', 0) - 1, 0)
-        self.data_utils.save_inventory(inv_path, inv_df, inv)
-        os.makedirs(chao_dir, exist_ok=True)
-        used = {d for d in os.listdir(chao_dir) if os.path.isdir(os.path.join(chao_dir, d))}
+        used = await self.data_utils.run_io(self.data_utils.owned_chao_names, interaction.guild.id, interaction.user.id)
         available = [n for n in self.chao_names if n not in used]
         if not available:
             return await interaction.response.send_message(f"{interaction.user.mention}, all default chao names are used. Remove an old one or extend the list!")
         chao_name = random.choice(available)
         chao_path = os.path.join(chao_dir, chao_name)
-        os.makedirs(chao_path, exist_ok=True)
+        await self.data_utils.run_io(os.makedirs, chao_path, exist_ok=True)
         stats = {
             'date': datetime.now().strftime("%Y-%m-%d"),
             'birth_date': datetime.now().strftime("%Y-%m-%d"),
@@ -281,7 +263,7 @@ class Chao(commands.Cog):
             'stamina_exp': 0, 'stamina_grade': self.get_random_grade(), 'stamina_level': 0, 'stamina_ticks': 0
         }
         stats_file = os.path.join(chao_path, f'{chao_name}_stats.parquet')
-        self.data_utils.save_chao_stats(stats_file, pd.DataFrame(), stats)
+        await self.data_utils.asave_chao_stats(stats_file, pd.DataFrame(), stats)
         eyes_img = os.path.join(self.EYES_DIR, f"neutral_{stats['eyes']}.png")
         if not os.path.exists(eyes_img):
             eyes_img = os.path.join(self.EYES_DIR, "neutral.png")
@@ -289,14 +271,14 @@ class Chao(commands.Cog):
         if not os.path.exists(mouth_img):
             mouth_img = os.path.join(self.MOUTH_DIR, "happy.png")
         thumb = os.path.join(chao_path, f"{chao_name}_thumbnail.png")
-        self.image_utils.combine_images_with_face(self.BACKGROUND_PATH, self.NEUTRAL_PATH, eyes_img, mouth_img, thumb)
+        thumb_png = self.image_utils.combine_images_with_face(self.BACKGROUND_PATH, self.NEUTRAL_PATH, eyes_img, mouth_img, thumb)
         embed = discord.Embed(
             title="Your Chao Egg has Hatched!",
             description=f"Your egg hatched into **{chao_name}**!\nUse `/rename` to change its name.",
             color=discord.Color.blue()
         )
         embed.set_thumbnail(url=f"attachment://{chao_name.replace(' ', '_')}_thumbnail.png")
-        await interaction.response.send_message(file=discord.File(thumb, filename=f"{chao_name.replace(' ', '_')}_thumbnail.png"), embed=embed)
+        await interaction.response.send_message(file=discord.File(thumb_png, filename=f"{chao_name.replace(' ', '_')}_thumbnail.png"), embed=embed)
 
     def _strip_form_digit(self, t: str) -> str:
         return t.rsplit("_", 1)[0] if "_" in t and t.rsplit("_", 1)[1] in {"1", "2", "3", "4"} else t
@@ -333,8 +315,8 @@ class Chao(commands.Cog):
             with open(gf, 'rb') as f:
                 await interaction.response.send_message(embed=embed, file=discord.File(f, filename="goodbye_background.png"))
             return
-        guild_id, guild_name, user = str(interaction.guild.id), interaction.guild.name, interaction.user
-        chao_dir = self.data_utils.get_path(guild_id, guild_name, interaction.user, 'chao_data', chao_name)
+        guild_id, guild_name = str(interaction.guild.id), interaction.guild.name
+        chao_dir = await self.data_utils.aget_path(guild_id, guild_name, interaction.user, 'chao_data', chao_name)
         if not os.path.exists(chao_dir):
             return await self.send_embed(interaction, f"{interaction.user.mention}, no Chao named **{chao_name}** exists.")
         server_db = self.data_utils.get_server_folder(guild_id, guild_name)
@@ -347,6 +329,10 @@ class Chao(commands.Cog):
             shutil.move(chao_dir, target)
         except Exception as e:
             return await self.send_embed(interaction, f"{interaction.user.mention}, failed to move **{chao_name}**: {e}")
+        await self.data_utils.amove_chao_stats(
+            os.path.join(chao_dir, f"{chao_name}_stats.parquet"),
+            os.path.join(target, f"{chao_name}_stats.parquet")
+        )
         gf = os.path.join(self.assets_dir, "graphics", "thumbnails", "goodbye_background.png")
         embed = discord.Embed(title=f"Goodbye, {chao_name}!", description=f"{chao_name} has been sent to live happily in a faraway forest.", color=discord.Color.green())
         embed.set_thumbnail(url="attachment://goodbye_background.png")
@@ -354,54 +340,47 @@ class Chao(commands.Cog):
             await interaction.response.send_message(embed=embed, file=discord.File(f, filename="goodbye_background.png"))
 
     async def pet(self, interaction: discord.Interaction, chao_name: str):
-        guild_id = str(interaction.guild.id)
-        chao_dir = self.data_utils.get_path(guild_id, interaction.guild.name, interaction.user, 'chao_data', chao_name)
-        stats_file = os.path.join(chao_dir, f"{chao_name}_stats.parquet")
-        if not os.path.exists(stats_file):
-            return await interaction.response.send_message(f"{interaction.user.mention}, no Chao named **{chao_name}** exists.")
-        df = self.data_utils.load_chao_stats(stats_file)
-        ls = df.iloc[-1].to_dict()
-        ls['happiness_ticks'] = min(ls.get('happiness_ticks', 0) + 1, 10)
+        async with request_context(interaction, self.data_utils) as req:
+            chao_name = await req.chao_name(chao_name) or chao_name
+            if not await req.chao_exists(chao_name):
+                return await interaction.response.send_message(f"{interaction.user.mention}, no Chao named **{chao_name}** exists.")
+            _, ls = await req.load_chao(chao_name)
+            ls['happiness_ticks'] = min(ls.get('happiness_ticks', 0) + 1, 10)
+            req.stage_chao(chao_name)
         chao_type, form, align = ls.get("Type", "neutral_normal_1"), ls.get("Form", "1"), ls.get("Alignment", "neutral")
         bg = (self.HERO_BG_PATH if form in ["3", "4"] and align == "hero" else self.DARK_BG_PATH if form in ["3", "4"] and align == "dark" else os.path.join(self.assets_dir, "graphics", "thumbnails", "neutral_background.png"))
         img = os.path.join(self.assets_dir, "chao", chao_type.split("_")[1], chao_type.split("_")[0], f"{chao_type}.png")
         if not os.path.exists(img):
             img = os.path.join(self.assets_dir, "chao", "chao_missing.png")
-        self.data_utils.save_chao_stats(stats_file, df, ls)
-        happy_thumb = os.path.join(chao_dir, f"{chao_name}_thumbnail_happy.png")
-        self.image_utils.combine_images_with_face(bg, img, os.path.join(self.EYES_DIR, "neutral_happy.png"), os.path.join(self.MOUTH_DIR, "happy.png"), happy_thumb)
+        happy_thumb = self.image_utils.combine_images_with_face(bg, img, os.path.join(self.EYES_DIR, "neutral_happy.png"), os.path.join(self.MOUTH_DIR, "happy.png"))
         embed = discord.Embed(title=f"You pet {chao_name}!", description=f"{chao_name} looks so happy!\nHappiness increased!", color=self.embed_color)
         embed.set_thumbnail(url="attachment://happy_thumbnail.png")
         await interaction.response.send_message(embed=embed, file=discord.File(happy_thumb, filename="happy_thumbnail.png"))
 
     async def throw_chao(self, interaction: discord.Interaction, chao_name: str):
-        guild_id = str(interaction.guild.id)
-        chao_dir = self.data_utils.get_path(guild_id, interaction.guild.name, interaction.user, 'chao_data', chao_name)
-        stats_file = os.path.join(chao_dir, f"{chao_name}_stats.parquet")
-        if not os.path.exists(stats_file):
-            return await interaction.response.send_message(f"{interaction.user.mention}, no Chao named **{chao_name}** exists.")
-        df = self.data_utils.load_chao_stats(stats_file)
-        ls = df.iloc[-1].to_dict()
-        ls['happiness_ticks'] = max(0, ls.get('happiness_ticks', 0) - 1)
-        ls['hp_ticks'] = max(0, ls.get('hp_ticks', 0) - 1)
+        async with request_context(interaction, self.data_utils) as req:
+            chao_name = await req.chao_name(chao_name) or chao_name
+            if not await req.chao_exists(chao_name):
+                return await interaction.response.send_message(f"{interaction.user.mention}, no Chao named **{chao_name}** exists.")
+            _, ls = await req.load_chao(chao_name)
+            ls['happiness_ticks'] = max(0, ls.get('happiness_ticks', 0) - 1)
+            ls['hp_ticks'] = max(0, ls.get('hp_ticks', 0) - 1)
+            req.stage_chao(chao_name)
         chao_type, form, align = ls.get("Type", "neutral_normal_1"), ls.get("Form", "1"), ls.get("Alignment", "neutral")
         bg = (self.HERO_BG_PATH if form in ["3", "4"] and align == "hero" else self.DARK_BG_PATH if form in ["3", "4"] and align == "dark" else os.path.join(self.assets_dir, "graphics", "thumbnails", "neutral_background.png"))
         img = os.path.join(self.assets_dir, "chao", chao_type.split("_")[1], chao_type.split("_")[0], f"{chao_type}.png")
         if not os.path.exists(img):
             img = os.path.join(self.assets_dir, "chao", "chao_missing.png")
-        self.data_utils.save_chao_stats(stats_file, df, ls)
-        throw_thumb = os.path.join(chao_dir, f"{chao_name}_thumbnail_throw.png")
         eyes = os.path.join(self.EYES_DIR, "neutral_pain.png")
         if not os.path.exists(eyes):
             eyes = os.path.join(self.EYES_DIR, "neutral_angry.png") or os.path.join(self.EYES_DIR, "neutral.png")
         mouth = os.path.join(self.MOUTH_DIR, "grumble.png")
         if not os.path.exists(mouth):
             mouth = os.path.join(self.MOUTH_DIR, "unhappy.png")
-        self.image_utils.combine_images_with_face(bg, img, eyes, mouth, throw_thumb)
+        throw_thumb = self.image_utils.combine_images_with_face(bg, img, eyes, mouth)
         embed = discord.Embed(title=f"You threw {chao_name}!", description=f"{chao_name} looks hurt! Happiness and HP decreased.", color=discord.Color.red())
         embed.set_thumbnail(url="attachment://throw_thumbnail.png")
-        with open(throw_thumb, 'rb') as f:
-            await interaction.response.send_message(embed=embed, file=discord.File(f, filename="throw_thumbnail.png"))
+        await interaction.response.send_message(embed=embed, file=discord.File(throw_thumb, filename="throw_thumbnail.png"))
 
     async def rename(self, interaction: discord.Interaction, current_name: str, new_name: str):
         current_name = current_name.strip()
@@ -419,58 +398,53 @@ class Chao(commands.Cog):
             )
             return await interaction.response.send_message(embed=embed)
 
-        user_folder = self.data_utils.get_user_folder(
-            self.data_utils.update_server_folder(interaction.guild), interaction.user
-        )
+        guild_folder = await self.data_utils.run_io(self.data_utils.update_server_folder, interaction.guild)
+        user_folder = await self.data_utils.run_io(self.data_utils.get_user_folder, guild_folder, interaction.user)
         chao_data_folder = os.path.join(user_folder, "chao_data")
         old_path = os.path.join(chao_data_folder, current_name)
-        if not os.path.exists(old_path):
-            return await interaction.response.send_message(
-                f"{interaction.user.mention}, no Chao named **{current_name}** exists!"
-            )
-        if len(new_name) > 15 or not new_name.replace(" ", "").isalnum():
-            return await interaction.response.send_message(
-                f"{interaction.user.mention}, the new name **{new_name}** is invalid (max 15 alphanumeric characters, spaces allowed)."
-            )
         new_path = os.path.join(chao_data_folder, new_name)
-        if os.path.exists(new_path):
-            return await interaction.response.send_message(
-                f"{interaction.user.mention}, a Chao named **{new_name}** already exists!"
-            )
+        old_stats = os.path.join(old_path, f"{current_name}_stats.parquet")
+        new_stats = os.path.join(new_path, f"{new_name}_stats.parquet")
+        # Held for the whole move so a decay batch or another command can't save the chao mid-rename.
+        async with self.data_utils.io_locks_held([old_stats, new_stats]):
+            if not await self.data_utils.run_io(os.path.exists, old_path):
+                return await interaction.response.send_message(
+                    f"{interaction.user.mention}, no Chao named **{current_name}** exists!"
+                )
+            if len(new_name) > 15 or not new_name.replace(" ", "").isalnum():
+                return await interaction.response.send_message(
+                    f"{interaction.user.mention}, the new name **{new_name}** is invalid (max 15 alphanumeric characters, spaces allowed)."
+                )
+            if await self.data_utils.run_io(os.path.exists, new_path):
+                return await interaction.response.send_message(
+                    f"{interaction.user.mention}, a Chao named **{new_name}** already exists!"
+                )
+
+            await self.data_utils.run_io(self._move_chao_folder, old_path, new_path, current_name, new_name)
+            await self.data_utils.amove_chao_stats(old_stats, new_stats)
+        await interaction.response.send_message(
+            f"{interaction.user.mention}, your Chao has been successfully renamed from **{current_name}** to **{new_name}**!"
+        )
 
+    @staticmethod
+    def _move_chao_folder(old_path, new_path, current_name, new_name):
+        """Blocking; moves a chao's folder and renames the files named after it (stats, segments, thumbnail)."""
         os.rename(old_path, new_path)
-        old_stats = os.path.join(new_path, f"{current_name}_stats.parquet")
-        new_stats = os.path.join(new_path, f"{new_name}_stats.parquet")
-        if os.path.exists(old_stats):
-            os.rename(old_stats, new_stats)
         for f in os.listdir(new_path):
-            if f == f"{new_name}_stats.parquet":
-                continue
             if current_name in f:
                 os.rename(os.path.join(new_path, f), os.path.join(new_path, f.replace(current_name, new_name)))
-        await interaction.response.send_message(
-            f"{interaction.user.mention}, your Chao has been successfully renamed from **{current_name}** to **{new_name}**!"
-        )
 
     async def rename_autocomplete(self, interaction: discord.Interaction, current: str):
         """
-        Returns an autocomplete list of Chao names owned by the user.
-        It reads the user's chao_data directory and returns its subdirectory names,
-        mirroring the logic of the stats autocomplete.
+        Returns an autocomplete list of Chao names owned by the user, from
+        DataUtils' in-memory name index, mirroring the stats autocomplete.
         """
         print(f"[rename_autocomplete] Current input: {current}")
-        user = interaction.user
-        guild = interaction.guild
         try:
-            guild_folder = self.data_utils.update_server_folder(guild)
-            user_folder = self.data_utils.get_user_folder(guild_folder, user)
-            chao_base = os.path.join(user_folder, "chao_data")
-            print(f"[rename_autocomplete] chao_base: {chao_base}")
-            if not os.path.exists(chao_base):
-                print("[rename_autocomplete] chao_base does not exist")
-                return []
-            chao_names = [d for d in os.listdir(chao_base) if os.path.isdir(os.path.join(chao_base, d))]
-            print(f"[rename_autocomplete] Found chao names: {chao_names}")
+            chao_names = await self.data_utils.run_io(
+                self.data_utils.owned_chao_names, interaction.guild.id, interaction.user.id
+            )
+            print(f"[rename_autocomplete] Found chao names: {sorted(chao_names)}")
         except Exception as e:
             print(f"[rename_autocomplete] Error retrieving chao names: {e}")
             return []
@@ -485,16 +459,17 @@ class Chao(commands.Cog):
 
 
     async def egg(self, interaction: discord.Interaction):
-        p, load_inv, save_inv = self.data_utils.get_path, self.data_utils.load_inventory, self.data_utils.save_inventory
+        p, load_inv, save_inv = self.data_utils.aget_path, self.data_utils.aload_inventory, self.data_utils.asave_inventory
         guild_id = str(interaction.guild.id)
         embed = discord.Embed(title="Obtained Chao Egg!", description="**You received a Chao Egg.**\nUse `/hatch` to hatch it!", color=self.embed_color)
-        inv_path = p(guild_id, interaction.guild.name, interaction.user, 'user_data', 'inventory.parquet')
-        inv_df = load_inv(inv_path)
-        inv = inv_df.iloc[-1].to_dict() if not inv_df.empty else {}
-        if inv.get('Chao Egg', 0) >= 1:
-            return await interaction.response.send_message(f"{interaction.user.mention}, you already have a Chao Egg!")
-        inv['Chao Egg'] = inv.get('Chao Egg', 0) + 1
-        save_inv(inv_path, inv_df, inv)
+        inv_path = await p(guild_id, interaction.guild.name, interaction.user, 'user_data', 'inventory.parquet')
+        async with self.data_utils.io_lock(inv_path):
+            inv_df = await load_inv(inv_path)
+            inv = Inventory.from_frame(inv_df) if not inv_df.empty else Inventory()
+            if inv.get('Chao Egg', 0) >= 1:
+                return await interaction.response.send_message(f"{interaction.user.mention}, you already have a Chao Egg!")
+            inv['Chao Egg'] = inv.get('Chao Egg', 0) + 1
+            await save_inv(inv_path, inv_df, inv)
         if os.path.exists(self.EGG_BG_PATH):
             egg_file = discord.File(self.EGG_BG_PATH, filename="egg_background.png")
             embed.set_thumbnail(url="attachment://egg_background.png")
@@ -503,15 +478,15 @@ class Chao(commands.Cog):
             await interaction.response.send_message(embed=embed)
 
     async def inventory(self, interaction: discord.Interaction):
-        get_path, load_inv = self.data_utils.get_path, self.data_utils.load_inventory
+        get_path, load_inv = self.data_utils.aget_path, self.data_utils.aload_inventory
         guild_id, guild_name, user = str(interaction.guild.id), interaction.guild.name, interaction.user
-        inv_path = get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
-        inv_df = load_inv(inv_path)
+        inv_path = await get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
+        inv_df = await load_inv(inv_path)
         current_date = datetime.now().strftime("%Y-%m-%d")
         if not inv_df.empty and current_date in inv_df['date'].values:
-            inv = inv_df[inv_df['date'] == current_date].iloc[-1].to_dict()
+            inv = Inventory.from_frame(inv_df[inv_df['date'] == current_date])
         else:
-            inv = inv_df.iloc[-1].to_dict() if not inv_df.empty else {'Rings': 0}
+            inv = Inventory.from_frame(inv_df) if not inv_df.empty else Inventory({'Rings': 0})
         if 'rings' in inv:
             inv['Rings'] = inv.pop('rings')
         embed = discord.Embed(title="Your Inventory", description="Here's what you have today:", color=self.embed_color)
@@ -11,6 +11,7 @@ from config import (
     ALIGNMENTS, HERO_BG_PATH, DARK_BG_PATH, NEUTRAL_BG_PATH,
     ASSETS_DIR, PAGE1_TICK_POSITIONS, PAGE2_TICK_POSITIONS, GRADE_RANGES
 )
+from storage.records import ChaoState
 
 class ChaoAdmin(commands.Cog):
     def __init__(self, bot):
@@ -77,17 +78,17 @@ class ChaoAdmin(commands.Cog):
 
     async def force_life_check(self, interaction: discord.Interaction, *, chao_name: str):
         g, u = str(interaction.guild.id), str(interaction.user.id)
-        get_path, load_stats, save_stats = self.data_utils.get_path, self.data_utils.load_chao_stats, self.data_utils.save_chao_stats
-        file_path = os.path.join(get_path(g, u, 'chao_data', chao_name), f'{chao_name}_stats.parquet')
-        if not os.path.exists(file_path):
+        get_path, load_stats, save_stats = self.data_utils.aget_path, self.data_utils.aload_chao_stats, self.data_utils.asave_chao_stats
+        file_path = os.path.join(await get_path(g, u, 'chao_data', chao_name), f'{chao_name}_stats.parquet')
+        if not await self.data_utils.adata_exists(file_path):
             return await interaction.response.send_message(
                 embed=discord.Embed(
                     description=f"{interaction.user.mention}, no Chao named **{chao_name}** exists.", 
                     color=0xFF0000
                 )
             )
-        stats_df = load_stats(file_path)
-        latest = stats_df.iloc[-1].to_dict()
+        stats_df = await load_stats(file_path)
+        latest = ChaoState.from_frame(stats_df)
         reincarnated = latest.get('happiness_ticks', 0) > 5
         msg = (f"✨ **{chao_name} has reincarnated! A fresh start begins!**" 
                if reincarnated else f"😢 **{chao_name} has passed away due to low happiness.**")
@@ -100,25 +101,25 @@ class ChaoAdmin(commands.Cog):
             }
         else:
             new_data = {**latest, "dead": 1}
-        save_stats(file_path, stats_df, new_data)
+        await save_stats(file_path, stats_df, new_data)
         color = 0x00FF00 if reincarnated else 0x8B0000
         await interaction.response.send_message(embed=discord.Embed(description=msg, color=color))
 
     async def force_happiness(self, interaction: discord.Interaction, *, chao_name: str, happiness_value: int):
         g, u = str(interaction.guild.id), str(interaction.user.id)
-        get_path, load_stats, save_stats = self.data_utils.get_path, self.data_utils.load_chao_stats, self.data_utils.save_chao_stats
-        file_path = os.path.join(get_path(g, u, 'chao_data', chao_name), f"{chao_name}_stats.parquet")
-        if not os.path.exists(file_path):
+        get_path, load_stats, save_stats = self.data_utils.aget_path, self.data_utils.aload_chao_stats, self.data_utils.asave_chao_stats
+        file_path = os.path.join(await get_path(g, u, 'chao_data', chao_name), f"{chao_name}_stats.parquet")
+        if not await self.data_utils.adata_exists(file_path):
             return await interaction.response.send_message(
                 embed=discord.Embed(
                     description=f"{interaction.user.mention}, no Chao named **{chao_name}** exists.", 
                     color=0xFF0000
                 )
             )
-        stats_df = load_stats(file_path)
-        latest = stats_df.iloc[-1].to_dict()
+        stats_df = await load_stats(file_path)
+        latest = ChaoState.from_frame(stats_df)
         latest['happiness_ticks'] = happiness_value
-        save_stats(file_path, stats_df, latest)
+        await save_stats(file_path, stats_df, latest)
         await interaction.response.send_message(
             embed=discord.Embed(
                 description=f"✅ **{chao_name}'s happiness has been set to {happiness_value}.**", 
@@ -142,23 +143,23 @@ class ChaoAdmin(commands.Cog):
         user_folder = self.data_utils.get_user_folder(server_folder, target)
         chao_folder = os.path.join(user_folder, "chao_data", chao_name)
         stats_file = os.path.join(chao_folder, f"{chao_name}_stats.parquet")
-        if not os.path.exists(stats_file):
+        if not await self.data_utils.adata_exists(stats_file):
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, no stats file found for **{chao_name}** of {target.mention}."
             )
-        chao_df = self.data_utils.load_chao_stats(stats_file)
+        chao_df = await self.data_utils.aload_chao_stats(stats_file)
         if chao_df.empty:
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, no stats data found for **{chao_name}** of {target.mention}."
             )
-        latest_stats = chao_df.iloc[-1].to_dict()
+        latest_stats = ChaoState.from_frame(chao_df)
         grade_key = f"{stat}_grade"
         if new_grade not in self.GRADES:
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, {new_grade} is not a valid grade. Valid grades: {', '.join(self.GRADES)}."
             )
         latest_stats[grade_key] = new_grade
-        self.data_utils.save_chao_stats(stats_file, chao_df, latest_stats)
+        await self.data_utils.asave_chao_stats(stats_file, chao_df, latest_stats)
         await interaction.response.send_message(
             f"{interaction.user.mention}, {target.mention}'s chao **{chao_name}** now has its {stat.capitalize()} grade set to {new_grade}."
         )
@@ -182,19 +183,19 @@ class ChaoAdmin(commands.Cog):
         user_folder = self.data_utils.get_user_folder(server_folder, target)
         chao_folder = os.path.join(user_folder, "chao_data", chao_name)
         stats_file = os.path.join(chao_folder, f"{chao_name}_stats.parquet")
-        if not os.path.exists(stats_file):
+        if not await self.data_utils.adata_exists(stats_file):
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, no stats file found for **{chao_name}** of {target.mention}."
             )
-        chao_df = self.data_utils.load_chao_stats(stats_file)
+        chao_df = await self.data_utils.aload_chao_stats(stats_file)
         if chao_df.empty:
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, no stats data found for **{chao_name}** of {target.mention}."
             )
-        latest_stats = chao_df.iloc[-1].to_dict()
+        latest_stats = ChaoState.from_frame(chao_df)
         exp_key = f"{stat}_exp"
         latest_stats[exp_key] = new_exp
-        self.data_utils.save_chao_stats(stats_file, chao_df, latest_stats)
+        await self.data_utils.asave_chao_stats(stats_file, chao_df, latest_stats)
         await interaction.response.send_message(
             f"{interaction.user.mention}, {target.mention}'s chao **{chao_name}** now has its {stat.capitalize()} EXP set to {new_exp}."
         )
@@ -218,19 +219,19 @@ class ChaoAdmin(commands.Cog):
         user_folder = self.data_utils.get_user_folder(server_folder, target)
         chao_folder = os.path.join(user_folder, "chao_data", chao_name)
         stats_file = os.path.join(chao_folder, f"{chao_name}_stats.parquet")
-        if not os.path.exists(stats_file):
+        if not await self.data_utils.adata_exists(stats_file):
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, no stats file found for **{chao_name}** of {target.mention}."
             )
-        chao_df = self.data_utils.load_chao_stats(stats_file)
+        chao_df = await self.data_utils.aload_chao_stats(stats_file)
         if chao_df.empty:
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, no stats data found for **{chao_name}** of {target.mention}."
             )
-        latest_stats = chao_df.iloc[-1].to_dict()
+        latest_stats = ChaoState.from_frame(chao_df)
         level_key = f"{stat}_level"
         latest_stats[level_key] = new_level
-        self.data_utils.save_chao_stats(stats_file, chao_df, latest_stats)
+        await self.data_utils.asave_chao_stats(stats_file, chao_df, latest_stats)
         await interaction.response.send_message(
             f"{interaction.user.mention}, {target.mention}'s chao **{chao_name}** now has its {stat.capitalize()} level set to {new_level}."
         )
@@ -250,22 +251,24 @@ class ChaoAdmin(commands.Cog):
         user_folder = self.data_utils.get_user_folder(server_folder, target)
         chao_folder = os.path.join(user_folder, "chao_data", chao_name)
         stats_file = os.path.join(chao_folder, f"{chao_name}_stats.parquet")
-        if not os.path.exists(stats_file):
+        if not await self.data_utils.adata_exists(stats_file):
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, no stats file found for **{chao_name}** of {target.mention}."
             )
-        chao_df = self.data_utils.load_chao_stats(stats_file)
+        chao_df = await self.data_utils.aload_chao_stats(stats_file)
         if chao_df.empty:
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, no stats data found for **{chao_name}** of {target.mention}."
             )
-        latest_stats = chao_df.iloc[-1].to_dict()
+        latest_stats = ChaoState.from_frame(chao_df)
         latest_stats[face_type] = new_value
-        self.data_utils.save_chao_stats(stats_file, chao_df, latest_stats)
-        updated_type, updated_form = self.update_chao_type_and_thumbnail(interaction.guild.id, interaction.guild.name, target, chao_name, latest_stats)
+        await self.data_utils.asave_chao_stats(stats_file, chao_df, latest_stats)
+        updated_type, updated_form = await self.data_utils.run_io(
+            self.update_chao_type_and_thumbnail, interaction.guild.id, interaction.guild.name, target, chao_name, latest_stats
+        )
         latest_stats["Form"] = updated_form
         latest_stats["Type"] = updated_type
-        self.data_utils.save_chao_stats(stats_file, chao_df, latest_stats)
+        await self.data_utils.asave_chao_stats(stats_file, chao_df, latest_stats)
         await interaction.response.send_message(
             f"{interaction.user.mention}, {target.mention}'s chao **{chao_name}** now has its {face_type} set to {new_value} and its thumbnail updated."
         )
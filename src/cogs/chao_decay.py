@@ -1,12 +1,254 @@
 # cogs/chao_decay.py
 
 import os
+import json
+import math
+import time
+import heapq
+import asyncio
+import threading
+from collections import deque
 from datetime import datetime, timedelta
 import discord
 from discord.ext import commands, tasks
+from config import (
+    DECAY_MODE, DECAY_WORKERS, DECAY_WORKER_BATCH,
+    DECAY_METRICS_HISTORY, DECAY_OVERRUN_SECONDS,
+    HP_NOTIFY_ENABLED, HP_NOTIFY_THRESHOLDS, HP_NOTIFY_WINDOW_MINUTES, HP_NOTIFY_PER_MINUTE, HP_NOTICES_FILE,
+)
+from storage.schema import coerce_datetime, normalize_chao_frame
+from storage.records import ChaoState, apply_liveness
+from storage.decay_table import DecayTable
+from storage.decay_workers import DecayWorkers
+
+# Stats whose emptiness makes HP decay, in the order the loops process them.
+HP_GUARD_STATS = ("belly", "happiness", "energy")
+# Upper bound on one scheduler sleep, so a missed wake-up costs at most this long.
+SCHEDULER_MAX_SLEEP = 60
+
+
+def _hp_from(stats, rates):
+    """
+    When the first of belly/happiness/energy ran (or will run) empty:
+    datetime.min if one was already empty when last stamped, None if none is stamped.
+    """
+    empty_since = []
+    for stat in HP_GUARD_STATS:
+        amount, minutes = rates[stat]
+        ticks = stats.get(f"{stat}_ticks", 0) or 0
+        last = coerce_datetime(stats.get(f"last_{stat}_update"))
+        if last is None:
+            continue
+        if ticks <= 0:
+            empty_since.append(datetime.min)
+        else:
+            empty_since.append(last + timedelta(minutes=minutes) * math.ceil(ticks / amount))
+    return min(empty_since) if empty_since else None
+
+
+def settle_decay(stats, now, rates):
+    """
+    Closed-form decay: applies every whole block that elapsed between each
+    last_*_update and now, exactly as many one-block loop passes would have.
+    rates maps 'belly'/'happiness'/'energy'/'hp' to (amount, minutes).
+    HP only decays once one of the other three is empty; since they never
+    refill without a write, that moment is computed from their own blocks.
+    Returns {column: new value}; stats itself is not modified.
+    """
+    changes = {}
+    empty_now = False
+    for stat in HP_GUARD_STATS:
+        amount, minutes = rates[stat]
+        tick_key, time_key = f"{stat}_ticks", f"last_{stat}_update"
+        ticks = stats.get(tick_key, 0) or 0
+        last = coerce_datetime(stats.get(time_key))
+        if last is None:
+            # Never stamped: the clock starts now (the loops did the same).
+            changes[time_key] = now
+            empty_now = empty_now or ticks <= 0
+            continue
+
+        period = timedelta(minutes=minutes)
+        blocks = int((now - last) / period) if now > last else 0
+        if blocks:
+            changes[tick_key] = max(0, ticks - blocks * amount)
+            changes[time_key] = last + period * blocks
+
+    amount, minutes = rates["hp"]
+    last_hp = coerce_datetime(stats.get("last_hp_update"))
+    hp_from = _hp_from(stats, rates)
+    if empty_now:
+        hp_from = min(hp_from, now) if hp_from else now
+    if hp_from is None or hp_from > now:
+        if last_hp is None:
+            changes["last_hp_update"] = now
+        return changes
+
+    period = timedelta(minutes=minutes)
+    start = max(last_hp, hp_from) if last_hp else hp_from
+    if start == datetime.min:
+        start = now
+    blocks = int((now - start) / period) if now > start else 0
+    if blocks:
+        hp = stats.get("hp_ticks", 0) or 0
+        changes["hp_ticks"] = max(0, hp - blocks * amount)
+        changes["last_hp_update"] = start + period * blocks
+    elif last_hp is None:
+        changes["last_hp_update"] = start
+    return changes
+
+
+class DecaySchedule:
+    """
+    Min-heap of (due, stats_file). `due` holds each chao's current deadline;
+    heap items that no longer match it are stale and skipped when they surface.
+    Locked, since DataUtils write hooks reschedule from the I/O pool.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.due = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.due)
+
+    def push(self, key, due):
+        """Schedules key at due (replacing any earlier entry). True if it is now the earliest deadline."""
+        with self.lock:
+            self.due[key] = due
+            heapq.heappush(self.heap, (due, key))
+            if len(self.heap) > 2 * len(self.due) + 1024:
+                self.heap = [(d, k) for k, d in self.due.items()]
+                heapq.heapify(self.heap)
+            return self._peek() == due
+
+    def discard(self, key):
+        with self.lock:
+            self.due.pop(key, None)
+
+    def _peek(self):
+        while self.heap and self.due.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def next_due(self):
+        with self.lock:
+            return self._peek()
+
+    def pop_due(self, now):
+        """Removes and returns every key whose deadline is <= now."""
+        keys = []
+        with self.lock:
+            while self._peek() is not None and self.heap[0][0] <= now:
+                _, key = heapq.heappop(self.heap)
+                del self.due[key]
+                keys.append(key)
+        return keys
+
+
+class HpNoticeQueue:
+    """
+    Undelivered HP notices, one entry per (guild, owner) holding every chao
+    that crossed a threshold since the owner was last messaged. An entry is
+    ready once its first notice is window_minutes old, so a mass decay turns
+    into one message per owner. take_budget() is a bot-wide token bucket of
+    per_minute sends. Mirrored to a JSON file so restarts don't drop notices.
+    """
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, path, window_minutes, per_minute):
+        self.path = str(path)
+        self.window = timedelta(minutes=window_minutes)
+        self.per_minute = per_minute
+        self.pending = {}  # "guild_id:user_id" -> {"guild_id", "user_id", "since", "attempts", "chao": {name: {"hp", "threshold"}}}
+        self.tokens, self.refilled = float(per_minute), time.monotonic()
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                pending = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ChaoDecay] Could not read {self.path}: {e}")
+            return
+        with self.lock:
+            self.pending = pending
+
+    def save(self):
+        """Blocking; writes the queue if it changed since the last save."""
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps(self.pending)
+            self.dirty = False
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def add(self, guild_id, user_id, chao_name, hp, threshold, now):
+        key = f"{guild_id}:{user_id}"
+        with self.lock:
+            entry = self.pending.setdefault(key, {
+                "guild_id": guild_id, "user_id": user_id,
+                "since": now.isoformat(), "attempts": 0, "chao": {},
+            })
+            entry["chao"][chao_name] = {"hp": hp, "threshold": threshold}
+            self.dirty = True
+
+    def ready(self, now):
+        """Keys whose coalescing window has passed, oldest first."""
+        cutoff = (now - self.window).isoformat()
+        with self.lock:
+            due = [(e["since"], k) for k, e in self.pending.items() if e["since"] <= cutoff]
+        return [k for _, k in sorted(due)]
+
+    def get(self, key):
+        with self.lock:
+            entry = self.pending.get(key)
+            return json.loads(json.dumps(entry)) if entry else None
+
+    def take_budget(self):
+        now = time.monotonic()
+        self.tokens = min(self.per_minute, self.tokens + (now - self.refilled) * self.per_minute / 60)
+        self.refilled = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def done(self, key, delivered, sent):
+        """
+        Clears the chao in `sent` (the copy get() returned) once delivered or
+        after MAX_ATTEMPTS failures. Chao queued while it was being sent stay
+        for the next window.
+        """
+        with self.lock:
+            entry = self.pending.get(key)
+            if entry is None:
+                return
+            entry["attempts"] += 1
+            if delivered or entry["attempts"] >= self.MAX_ATTEMPTS:
+                for chao_name, notice in sent["chao"].items():
+                    if entry["chao"].get(chao_name) == notice:
+                        del entry["chao"][chao_name]
+                if entry["chao"]:
+                    entry["since"], entry["attempts"] = datetime.now().isoformat(), 0
+                else:
+                    del self.pending[key]
+            self.dirty = True
+
 
 class ChaoDecay(commands.Cog):
-    def __init__(self, bot: commands.Bot):
+    def __init__(self, bot: commands.Bot, workers=DECAY_WORKERS, notices_file=HP_NOTICES_FILE):
         self.bot = bot
         self.data_utils = None
 
@@ -16,225 +258,486 @@ class ChaoDecay(commands.Cog):
         self.energy_decay_amount, self.energy_decay_minutes = 2, 1080
         self.hp_decay_amount, self.hp_decay_minutes = 1, 1440
 
-        # Start decay loops
-        self.force_belly_decay_loop.start()
-        self.force_happiness_decay_loop.start()
-        self.force_energy_decay_loop.start()
-        self.force_hp_decay_loop.start()
+        # Lazy mode: stats are settled whenever they are read and the sweep only
+        # looks for HP drops. Loops mode: the sweep decays and rewrites every chao.
+        self.lazy = DECAY_MODE == "lazy"
+        # Per-batch metrics (see decay_loop) and running totals since startup, for /decay_status.
+        self.last_sweep = None
+        self.sweep_history = deque(maxlen=DECAY_METRICS_HISTORY)
+        self.sweep_totals = {"batches": 0, "overruns": 0, "chao": 0, "written": 0, "bytes": 0,
+                             "max_seconds": 0.0, "max_lag": 0.0}
+
+        # Each chao sits in the heap at its next decay deadline; the loop sleeps until the earliest.
+        self.schedule = DecaySchedule()
+        # Decay columns of every scheduled chao as NumPy arrays; due chao are decayed as one batch.
+        self.table = DecayTable()
+        self.wake = asyncio.Event()
+        self.loop = None
+        self.started_at = None
+
+        # HP threshold notices, coalesced per owner and sent by notify_loop under a global budget.
+        self.notices = HpNoticeQueue(notices_file, HP_NOTIFY_WINDOW_MINUTES, HP_NOTIFY_PER_MINUTE)
+        # Saves of due chao go to worker processes sharded by guild (None: the I/O pool).
+        # Created in cog_load, once DataUtils' backend and database folder are known.
+        self.worker_count = workers
+        self.workers = None
+
+        # Start the decay scheduler
+        self.decay_loop.start()
+        if HP_NOTIFY_ENABLED:
+            self.notify_loop.start()
 
     async def cog_load(self):
         self.data_utils = self.bot.get_cog("DataUtils")
         if not self.data_utils:
             raise RuntimeError("DataUtils cog not found. Load DataUtils before ChaoDecay.")
+        self.loop = asyncio.get_running_loop()
+        if self.worker_count:
+            self.workers = DecayWorkers(self.worker_count, self.data_utils.backend, self.data_utils.database_path)
+        self.data_utils.on_chao_write = self.reschedule
+        if self.lazy:
+            self.data_utils.decay_on_read = self.settle_frame
 
     def cog_unload(self):
-        self.force_belly_decay_loop.cancel()
-        self.force_happiness_decay_loop.cancel()
-        self.force_energy_decay_loop.cancel()
-        self.force_hp_decay_loop.cancel()
+        if self.data_utils and self.data_utils.decay_on_read == self.settle_frame:
+            self.data_utils.decay_on_read = None
+        if self.data_utils and self.data_utils.on_chao_write == self.reschedule:
+            self.data_utils.on_chao_write = None
+        self.decay_loop.cancel()
+        self.notify_loop.cancel()
+        if self.workers:
+            self.workers.shutdown()
+        self.notices.save()
+
+    # ------------------- Lazy decay -------------------
+    def decay_rates(self):
+        """Current (amount, minutes) per stat. In lazy mode a rate change also applies to time already elapsed."""
+        return {
+            "belly": (self.belly_decay_amount, self.belly_decay_minutes),
+            "happiness": (self.happiness_decay_amount, self.happiness_decay_minutes),
+            "energy": (self.energy_decay_amount, self.energy_decay_minutes),
+            "hp": (self.hp_decay_amount, self.hp_decay_minutes),
+        }
+
+    def settle_frame(self, df):
+        """
+        DataUtils read hook (lazy mode): returns df with its newest row decayed
+        up to now. The stored rows are untouched; whatever the caller saves next
+        persists the settled values. Unchanged frames are returned as-is.
+        """
+        if df.empty:
+            return df
+        now = datetime.now().replace(microsecond=0)
+        changes = settle_decay(ChaoState.from_frame(df), now, self.decay_rates())
+        if not changes:
+            return df
+        df = df.copy()
+        last = df.index[-1]
+        for col, val in changes.items():
+            df.loc[last, col] = val
+        return normalize_chao_frame(df)
 
     def iter_chao_stats(self):
         """
-        Generator yielding (stats_file, df, latest_stats, guild, user_folder, chao_name).
+        Generator yielding (stats_file, df, latest_stats, guild, user_folder, chao_name),
+        where latest_stats is the newest row as a ChaoState. Chao are enumerated
+        from each guild's manifest instead of crawling the user folders.
+        Blocking; only iterate it from a function running on the DataUtils I/O pool.
         """
         for guild in self.bot.guilds:
-            server_folder = self.data_utils.get_server_folder(str(guild.id), guild.name)
-            if not os.path.exists(server_folder):
-                continue
-
-            for user_folder in os.listdir(server_folder):
-                user_path = os.path.join(server_folder, user_folder)
-                chao_data_dir = os.path.join(user_path, "chao_data")
-                if not os.path.exists(chao_data_dir):
+            for entry in self.data_utils.chao_manifest(guild.id):
+                stats_file = entry["stats_path"]
+                df = self.data_utils.load_chao_stats(stats_file)
+                if df.empty:
                     continue
-
-                for chao_name in os.listdir(chao_data_dir):
-                    stats_file = os.path.join(chao_data_dir, chao_name, f"{chao_name}_stats.parquet")
-                    if not os.path.exists(stats_file):
-                        continue
-                    df = self.data_utils.load_chao_stats(stats_file)
-                    if df.empty:
-                        continue
-                    latest_stats = df.iloc[-1].to_dict()
-                    yield stats_file, df, latest_stats, guild, user_folder, chao_name
-
-    def _single_block_decay(self, stats_file, df, latest_stats, decay_minutes, decay_amount,
-                            tick_key, time_key):
-        """
-        Only subtract 'decay_amount' once if enough time has passed.
-        This ensures we don't drain multiple blocks at once.
-        """
-        now = datetime.now()
-        if time_key not in latest_stats:
-            # If there's no last_*_update key, set it now and bail
-            latest_stats[time_key] = now.strftime("%Y-%m-%d %H:%M:%S")
-            self.data_utils.save_chao_stats(stats_file, df, latest_stats)
+                latest_stats = ChaoState.from_frame(df)
+                yield stats_file, df, latest_stats, guild, entry["folder"], entry["name"]
+
+    # ------------------- Scheduling -------------------
+    def _push(self, stats_files, deadlines):
+        """Puts chao into the schedule (None = unschedule) and wakes the loop if one is now the earliest."""
+        earliest = False
+        for stats_file, due in zip(stats_files, deadlines):
+            if due is None:
+                self.schedule.discard(stats_file)
+            else:
+                earliest |= self.schedule.push(stats_file, due)
+        if earliest and self.loop is not None:
+            self.loop.call_soon_threadsafe(self.wake.set)
+
+    def reschedule(self, stats_file, row):
+        """
+        DataUtils write hook: loads this chao's newest row into the decay table
+        and recomputes its deadline, or drops it when row is None. Called from
+        the I/O pool as well as the event loop.
+        """
+        if row is None:
+            self.schedule.discard(stats_file)
+            self.table.remove(stats_file)
             return
-
-        try:
-            old_time = datetime.strptime(latest_stats[time_key], "%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            # If we can't parse it, reset to now
-            latest_stats[time_key] = now.strftime("%Y-%m-%d %H:%M:%S")
-            self.data_utils.save_chao_stats(stats_file, df, latest_stats)
+        if self.data_utils is None or self.data_utils._manifest_key(stats_file) is None:
             return
 
-        # How many minutes have passed since old_time?
-        passed = (now - old_time).total_seconds() / 60
-        if passed >= decay_minutes:
-            old_val = latest_stats.get(tick_key, 0)
-            new_val = max(0, old_val - decay_amount)
-            latest_stats[tick_key] = new_val
-
-            # Advance the stored time by exactly 'decay_minutes' worth
-            used_time = old_time + timedelta(minutes=decay_minutes)
-            if used_time > now:
-                used_time = now
-
-            latest_stats[time_key] = used_time.strftime("%Y-%m-%d %H:%M:%S")
-            self.data_utils.save_chao_stats(stats_file, df, latest_stats)
-
-    def _process_decay(self, stats_file, df, latest_stats, decay_minutes, decay_amount,
-                       tick_key, time_key):
+        now = datetime.now().replace(microsecond=0)
+        rates = self.decay_rates()
+        self.table.upsert(stats_file, row)
+        rows = self.table.row_numbers([stats_file])
+        if self.lazy:
+            # HP drops are counted from the settled value at write time.
+            self.table.decay(rows, now, rates, lazy=True)
+        self._push([stats_file], self.table.next_due(rows, now, rates, self.lazy))
+
+    def reschedule_all(self):
+        """Recomputes every deadline from the decay table (after a rate change). No I/O."""
+        rows = self.table.all_rows()
+        now = datetime.now().replace(microsecond=0)
+        self._push(self.table.key_at(rows), self.table.next_due(rows, now, self.decay_rates(), self.lazy))
+
+    def _build_schedule(self):
         """
-        This function is called each minute by the loops.
-        It attempts a single-block decay each time.
+        One pass over the manifests at startup; afterwards writes keep the table
+        and schedule current. Chao whose HP ran out while the bot was down are
+        saved once here so they get marked dead.
         """
-        self._single_block_decay(
-            stats_file, df, latest_stats,
-            decay_minutes, decay_amount,
-            tick_key, time_key
-        )
-
-    async def _process_hp_decay(self, stats_file, df, latest_stats, guild, user_folder, chao_name):
+        for guild in self.bot.guilds:
+            for entry in self.data_utils.chao_manifest(guild.id):
+                row = self.data_utils.load_latest_chao_stats(entry["stats_path"])
+                if not row:
+                    continue
+                if apply_liveness(row):
+                    df = self.data_utils.load_chao_stats(entry["stats_path"], settle=False)
+                    self.data_utils.save_chao_stats(entry["stats_path"], df, row)
+                else:
+                    self.reschedule(entry["stats_path"], row)
+        return len(self.schedule)
+
+    # ------------------- Due chao (run on the DataUtils I/O pool) -------------------
+    def _persist(self, change):
         """
-        Similar single-block logic for HP. HP decays only if belly/energy/happiness is 0.
+        Saves one DecayChange on top of the chao's stored newest row; the write
+        hook reschedules it. Returns the bytes written (0 if left to the
+        write-behind flush), or None if the chao is gone.
         """
-        now = datetime.now()
-        # If all key stats are above 0, update last_hp_update and skip HP decay
-        if (latest_stats.get("belly_ticks", 0) > 0 and
-            latest_stats.get("energy_ticks", 0) > 0 and
-            latest_stats.get("happiness_ticks", 0) > 0):
-            latest_stats["last_hp_update"] = now.strftime("%Y-%m-%d %H:%M:%S")
-            self.data_utils.save_chao_stats(stats_file, df, latest_stats)
-            return
-
-        if "last_hp_update" not in latest_stats:
-            latest_stats["last_hp_update"] = now.strftime("%Y-%m-%d %H:%M:%S")
-            self.data_utils.save_chao_stats(stats_file, df, latest_stats)
-            return
-
-        try:
-            old_time = datetime.strptime(latest_stats["last_hp_update"], "%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            latest_stats["last_hp_update"] = now.strftime("%Y-%m-%d %H:%M:%S")
-            self.data_utils.save_chao_stats(stats_file, df, latest_stats)
-            return
-
-        passed = (now - old_time).total_seconds() / 60
-        if passed >= self.hp_decay_minutes:
-            old_val = latest_stats.get("hp_ticks", 0)
-            new_val = max(0, old_val - self.hp_decay_amount)
-            latest_stats["hp_ticks"] = new_val
-
-            used_time = old_time + timedelta(minutes=self.hp_decay_minutes)
-            if used_time > now:
-                used_time = now
-            latest_stats["last_hp_update"] = used_time.strftime("%Y-%m-%d %H:%M:%S")
-
-            if new_val < old_val:
-                await self.check_hp_thresholds(
-                    guild_id=guild.id,
-                    user_folder_name=user_folder,
-                    chao_name=chao_name,
-                    old_hp=old_val,
-                    new_hp=new_val
-                )
-            self.data_utils.save_chao_stats(stats_file, df, latest_stats)
-
-    # ------------------- Decay Loops -------------------
-    @tasks.loop(minutes=1)
-    async def force_belly_decay_loop(self):
-        for stats_file, df, latest_stats, *_ in self.iter_chao_stats():
-            self._process_decay(
-                stats_file, df, latest_stats,
-                self.belly_decay_minutes, self.belly_decay_amount,
-                "belly_ticks", "last_belly_update"
+        df = self.data_utils.load_chao_stats(change.key, settle=False)
+        if df.empty:
+            self.reschedule(change.key, None)
+            return None
+        latest_stats = ChaoState.from_frame(df)
+        latest_stats.update(change.values)
+        return self.data_utils.save_chao_stats(change.key, df, latest_stats)
+
+    def _process_due(self, stats_files):
+        """
+        Decays the chao popped off the schedule in one vectorized batch, saves
+        the rows that need it and reschedules the rest. Returns the summary
+        decay_loop records; with worker processes the rows to save are left in
+        summary["pending"] for _persist_in_workers.
+        """
+        now = datetime.now().replace(microsecond=0)
+        rates = self.decay_rates()
+        rows = self.table.row_numbers(stats_files)
+        changes = self.table.decay(rows, now, rates, self.lazy)
+        self._push(self.table.key_at(rows), self.table.next_due(rows, now, rates, self.lazy))
+
+        summary = {"chao": len(rows), "written": 0, "bytes": 0, "deferred": 0,
+                   "drops": [], "deaths": 0, "pending": [], "guilds": {}}
+        for stats_file in self.table.key_at(rows):
+            guild_id = self.data_utils._manifest_key(stats_file)[0]
+            summary["guilds"][guild_id] = summary["guilds"].get(guild_id, 0) + 1
+        for change in changes:
+            if change.persist and self.workers:
+                summary["pending"].append(change)
+            elif change.persist:
+                written = self._persist(change)
+                if written is not None:
+                    summary["written"] += 1
+                    summary["bytes"] += written
+                    summary["deferred"] += not written
+            if change.new_hp < change.old_hp:
+                guild_id, _, chao_name = self.data_utils._manifest_key(change.key)
+                # database/<guild>/<user folder>/chao_data/<name>/<name>_stats.parquet
+                user_folder = os.path.basename(os.path.dirname(os.path.dirname(os.path.dirname(change.key))))
+                summary["drops"].append((guild_id, user_folder, chao_name, change.old_hp, change.new_hp))
+                summary["deaths"] += change.new_hp == 0
+        return summary
+
+    async def _persist_in_workers(self, changes):
+        """
+        Saves DecayChanges in the worker processes: one task per shard, each
+        leasing DECAY_WORKER_BATCH chao at a time from DataUtils so the bot can't
+        load or save them mid-write. Returns (rows written, bytes written).
+        """
+        shards = {}
+        for change in changes:
+            guild_id = self.data_utils._manifest_key(change.key)[0]
+            shards.setdefault(self.workers.shard(guild_id), []).append((change.key, change.values))
+
+        async def run_shard(shard, items):
+            written = nbytes = 0
+            for start in range(0, len(items), DECAY_WORKER_BATCH):
+                batch = items[start:start + DECAY_WORKER_BATCH]
+                paths = [path for path, _ in batch]
+                # Leases block on other threads' chao access, so keep them off the I/O pool.
+                await asyncio.to_thread(self.data_utils.lease_chao, paths)
+                rows, batch_bytes = [], 0
+                try:
+                    rows, batch_bytes, files = await asyncio.wrap_future(self.workers.submit(shard, batch))
+                    for kind, count in files.items():
+                        self.workers.file_counts[kind] += count
+                except Exception as e:
+                    print(f"[ChaoDecay] Decay worker {shard} failed: {e}")
+                finally:
+                    await asyncio.to_thread(self.data_utils.release_chao, paths, rows)
+                written += len(rows)
+                nbytes += batch_bytes
+            return written, nbytes
+
+        results = await asyncio.gather(*(run_shard(shard, items) for shard, items in shards.items()))
+        return sum(r[0] for r in results), sum(r[1] for r in results)
+
+    def sweep_stats(self):
+        """Timing and counts of the most recent batch of due chao (None before the first one)."""
+        return dict(self.last_sweep) if self.last_sweep else None
+
+    def _record_sweep(self, record):
+        """Keeps one batch's metrics for /decay_status and logs it if it overran."""
+        self.last_sweep = record
+        self.sweep_history.append(record)
+        self.sweep_totals["batches"] += 1
+        self.sweep_totals["chao"] += record["chao"]
+        self.sweep_totals["written"] += record["written"]
+        self.sweep_totals["bytes"] += record["bytes"]
+        self.sweep_totals["max_seconds"] = max(self.sweep_totals["max_seconds"], record["seconds"])
+        self.sweep_totals["max_lag"] = max(self.sweep_totals["max_lag"], record["lag"])
+        if record["overrun"]:
+            self.sweep_totals["overruns"] += 1
+            busiest = sorted(record["guilds"].items(), key=lambda kv: -kv[1])[:3]
+            print(
+                f"[ChaoDecay] Overrun: {record['chao']} due chao took {record['seconds']}s "
+                f"and started {record['lag']}s late (limit {DECAY_OVERRUN_SECONDS}s); "
+                f"busiest guilds: {', '.join(f'{g} ({n})' for g, n in busiest)}."
             )
 
-    async def before_force_belly_decay_loop(self):
-        await self.bot.wait_until_ready()
-        print("[ChaoDecay] Belly decay loop starting...")
-    force_belly_decay_loop.before_loop = before_force_belly_decay_loop
-
-    @tasks.loop(minutes=1)
-    async def force_energy_decay_loop(self):
-        for stats_file, df, latest_stats, *_ in self.iter_chao_stats():
-            self._process_decay(
-                stats_file, df, latest_stats,
-                self.energy_decay_minutes, self.energy_decay_amount,
-                "energy_ticks", "last_energy_update"
-            )
+    def scheduled_by_guild(self):
+        """{guild_id: chao currently scheduled}. Blocking; run on the I/O pool."""
+        counts = {}
+        with self.schedule.lock:
+            stats_files = list(self.schedule.due)
+        for stats_file in stats_files:
+            key = self.data_utils._manifest_key(stats_file)
+            if key:
+                counts[key[0]] = counts.get(key[0], 0) + 1
+        return counts
+
+    # ------------------- Decay Loop -------------------
+    @tasks.loop(seconds=0)
+    async def decay_loop(self):
+        """
+        Sleeps until the earliest deadline (or a write schedules an earlier one),
+        then processes only the chao that are due.
+        """
+        self.wake.clear()
+        now = datetime.now().replace(microsecond=0)
+        next_due = self.schedule.next_due()
+        if next_due is None or next_due > now:
+            delay = (next_due - now).total_seconds() if next_due else SCHEDULER_MAX_SLEEP
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout=min(delay, SCHEDULER_MAX_SLEEP))
+            except asyncio.TimeoutError:
+                pass
+            return
 
-    async def before_force_energy_decay_loop(self):
-        await self.bot.wait_until_ready()
-        print("[ChaoDecay] Energy decay loop starting...")
-    force_energy_decay_loop.before_loop = before_force_energy_decay_loop
-
-    @tasks.loop(minutes=1)
-    async def force_happiness_decay_loop(self):
-        for stats_file, df, latest_stats, *_ in self.iter_chao_stats():
-            self._process_decay(
-                stats_file, df, latest_stats,
-                self.happiness_decay_minutes, self.happiness_decay_amount,
-                "happiness_ticks", "last_happiness_update"
+        # Lag: how long after the earliest deadline this batch actually starts. Deadlines
+        # that passed while the bot was down count from when the scheduler started.
+        lag = (datetime.now() - max(next_due, self.started_at or next_due)).total_seconds()
+        due = self.schedule.pop_due(now)
+        started = time.perf_counter()
+        # A command holds a chao's io_lock from load to save; decaying it in between would be overwritten.
+        async with self.data_utils.io_locks_held(due):
+            summary = await self.data_utils.run_io(self._process_due, due)
+            if summary["pending"]:
+                written, nbytes = await self._persist_in_workers(summary["pending"])
+                summary["written"] += written
+                summary["bytes"] += nbytes
+        seconds = round(time.perf_counter() - started, 3)
+        self._record_sweep({
+            "mode": "lazy" if self.lazy else "loops",
+            "at": now,
+            "seconds": seconds,
+            "lag": round(lag, 3),
+            "overrun": seconds > DECAY_OVERRUN_SECONDS or lag > DECAY_OVERRUN_SECONDS,
+            "chao": summary["chao"],
+            "written": summary["written"],
+            "bytes": summary["bytes"],
+            "deferred": summary["deferred"],
+            "hp_drops": len(summary["drops"]),
+            "deaths": summary["deaths"],
+            "guilds": summary["guilds"],
+            "scheduled": len(self.schedule),
+            "workers": len(self.workers) if self.workers else 0,
+        })
+        for guild_id, user_folder, chao_name, old_hp, new_hp in summary["drops"]:
+            await self.check_hp_thresholds(
+                guild_id=guild_id,
+                user_folder_name=user_folder,
+                chao_name=chao_name,
+                old_hp=old_hp,
+                new_hp=new_hp
             )
+        if self.notices.dirty:
+            await self.data_utils.run_io(self.notices.save)
 
-    async def before_force_happiness_decay_loop(self):
-        await self.bot.wait_until_ready()
-        print("[ChaoDecay] Happiness decay loop starting...")
-    force_happiness_decay_loop.before_loop = before_force_happiness_decay_loop
-
-    @tasks.loop(minutes=1)
-    async def force_hp_decay_loop(self):
-        for stats_file, df, latest_stats, guild, user_folder, chao_name in self.iter_chao_stats():
-            await self._process_hp_decay(stats_file, df, latest_stats, guild, user_folder, chao_name)
-
-    async def before_force_hp_decay_loop(self):
+    @decay_loop.before_loop
+    async def before_decay_loop(self):
         await self.bot.wait_until_ready()
-        print("[ChaoDecay] HP decay loop starting...")
-    force_hp_decay_loop.before_loop = before_force_hp_decay_loop
+        count = await self.data_utils.run_io(self._build_schedule)
+        self.started_at = datetime.now()
+        print(f"[ChaoDecay] Decay scheduler starting ({'lazy' if self.lazy else 'loops'} mode, {count} chao scheduled)...")
 
     # ------------------- Admin Commands -------------------
     async def force_belly_decay(self, interaction: discord.Interaction, ticks: int, minutes: int):
         if ticks < 1 or minutes < 1:
             return await interaction.response.send_message("Please provide integers >= 1 for both ticks and minutes.")
         self.belly_decay_amount, self.belly_decay_minutes = ticks, minutes
+        self.reschedule_all()
         await interaction.response.send_message(f"Belly decay set to subtract **{ticks}** tick(s) every **{minutes}** minute(s).")
 
     async def force_energy_decay(self, interaction: discord.Interaction, ticks: int, minutes: int):
         if ticks < 1 or minutes < 1:
             return await interaction.response.send_message("Please provide integers >= 1 for both ticks and minutes.")
         self.energy_decay_amount, self.energy_decay_minutes = ticks, minutes
+        self.reschedule_all()
         await interaction.response.send_message(f"Energy decay set to subtract **{ticks}** tick(s) every **{minutes}** minute(s).")
 
     async def force_happiness_decay(self, interaction: discord.Interaction, ticks: int, minutes: int):
         if ticks < 1 or minutes < 1:
             return await interaction.response.send_message("Please provide integers >= 1 for both ticks and minutes.")
         self.happiness_decay_amount, self.happiness_decay_minutes = ticks, minutes
+        self.reschedule_all()
         await interaction.response.send_message(f"Happiness decay set to subtract **{ticks}** tick(s) every **{minutes}** minute(s).")
 
     async def force_hp_decay(self, interaction: discord.Interaction, ticks: int, minutes: int):
         if ticks < 1 or minutes < 1:
             return await interaction.response.send_message("Please provide integers >= 1 for both ticks and minutes.")
         self.hp_decay_amount, self.hp_decay_minutes = ticks, minutes
+        self.reschedule_all()
         await interaction.response.send_message(
             f"HP decay set to subtract **{ticks}** tick(s) every **{minutes}** minute(s), if any of belly, energy, or happiness is drained."
         )
 
+    async def decay_status(self, interaction: discord.Interaction):
+        """Admin: recent decay batch timings, lag and overruns, and where the scheduled population lives."""
+        await interaction.response.defer(thinking=True)
+        by_guild = await self.data_utils.run_io(self.scheduled_by_guild)
+        history = list(self.sweep_history)
+        totals = self.sweep_totals
+        next_due = self.schedule.next_due()
+
+        embed = discord.Embed(title="Decay Status", color=0x00FF00 if not totals["overruns"] else 0xFFA500)
+        embed.add_field(name="Scheduler", value=(
+            f"Mode: **{'lazy' if self.lazy else 'loops'}**\n"
+            f"Scheduled chao: **{len(self.schedule)}**\n"
+            f"Next deadline: **{next_due or 'none'}**\n"
+            f"Worker processes: **{len(self.workers) if self.workers else 0}**"
+        ), inline=False)
+        if history:
+            recent = len(history)
+            embed.add_field(name=f"Last {recent} batch(es)", value=(
+                f"Avg time: **{sum(r['seconds'] for r in history) / recent:.3f}s**, "
+                f"max **{max(r['seconds'] for r in history):.3f}s**\n"
+                f"Avg lag: **{sum(r['lag'] for r in history) / recent:.3f}s**, "
+                f"max **{max(r['lag'] for r in history):.3f}s**\n"
+                f"Chao: **{sum(r['chao'] for r in history)}**, written: **{sum(r['written'] for r in history)}** "
+                f"(**{sum(r['bytes'] for r in history):,}** bytes, **{sum(r['deferred'] for r in history)}** left to the cache flush)\n"
+                f"Overruns: **{sum(r['overrun'] for r in history)}**"
+            ), inline=False)
+            last = history[-1]
+            embed.add_field(name="Last batch", value=(
+                f"At **{last['at']}**: {last['chao']} chao in **{last['seconds']}s**, "
+                f"**{last['lag']}s** late, {last['written']} written, {last['hp_drops']} HP drop(s)"
+            ), inline=False)
+        embed.add_field(name="Since startup", value=(
+            f"Batches: **{totals['batches']}**, overruns: **{totals['overruns']}** (limit {DECAY_OVERRUN_SECONDS}s)\n"
+            f"Max time: **{totals['max_seconds']:.3f}s**, max lag: **{totals['max_lag']:.3f}s**\n"
+            f"Chao: **{totals['chao']}**, written: **{totals['written']}** (**{totals['bytes']:,}** bytes)"
+        ), inline=False)
+        if by_guild:
+            busiest = sorted(by_guild.items(), key=lambda kv: -kv[1])[:5]
+            names = {g.id: g.name for g in self.bot.guilds}
+            embed.add_field(name="Largest populations", value="\n".join(
+                f"{names.get(guild_id, guild_id)}: **{count}** chao" for guild_id, count in busiest
+            ), inline=False)
+        await interaction.followup.send(embed=embed)
+
     async def check_hp_thresholds(self, guild_id: int, user_folder_name: str, chao_name: str,
                                   old_hp: int, new_hp: int):
-        pass  # You can implement notifications here if desired
+        """Queues a notice for the owner if this drop crossed one of HP_NOTIFY_THRESHOLDS."""
+        if not HP_NOTIFY_ENABLED:
+            return
+        crossed = [t for t in HP_NOTIFY_THRESHOLDS if new_hp <= t < old_hp]
+        user_id = self.data_utils._folder_id(user_folder_name)
+        if crossed and user_id is not None:
+            self.notices.add(guild_id, user_id, chao_name, new_hp, min(crossed), datetime.now())
+
+    # ------------------- HP Notices -------------------
+    def _notice_embed(self, entry):
+        lines = []
+        for chao_name, notice in sorted(entry["chao"].items(), key=lambda kv: kv[1]["hp"]):
+            if notice["hp"] <= 0:
+                lines.append(f"**{chao_name}** has run out of HP!")
+            else:
+                lines.append(f"**{chao_name}** is down to **{notice['hp']}/10** HP.")
+        guild = self.bot.get_guild(entry["guild_id"])
+        embed = discord.Embed(
+            title="Your Chao need you!",
+            description="\n".join(lines) + "\n\nFeed or pet them to stop their HP from dropping.",
+            color=0xFF0000
+        )
+        if guild:
+            embed.set_footer(text=guild.name)
+        return embed
+
+    async def _deliver(self, entry):
+        """DMs the owner, falling back to the server's system channel. Returns True once delivered."""
+        embed = self._notice_embed(entry)
+        try:
+            user = self.bot.get_user(entry["user_id"]) or await self.bot.fetch_user(entry["user_id"])
+            await user.send(embed=embed)
+            return True
+        except discord.Forbidden:
+            pass
+        except discord.HTTPException as e:
+            print(f"[ChaoDecay] HP notice DM to {entry['user_id']} failed: {e}")
+            return False
+        guild = self.bot.get_guild(entry["guild_id"])
+        channel = guild.system_channel if guild else None
+        if channel is None:
+            return False
+        try:
+            await channel.send(content=f"<@{entry['user_id']}>", embed=embed)
+            return True
+        except discord.HTTPException as e:
+            print(f"[ChaoDecay] HP notice post for {entry['user_id']} failed: {e}")
+            return False
+
+    @tasks.loop(seconds=30)
+    async def notify_loop(self):
+        """Sends every notice whose window has passed, oldest first, while the send budget lasts."""
+        for key in self.notices.ready(datetime.now()):
+            if not self.notices.take_budget():
+                break
+            entry = self.notices.get(key)
+            if entry:
+                self.notices.done(key, await self._deliver(entry), entry)
+        if self.notices.dirty:
+            await self.data_utils.run_io(self.notices.save)
+
+    @notify_loop.before_loop
+    async def before_notify_loop(self):
+        await self.bot.wait_until_ready()
+        await self.data_utils.run_io(self.notices.load)
+        if len(self.notices):
+            print(f"[ChaoDecay] {len(self.notices)} undelivered HP notice(s) restored.")
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(ChaoDecay(bot))
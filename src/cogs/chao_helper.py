@@ -13,6 +13,7 @@ from config import (
 )
 from views.stats_view import StatsView  # Assuming you still need this for stats.
 from discord import app_commands
+from decorators import request_context
 
 STATS_PERSISTENT_VIEWS_FILE = "stats_persistent_views.json"
 
@@ -69,35 +70,11 @@ class ChaoHelper(commands.Cog):
         if not os.path.exists(server_folder):
             return await interaction.response.send_message("No server folder found. Something is wrong.")
 
-        all_folders = os.listdir(server_folder)
-        chao_entries = []
-
-        for uf in all_folders:
-            user_folder = os.path.join(server_folder, uf)
-            if not os.path.isdir(user_folder):
-                continue
-
-            chao_dir = os.path.join(user_folder, 'chao_data')
-            if not os.path.exists(chao_dir):
-                continue
-
-            chao_list = [
-                d for d in os.listdir(chao_dir)
-                if os.path.isdir(os.path.join(chao_dir, d))
-            ]
-
-            for chao_name in chao_list:
-                stats_file = os.path.join(chao_dir, chao_name, f"{chao_name}_stats.parquet")
-                if not os.path.exists(stats_file):
-                    continue
-
-                chao_df = self.data_utils.load_chao_stats(stats_file)
-                if chao_df.empty:
-                    continue
-
-                latest_stats = chao_df.iloc[-1].to_dict()
-                if latest_stats.get("dead", False):
-                    chao_entries.append((chao_name, uf))
+        chao_entries = [
+            (entry["name"], entry["folder"])
+            for entry in await self.data_utils.run_io(self.data_utils.chao_manifest, guild.id)
+            if entry["dead"]
+        ]
 
         if not chao_entries:
             return await interaction.response.send_message("No chao are dead in this server! The graveyard is empty.")
@@ -144,23 +121,22 @@ class ChaoHelper(commands.Cog):
 
         user = interaction.user
         guild_id, guild_name = str(interaction.guild.id), interaction.guild.name
-        chao_dir = self.data_utils.get_path(guild_id, guild_name, user, 'chao_data', chao_name)
-        chao_stats_path = os.path.join(chao_dir, f"{chao_name}_stats.parquet")
-
-        if not os.path.exists(chao_stats_path):
-            return await interaction.response.send_message(f"{interaction.user.mention}, no Chao named **{chao_name}** exists.")
-
-        chao_df = self.data_utils.load_chao_stats(chao_stats_path)
-        chao_stats = chao_df.iloc[-1].to_dict()
-
-        # Update type/form via ChaoLifecycle
-        chao_type, form = lifecycle_cog.update_chao_type_and_thumbnail(
-            guild_id, guild_name, user, chao_name, chao_stats
-        )
+        async with request_context(interaction, self.data_utils) as req:
+            chao_name = await req.chao_name(chao_name) or chao_name
+            if not await req.chao_exists(chao_name):
+                return await interaction.response.send_message(f"{interaction.user.mention}, no Chao named **{chao_name}** exists.")
+            _, chao_stats = await req.load_chao(chao_name)
+            chao_dir = await req.chao_dir(chao_name)
+
+            # Update type/form via ChaoLifecycle
+            chao_type, form = await self.data_utils.run_io(
+                lifecycle_cog.update_chao_type_and_thumbnail,
+                guild_id, guild_name, user, chao_name, chao_stats
+            )
 
-        if chao_stats.get("Form") != form or chao_stats.get("Type") != chao_type:
-            chao_stats["Form"], chao_stats["Type"] = form, chao_type
-            self.data_utils.save_chao_stats(chao_stats_path, chao_df, chao_stats)
+            if chao_stats.get("Form") != form or chao_stats.get("Type") != chao_type:
+                chao_stats["Form"], chao_stats["Type"] = form, chao_type
+                req.stage_chao(chao_name)
 
         type_mapping = {
             **{f"{a}_fly_3": "Fly" for a in ["dark", "hero", "neutral"]},
@@ -185,31 +161,18 @@ class ChaoHelper(commands.Cog):
         chao_type_display = type_mapping.get(chao_type, "Unknown")
         alignment_label = chao_stats.get("Alignment", "Neutral").capitalize()
 
-        stats_image_paths = {
-            1: os.path.join(chao_dir, f"{chao_name}_stats_page_1.png"),
-            2: os.path.join(chao_dir, f"{chao_name}_stats_page_2.png")
-        }
         thumbnail_path = os.path.join(chao_dir, f"{chao_name}_thumbnail.png")
 
-        await asyncio.gather(
-            asyncio.to_thread(
-                self.image_utils.paste_page1_image,
-                self.TEMPLATE_PATH,
-                self.OVERLAY_PATH,
-                stats_image_paths[1],
-                self.PAGE1_TICK_POSITIONS,
-                *[int(chao_stats.get(f"{s}_ticks", 0)) for s in ['power', 'swim', 'fly', 'run', 'stamina']],
-                *[int(chao_stats.get(f"{s}_level", 0)) for s in ['power', 'swim', 'fly', 'run', 'stamina']],
-                *[int(chao_stats.get(f"{s}_exp", 0)) for s in ['power', 'swim', 'fly', 'run', 'stamina']]
-            ),
-            asyncio.to_thread(
-                self.image_utils.paste_page2_image,
-                self.TEMPLATE_PAGE_2_PATH,
-                self.OVERLAY_PATH,
-                stats_image_paths[2],
-                self.PAGE2_TICK_POSITIONS,
-                {k: chao_stats.get(f"{k}_ticks", 0) for k in self.PAGE2_TICK_POSITIONS}
-            )
+        # Page 2 is rendered by StatsView when the user flips to it.
+        stats_page = await asyncio.to_thread(
+            self.image_utils.paste_page1_image,
+            self.TEMPLATE_PATH,
+            self.OVERLAY_PATH,
+            None,
+            self.PAGE1_TICK_POSITIONS,
+            *[int(chao_stats.get(f"{s}_ticks", 0)) for s in ['power', 'swim', 'fly', 'run', 'stamina']],
+            *[int(chao_stats.get(f"{s}_level", 0)) for s in ['power', 'swim', 'fly', 'run', 'stamina']],
+            *[int(chao_stats.get(f"{s}_exp", 0)) for s in ['power', 'swim', 'fly', 'run', 'stamina']]
         )
 
         embed = discord.Embed(color=self.embed_color)
@@ -234,7 +197,7 @@ class ChaoHelper(commands.Cog):
 
         await interaction.response.send_message(
             files=[
-                discord.File(stats_image_paths[1], "stats_page.png"),
+                discord.File(stats_page, "stats_page.png"),
                 discord.File(self.ICON_PATH, filename="Stats.png"),
                 discord.File(thumbnail_path, filename="chao_thumbnail.png")
             ],
@@ -244,22 +207,15 @@ class ChaoHelper(commands.Cog):
 
     async def stats_autocomplete(self, interaction: discord.Interaction, current: str):
         """
-        Returns an autocomplete list of Chao names owned by the user.
-        It reads the user's chao_data directory and returns its subdirectory names.
+        Returns an autocomplete list of Chao names owned by the user, from
+        DataUtils' in-memory name index (the one parse_chao_name uses).
         """
         print(f"[stats_autocomplete] Current input: {current}")
-        user = interaction.user
-        guild = interaction.guild
         try:
-            guild_folder = self.data_utils.update_server_folder(guild)
-            user_folder = self.data_utils.get_user_folder(guild_folder, user)
-            chao_base = os.path.join(user_folder, "chao_data")
-            print(f"[stats_autocomplete] chao_base: {chao_base}")
-            if not os.path.exists(chao_base):
-                print("[stats_autocomplete] chao_base does not exist")
-                return []
-            chao_names = [d for d in os.listdir(chao_base) if os.path.isdir(os.path.join(chao_base, d))]
-            print(f"[stats_autocomplete] Found chao names: {chao_names}")
+            chao_names = await self.data_utils.run_io(
+                self.data_utils.owned_chao_names, interaction.guild.id, interaction.user.id
+            )
+            print(f"[stats_autocomplete] Found chao names: {sorted(chao_names)}")
         except Exception as e:
             print(f"[stats_autocomplete] Error retrieving chao names: {e}")
             return []
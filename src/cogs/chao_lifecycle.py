@@ -1,8 +1,7 @@
 # cogs/chao_lifecycle.py
 
-import os, json, random, asyncio, discord, pandas as pd, collections
-from PIL import Image
-from discord.ext import commands
+import os, json, heapq, random, asyncio, threading, discord, pandas as pd, collections
+from discord.ext import commands, tasks
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 from views.stats_view import StatsView
@@ -15,8 +14,118 @@ from config import (
     PAGE1_TICK_POSITIONS, PAGE2_TICK_POSITIONS,
     GRADE_RANGES,
     STATS_PERSISTENT_VIEWS_FILE,
-    CHAO_TYPES
+    CHAO_TYPES,
+    COCOON_SECONDS, COCOON_TIMERS_FILE
 )
+from storage.records import ChaoState, Inventory
+from storage.schema import coerce_datetime
+from decorators import (
+    request_context, generate_evolution_image, generate_reincarnation_image, generate_death_image
+)
+
+# Longest the cocoon loop sleeps without looking at the timers again.
+COCOON_MAX_SLEEP = 60
+# kind -> (flag, end time, seconds left) columns of a chao in that cocoon.
+COCOON_COLUMNS = {
+    "evolve": ("evolve_cacoon", "evolution_end_time", "evolution_seconds_left"),
+    "reincarnate": ("reincarnate_cacoon", "reincarnation_end_time", "reincarnation_seconds_left"),
+    "death": ("death_cacoon", "death_end_time", "death_seconds_left"),
+}
+
+
+class CocoonTimers:
+    """
+    Pending cocoons keyed "guild_id:user_id:chao_name", each entry holding kind
+    (see COCOON_COLUMNS), guild_id, user_id, chao_name, channel_id (where the
+    outcome is posted, None if unknown) and due (ISO time). A min-heap of
+    (due, key) finds the next one; heap items whose due no longer matches the
+    entry are stale and skipped. Mirrored to a JSON file so cocoons in flight
+    survive restarts.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.pending = {}
+        self.heap = []
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __contains__(self, key):
+        return key in self.pending
+
+    @staticmethod
+    def key(guild_id, user_id, chao_name):
+        return f"{guild_id}:{user_id}:{chao_name}"
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                pending = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ChaoLifecycle] Could not read {self.path}: {e}")
+            return
+        with self.lock:
+            self.pending.update(pending)
+            self.heap = [(e["due"], k) for k, e in self.pending.items()]
+            heapq.heapify(self.heap)
+
+    def save(self):
+        """Blocking; writes the timers if they changed since the last save."""
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps(self.pending)
+            self.dirty = False
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def add(self, kind, guild_id, user_id, chao_name, channel_id, due):
+        """Starts (or restarts) a chao's cocoon timer. Returns its key."""
+        key = self.key(guild_id, user_id, chao_name)
+        due = due.isoformat(timespec="seconds")
+        with self.lock:
+            self.pending[key] = {
+                "kind": kind, "guild_id": int(guild_id), "user_id": int(user_id),
+                "chao_name": chao_name, "channel_id": channel_id, "due": due,
+            }
+            heapq.heappush(self.heap, (due, key))
+            self.dirty = True
+        return key
+
+    def _drop_stale(self):
+        while self.heap:
+            due, key = self.heap[0]
+            entry = self.pending.get(key)
+            if entry is not None and entry["due"] == due:
+                return
+            heapq.heappop(self.heap)
+
+    def next_due(self):
+        with self.lock:
+            self._drop_stale()
+            return datetime.fromisoformat(self.heap[0][0]) if self.heap else None
+
+    def pop_due(self, now):
+        """Removes and returns (key, entry) for every cocoon due by now, earliest first."""
+        cutoff = now.isoformat(timespec="seconds")
+        due = []
+        with self.lock:
+            self._drop_stale()
+            while self.heap and self.heap[0][0] <= cutoff:
+                _, key = heapq.heappop(self.heap)
+                due.append((key, self.pending.pop(key)))
+                self._drop_stale()
+            if due:
+                self.dirty = True
+        return due
+
 
 class ChaoLifecycle(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -36,6 +145,10 @@ class ChaoLifecycle(commands.Cog):
         self.FORM_LEVEL_2, self.FORM_LEVEL_3, self.FORM_LEVEL_4 = FORM_LEVEL_2, FORM_LEVEL_3, FORM_LEVEL_4
         self.HERO_BG_PATH, self.DARK_BG_PATH, self.NEUTRAL_BG_PATH = HERO_BG_PATH, DARK_BG_PATH, NEUTRAL_BG_PATH
         self.BACKGROUND_PATH = NEUTRAL_BG_PATH
+        self.cocoons = CocoonTimers(COCOON_TIMERS_FILE)
+        self.cocoon_wake = asyncio.Event()
+        # Interactions that started a cocoon in this run; the outcome is sent as their follow-up.
+        self.cocoon_followups = {}
         self.EYES_DIR = os.path.join(ASSETS_DIR, "face", "eyes")
         self.MOUTH_DIR = os.path.join(ASSETS_DIR, "face", "mouth")
         self.STATS_PERSISTENT_VIEWS_FILE = STATS_PERSISTENT_VIEWS_FILE
@@ -47,6 +160,11 @@ class ChaoLifecycle(commands.Cog):
         self.image_utils = self.bot.get_cog("ImageUtils")
         if not self.image_utils:
             print("Warning: ImageUtils cog not loaded. Some features may fail.")
+        self.cocoon_loop.start()
+
+    def cog_unload(self):
+        self.cocoon_loop.cancel()
+        self.cocoons.save()
 
     async def _send(self, interaction: discord.Interaction, **kwargs):
         """
@@ -91,67 +209,6 @@ class ChaoLifecycle(commands.Cog):
         except (ValueError, TypeError):
             return 0
 
-    def generate_evolution_image(self, bg_path, overlay_img, safe_name):
-        temp_folder = os.path.join(self.assets_dir, "temp")
-        os.makedirs(temp_folder, exist_ok=True)
-        temp_output = os.path.join(temp_folder, f"lifecycle_{safe_name}.png")
-        with Image.open(bg_path).convert("RGBA") as bg, Image.open(overlay_img).convert("RGBA") as overlay:
-            overlay = overlay.resize(bg.size)
-            Image.alpha_composite(bg, overlay).save(temp_output)
-        return discord.File(temp_output, filename=f"lifecycle_{safe_name}.png")
-
-    def generate_reincarnation_image(self, latest_stats: dict, safe_name: str):
-        """
-        Pick a background based on the chao's stats (e.g., alignment),
-        overlay the reincarnation cocoon, and return a discord.File.
-        """
-        alignment_val = latest_stats.get("dark_hero", 0)
-        if alignment_val > 0:
-            bg_file = "hero_background.png"
-        elif alignment_val < 0:
-            bg_file = "dark_background.png"
-        else:
-            bg_file = "neutral_background.png"
-
-        bg_path = os.path.join(self.assets_dir, "graphics", "thumbnails", bg_file)
-        overlay_path = os.path.join(self.assets_dir, "graphics", "cacoons", "cacoon_reincarnate.png")
-        
-        temp_folder = os.path.join(self.assets_dir, "temp")
-        os.makedirs(temp_folder, exist_ok=True)
-        temp_output = os.path.join(temp_folder, f"lifecycle_{safe_name}.png")
-
-        with Image.open(bg_path).convert("RGBA") as bg, Image.open(overlay_path).convert("RGBA") as overlay:
-            overlay = overlay.resize(bg.size)
-            Image.alpha_composite(bg, overlay).save(temp_output)
-
-        return discord.File(temp_output, filename=f"lifecycle_{safe_name}.png")
-
-    def generate_death_image(self, latest_stats: dict, safe_name: str):
-        """
-        Pick a background based on the chao's stats (e.g., alignment),
-        overlay the death cocoon, and return a discord.File.
-        """
-        alignment_val = latest_stats.get("dark_hero", 0)
-        if alignment_val > 0:
-            bg_file = "hero_background.png"
-        elif alignment_val < 0:
-            bg_file = "dark_background.png"
-        else:
-            bg_file = "neutral_background.png"
-
-        bg_path = os.path.join(self.assets_dir, "graphics", "thumbnails", bg_file)
-        overlay_path = os.path.join(self.assets_dir, "graphics", "cacoons", "cacoon_death.png")
-        
-        temp_folder = os.path.join(self.assets_dir, "temp")
-        os.makedirs(temp_folder, exist_ok=True)
-        temp_output = os.path.join(temp_folder, f"lifecycle_{safe_name}.png")
-
-        with Image.open(bg_path).convert("RGBA") as bg, Image.open(overlay_path).convert("RGBA") as overlay:
-            overlay = overlay.resize(bg.size)
-            Image.alpha_composite(bg, overlay).save(temp_output)
-
-        return discord.File(temp_output, filename=f"lifecycle_{safe_name}.png")
-
     def update_chao_type_and_thumbnail(
         self, guild_id: str, guild_name: str, user: discord.Member, chao_name: str, latest_stats: Dict
     ) -> (str, str):
@@ -330,139 +387,137 @@ class ChaoLifecycle(commands.Cog):
         quantity = amount
         fruit_lower = fruit.lower()
 
-        chao_dir = self.data_utils.get_path(guild_id, guild_name, user, 'chao_data', chao_name)
-        chao_stats_path = os.path.join(chao_dir, f"{chao_name}_stats.parquet")
-        if not os.path.exists(chao_dir) or not os.path.exists(chao_stats_path):
-            return await self._send(interaction, content=f"{interaction.user.mention}, no Chao named **{chao_name}** exists or stats file is missing.")
+        async with request_context(interaction, self.data_utils) as req:
+            chao_name = await req.chao_name(chao_name) or chao_name
+            if not await req.chao_exists(chao_name):
+                return await self._send(interaction, content=f"{interaction.user.mention}, no Chao named **{chao_name}** exists or stats file is missing.")
+            chao_stats_path = await req.stats_path(chao_name)
 
-        inv_path = self.data_utils.get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
-        inv_df = self.data_utils.load_inventory(inv_path)
-        current_inv = inv_df.iloc[-1].to_dict() if not inv_df.empty else {}
-        norm_inv = {k.lower(): v for k, v in current_inv.items()}
-        have_amount = norm_inv.get(fruit_lower, 0)
+            inv_df, current_inv = await req.load_inventory()
+            norm_inv = {k.lower(): v for k, v in current_inv.items()}
+            have_amount = norm_inv.get(fruit_lower, 0)
 
-        if have_amount < quantity:
-            return await self._send(interaction, content=f"{interaction.user.mention}, you only have **{have_amount}** {fruit}, but tried to feed {quantity}.")
+            if have_amount < quantity:
+                return await self._send(interaction, content=f"{interaction.user.mention}, you only have **{have_amount}** {fruit}, but tried to feed {quantity}.")
 
-        chao_df = self.data_utils.load_chao_stats(chao_stats_path)
-        latest_stats = chao_df.iloc[-1].to_dict()
+            chao_df, latest_stats = await req.load_chao(chao_name)
 
-        ticks_changes, align_changes, levels_gained = (
-            collections.defaultdict(int),
-            collections.defaultdict(int),
-            collections.defaultdict(int)
-        )
-        clamp = lambda v, lo, hi: max(lo, min(v, hi))
-
-        def apply_fruit_once():
-            nonlocal latest_stats
-            special = fruit_lower in {"swim fruit", "fly fruit", "run fruit", "power fruit"}
-            if special:
-                if fruit_lower == "swim fruit":
-                    old = latest_stats.get("swim_fly", 0)
-                    new = max(old - 1, -5)
-                    latest_stats["swim_fly"] = new
-                    old_run = latest_stats.get("run_power", 0)
-                    if old_run > 0:
-                        latest_stats["run_power"] = old_run - 1
-                    elif old_run < 0:
-                        latest_stats["run_power"] = old_run + 1
-                    align_changes["swim_fly"] += new - old
-                elif fruit_lower == "fly fruit":
-                    old = latest_stats.get("swim_fly", 0)
-                    new = min(old + 1, 5)
-                    latest_stats["swim_fly"] = new
-                    old_run = latest_stats.get("run_power", 0)
-                    if old_run > 0:
-                        latest_stats["run_power"] = old_run - 1
-                    elif old_run < 0:
-                        latest_stats["run_power"] = old_run + 1
-                    align_changes["swim_fly"] += new - old
-                elif fruit_lower == "run fruit":
-                    old = latest_stats.get("run_power", 0)
-                    new = max(old - 1, -5)
-                    latest_stats["run_power"] = new
-                    old_swim = latest_stats.get("swim_fly", 0)
-                    if old_swim > 0:
-                        latest_stats["swim_fly"] = old_swim - 1
-                    elif old_swim < 0:
-                        latest_stats["swim_fly"] = old_swim + 1
-                    align_changes["run_power"] += new - old
-                elif fruit_lower == "power fruit":
-                    old = latest_stats.get("run_power", 0)
-                    new = min(old + 1, 5)
-                    latest_stats["run_power"] = new
-                    old_swim = latest_stats.get("swim_fly", 0)
-                    if old_swim > 0:
-                        latest_stats["swim_fly"] = old_swim - 1
-                    elif old_swim < 0:
-                        latest_stats["swim_fly"] = old_swim + 1
-                    align_changes["run_power"] += new - old
-
-            adjustments = self.fruit_stats_adjustments.get(fruit_lower, {})
-            if special:
-                adjustments = {k: v for k, v in adjustments.items() if k not in {"run_power", "swim_fly"}}
-
-            for stat, adj in adjustments.items():
-                inc = random.randint(*adj) if isinstance(adj, tuple) else adj
-                if stat in ["hp_ticks", "belly_ticks", "energy_ticks", "happiness_ticks", "illness_ticks"]:
-                    old = latest_stats.get(stat, 0)
-                    if old < 10:
-                        new = clamp(old + inc, 0, 10)
-                        gain = new - old
-                        if gain > 0:
-                            ticks_changes[stat] += gain
-                            latest_stats[stat] = new
-                elif stat.endswith("_ticks"):
-                    level_key = stat.replace("_ticks", "_level")
-                    grade_key = stat.replace("_ticks", "_grade")
-                    exp_key = stat.replace("_ticks", "_exp")
-                    if latest_stats.get(level_key, 0) >= 99:
-                        continue
-                    remaining = inc
-                    while remaining > 0:
-                        curr = latest_stats.get(stat, 0)
-                        to_add = min(remaining, 10 - curr)
-                        new = curr + to_add
-                        remaining -= to_add
-                        if new >= 10:
-                            old_level = latest_stats.get(level_key, 0)
-                            new_level = min(old_level + 1, 99)
-                            latest_stats[level_key] = new_level
-                            if new_level > old_level:
-                                levels_gained[level_key] += 1
-                                grade = latest_stats.get(grade_key, 'F')
-                                chao_cog = self.bot.get_cog("Chao")
-                                latest_stats[exp_key] = latest_stats.get(exp_key, 0) + chao_cog.get_stat_increment(grade)
-                            latest_stats[stat] = 0
-                        else:
-                            gain = new - curr
+            ticks_changes, align_changes, levels_gained = (
+                collections.defaultdict(int),
+                collections.defaultdict(int),
+                collections.defaultdict(int)
+            )
+            clamp = lambda v, lo, hi: max(lo, min(v, hi))
+
+            def apply_fruit_once():
+                special = fruit_lower in {"swim fruit", "fly fruit", "run fruit", "power fruit"}
+                if special:
+                    if fruit_lower == "swim fruit":
+                        old = latest_stats.get("swim_fly", 0)
+                        new = max(old - 1, -5)
+                        latest_stats["swim_fly"] = new
+                        old_run = latest_stats.get("run_power", 0)
+                        if old_run > 0:
+                            latest_stats["run_power"] = old_run - 1
+                        elif old_run < 0:
+                            latest_stats["run_power"] = old_run + 1
+                        align_changes["swim_fly"] += new - old
+                    elif fruit_lower == "fly fruit":
+                        old = latest_stats.get("swim_fly", 0)
+                        new = min(old + 1, 5)
+                        latest_stats["swim_fly"] = new
+                        old_run = latest_stats.get("run_power", 0)
+                        if old_run > 0:
+                            latest_stats["run_power"] = old_run - 1
+                        elif old_run < 0:
+                            latest_stats["run_power"] = old_run + 1
+                        align_changes["swim_fly"] += new - old
+                    elif fruit_lower == "run fruit":
+                        old = latest_stats.get("run_power", 0)
+                        new = max(old - 1, -5)
+                        latest_stats["run_power"] = new
+                        old_swim = latest_stats.get("swim_fly", 0)
+                        if old_swim > 0:
+                            latest_stats["swim_fly"] = old_swim - 1
+                        elif old_swim < 0:
+                            latest_stats["swim_fly"] = old_swim + 1
+                        align_changes["run_power"] += new - old
+                    elif fruit_lower == "power fruit":
+                        old = latest_stats.get("run_power", 0)
+                        new = min(old + 1, 5)
+                        latest_stats["run_power"] = new
+                        old_swim = latest_stats.get("swim_fly", 0)
+                        if old_swim > 0:
+                            latest_stats["swim_fly"] = old_swim - 1
+                        elif old_swim < 0:
+                            latest_stats["swim_fly"] = old_swim + 1
+                        align_changes["run_power"] += new - old
+
+                adjustments = self.fruit_stats_adjustments.get(fruit_lower, {})
+                if special:
+                    adjustments = {k: v for k, v in adjustments.items() if k not in {"run_power", "swim_fly"}}
+
+                for stat, adj in adjustments.items():
+                    inc = random.randint(*adj) if isinstance(adj, tuple) else adj
+                    if stat in ["hp_ticks", "belly_ticks", "energy_ticks", "happiness_ticks", "illness_ticks"]:
+                        old = latest_stats.get(stat, 0)
+                        if old < 10:
+                            new = clamp(old + inc, 0, 10)
+                            gain = new - old
                             if gain > 0:
                                 ticks_changes[stat] += gain
                                 latest_stats[stat] = new
-                elif stat in ["run_power", "swim_fly", "dark_hero"]:
-                    old = latest_stats.get(stat, 0)
-                    new = clamp(old + inc, -5, 5)
-                    delta = new - old
-                    if delta:
-                        align_changes[stat] += delta
-                    latest_stats[stat] = new
-
-        for _ in range(quantity):
-            apply_fruit_once()
-
-        norm_inv[fruit_lower] = have_amount - quantity
-        updated_inv = {k: norm_inv.get(k.lower(), 0) for k in current_inv}
-        self.data_utils.save_inventory(inv_path, inv_df, updated_inv)
-
-        old_form = str(latest_stats.get("Form", "1"))
-        old_type = latest_stats.get("Type", "")
-
-        chao_type, form = self.update_chao_type_and_thumbnail(guild_id, guild_name, user, chao_name, latest_stats)
-        latest_stats["Form"] = form
-        latest_stats["Type"] = chao_type
-
-        self.data_utils.save_chao_stats(chao_stats_path, chao_df, latest_stats)
+                    elif stat.endswith("_ticks"):
+                        level_key = stat.replace("_ticks", "_level")
+                        grade_key = stat.replace("_ticks", "_grade")
+                        exp_key = stat.replace("_ticks", "_exp")
+                        if latest_stats.get(level_key, 0) >= 99:
+                            continue
+                        remaining = inc
+                        while remaining > 0:
+                            curr = latest_stats.get(stat, 0)
+                            to_add = min(remaining, 10 - curr)
+                            new = curr + to_add
+                            remaining -= to_add
+                            if new >= 10:
+                                old_level = latest_stats.get(level_key, 0)
+                                new_level = min(old_level + 1, 99)
+                                latest_stats[level_key] = new_level
+                                if new_level > old_level:
+                                    levels_gained[level_key] += 1
+                                    grade = latest_stats.get(grade_key, 'F')
+                                    chao_cog = self.bot.get_cog("Chao")
+                                    latest_stats[exp_key] = latest_stats.get(exp_key, 0) + chao_cog.get_stat_increment(grade)
+                                latest_stats[stat] = 0
+                            else:
+                                gain = new - curr
+                                if gain > 0:
+                                    ticks_changes[stat] += gain
+                                    latest_stats[stat] = new
+                    elif stat in ["run_power", "swim_fly", "dark_hero"]:
+                        old = latest_stats.get(stat, 0)
+                        new = clamp(old + inc, -5, 5)
+                        delta = new - old
+                        if delta:
+                            align_changes[stat] += delta
+                        latest_stats[stat] = new
+
+            for _ in range(quantity):
+                apply_fruit_once()
+
+            norm_inv[fruit_lower] = have_amount - quantity
+            updated_inv = {k: norm_inv.get(k.lower(), 0) for k in current_inv}
+            req.stage_inventory(updated_inv)
+
+            chao_type, form = await self.data_utils.run_io(
+                self.update_chao_type_and_thumbnail, guild_id, guild_name, user, chao_name, latest_stats
+            )
+            latest_stats["Form"] = form
+            latest_stats["Type"] = chao_type
+            req.stage_chao(chao_name)
+            # Fruit and chao are saved together while the request still holds both
+            # io_locks; evolution/reincarnation/death below save their own transitions.
+            await req.commit()
 
         if latest_stats.get("happiness_ticks", 0) > 5:
             if await self.reincarnation(
@@ -507,7 +562,7 @@ class ChaoLifecycle(commands.Cog):
             elif key.endswith("_grade"):
                 stat_lines.append(f"{key.replace('_grade','').capitalize()} grade improved to {latest_stats.get(key, 'F')}")
 
-        thumbnail_path = os.path.join(chao_dir, f"{chao_name}_thumbnail.png")
+        thumbnail_path = os.path.join(os.path.dirname(chao_stats_path), f"{chao_name}_thumbnail.png")
         if not os.path.exists(thumbnail_path):
             return await self._send(interaction, content=f"{interaction.user.mention}, thumbnail file is missing for **{chao_name}**.")
 
@@ -533,21 +588,14 @@ class ChaoLifecycle(commands.Cog):
     async def feed_chao_autocomplete(self, interaction: discord.Interaction, current: str):
         """
         Autocomplete for the 'chao_name' parameter.
-        Returns a list of Chao names (directories) owned by the user.
+        Returns a list of Chao names owned by the user, from DataUtils' name index.
         """
         print(f"[feed_chao_autocomplete] Current input: {current}")
-        user = interaction.user
-        guild = interaction.guild
         try:
-            guild_folder = self.data_utils.update_server_folder(guild)
-            user_folder = self.data_utils.get_user_folder(guild_folder, user)
-            chao_base = os.path.join(user_folder, "chao_data")
-            print(f"[feed_chao_autocomplete] chao_base: {chao_base}")
-            if not os.path.exists(chao_base):
-                print("[feed_chao_autocomplete] chao_base does not exist")
-                return []
-            chao_names = [d for d in os.listdir(chao_base) if os.path.isdir(os.path.join(chao_base, d))]
-            print(f"[feed_chao_autocomplete] Found chao names: {chao_names}")
+            chao_names = await self.data_utils.run_io(
+                self.data_utils.owned_chao_names, interaction.guild.id, interaction.user.id
+            )
+            print(f"[feed_chao_autocomplete] Found chao names: {sorted(chao_names)}")
         except Exception as e:
             print(f"[feed_chao_autocomplete] Error retrieving chao names: {e}")
             return []
@@ -569,12 +617,12 @@ class ChaoLifecycle(commands.Cog):
         guild = interaction.guild
         guild_id, guild_name = str(guild.id), guild.name
         try:
-            inv_path = self.data_utils.get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
-            inv_df = self.data_utils.load_inventory(inv_path)
+            inv_path = await self.data_utils.aget_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
+            inv_df = await self.data_utils.aload_inventory(inv_path)
             if inv_df.empty:
                 available = []
             else:
-                current_inv = inv_df.iloc[-1].to_dict()
+                current_inv = Inventory.from_frame(inv_df)
                 # Normalize keys and filter by available fruits
                 norm_inv = {k.lower(): v for k, v in current_inv.items() if k.lower() in [f.lower() for f in self.fruits]}
                 available = [fruit for fruit, amt in norm_inv.items() if amt > 0]
@@ -607,13 +655,13 @@ class ChaoLifecycle(commands.Cog):
             int(latest_stats.get(s, 0)) >= 20 for s in ["swim_level", "fly_level", "run_level", "power_level", "stamina_level"]
         ):
             now = datetime.now()
-            evolution_end = now + timedelta(seconds=60)
-            latest_stats["evolution_end_time"] = evolution_end.isoformat()
-            latest_stats["evolution_seconds_left"] = 60
+            evolution_end = now + timedelta(seconds=COCOON_SECONDS)
+            latest_stats["evolution_end_time"] = evolution_end
+            latest_stats["evolution_seconds_left"] = COCOON_SECONDS
             latest_stats["evolve_cacoon"] = 1
-            self.data_utils.save_chao_stats(chao_stats_path, chao_df, latest_stats)
+            await self.data_utils.asave_chao_stats(chao_stats_path, chao_df, latest_stats)
             
-            seconds_left = 60
+            seconds_left = COCOON_SECONDS
 
             stat_lines = []
             for stat, gain in ticks_changes.items():
@@ -643,59 +691,12 @@ class ChaoLifecycle(commands.Cog):
                 description=f"{desc_static}\nTime remaining: {seconds_left} seconds.",
                 color=discord.Color.purple()
             )
-            bg_path = os.path.join(self.assets_dir, "graphics", "thumbnails", "neutral_background.png")
-            overlay_img = os.path.join(self.assets_dir, "graphics", "cacoons", "cacoon_evolve.png")
             safe_name = chao_name.replace(" ", "_")
-            file = self.generate_evolution_image(bg_path, overlay_img, safe_name)
+            file = generate_evolution_image(safe_name)
             embed.set_thumbnail(url=f"attachment://{file.filename}")
             await self._send(interaction, embed=embed, file=file)
 
-            await asyncio.sleep(seconds_left)
-
-            chao_type = latest_stats.get("Type", "")
-            if chao_type:
-                parts = chao_type.split("_")
-                if len(parts) >= 3:
-                    suffix = parts[1]
-                    type_grade_mapping = {
-                        "run": "run_grade",
-                        "fly": "fly_grade",
-                        "power": "power_grade",
-                        "swim": "swim_grade",
-                        "normal": "stamina_grade"
-                    }
-                    stat_key = type_grade_mapping.get(suffix)
-                    if stat_key:
-                        current_grade = latest_stats.get(stat_key, "F")
-                        try:
-                            new_index = min(len(self.GRADES) - 1, self.GRADES.index(current_grade) + 1)
-                            latest_stats[stat_key] = self.GRADES[new_index]
-                        except ValueError:
-                            pass
-
-            latest_stats.pop("evolution_end_time", None)
-            latest_stats.pop("evolution_seconds_left", None)
-            latest_stats["evolve_cacoon"] = 0
-            latest_stats["evolved"] = 1
-
-            self.data_utils.save_chao_stats(chao_stats_path, chao_df, latest_stats)
-
-            guild_id, guild_name, user = str(interaction.guild.id), interaction.guild.name, interaction.user
-            chao_dir = self.data_utils.get_path(guild_id, guild_name, user, 'chao_data', chao_name)
-            thumbnail_path = os.path.join(chao_dir, f"{chao_name}_thumbnail.png")
-            if not os.path.exists(thumbnail_path):
-                await self._send(interaction, content=f"{interaction.user.mention}, thumbnail file is missing for **{chao_name}**.")
-            else:
-                final_embed = discord.Embed(
-                    title="Chao Evolved!",
-                    description=f"{interaction.user.mention}, your chao **{chao_name}** has finished evolving!",
-                    color=self.embed_color
-                )
-                final_embed.set_thumbnail(url="attachment://chao_thumbnail.png")
-                with open(thumbnail_path, 'rb') as f:
-                    thumb = discord.File(f, filename="chao_thumbnail.png")
-                    await self._send(interaction, embed=final_embed, file=thumb)
-
+            await self.start_cocoon(interaction, "evolve", chao_name, evolution_end)
             return True
 
         return False
@@ -714,13 +715,13 @@ class ChaoLifecycle(commands.Cog):
             latest_stats.get("happiness_ticks", 0) >= 5 and
             any(int(latest_stats.get(s, 0)) >= 99 for s in ["swim_level", "fly_level", "run_level", "power_level", "stamina_level"])):
             now = datetime.now()
-            reincarnation_end = now + timedelta(seconds=60)
-            latest_stats["reincarnation_end_time"] = reincarnation_end.isoformat()
-            latest_stats["reincarnation_seconds_left"] = 60
+            reincarnation_end = now + timedelta(seconds=COCOON_SECONDS)
+            latest_stats["reincarnation_end_time"] = reincarnation_end
+            latest_stats["reincarnation_seconds_left"] = COCOON_SECONDS
             latest_stats["reincarnate_cacoon"] = 1
-            self.data_utils.save_chao_stats(chao_stats_path, chao_df, latest_stats)
+            await self.data_utils.asave_chao_stats(chao_stats_path, chao_df, latest_stats)
 
-            seconds_left = 60
+            seconds_left = COCOON_SECONDS
 
             stat_lines = []
             for stat, gain in ticks_changes.items():
@@ -747,46 +748,11 @@ class ChaoLifecycle(commands.Cog):
                 color=discord.Color.purple()
             )
             safe_name = chao_name.replace(" ", "_")
-            file = self.generate_reincarnation_image(latest_stats, safe_name)
+            file = generate_reincarnation_image(latest_stats, safe_name)
             embed.set_thumbnail(url=f"attachment://{file.filename}")
             await self._send(interaction, embed=embed, file=file)
 
-            await asyncio.sleep(seconds_left)
-
-            latest_stats["reincarnations"] = int(latest_stats.get("reincarnations", 0)) + 1
-            latest_stats["hatched"] = 0
-            latest_stats.pop("reincarnation_end_time", None)
-            latest_stats.pop("reincarnation_seconds_left", None)
-            latest_stats["reincarnate_cacoon"] = 0
-            self.data_utils.save_chao_stats(chao_stats_path, chao_df, latest_stats)
-
-            guild_id, guild_name, user = str(interaction.guild.id), interaction.guild.name, interaction.user
-            inv_path = self.data_utils.get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
-            inv_df = self.data_utils.load_inventory(inv_path)
-            current_inv = inv_df.iloc[-1].to_dict() if not inv_df.empty else {}
-            norm_inv = {k.lower(): v for k, v in current_inv.items()}
-            egg_key = "chao egg"
-            norm_inv[egg_key] = norm_inv.get(egg_key, 0) + 1
-            if current_inv:
-                updated_inv = {k: norm_inv.get(k.lower(), 0) for k in current_inv}
-                if "Chao Egg" not in updated_inv:
-                    updated_inv["Chao Egg"] = norm_inv[egg_key]
-            else:
-                updated_inv = {"Chao Egg": norm_inv[egg_key]}
-            self.data_utils.save_inventory(inv_path, inv_df, updated_inv)
-
-            egg_bg_path = os.path.join(self.assets_dir, "graphics", "thumbnails", "egg_background.png")
-            if not os.path.exists(egg_bg_path):
-                await self._send(interaction, content=f"{interaction.user.mention}, egg background file is missing.")
-            else:
-                final_embed = discord.Embed(
-                    title="Chao Reincarnated!",
-                    description=f"{interaction.user.mention}, your chao **{chao_name}** has been reborn and is now in an egg!",
-                    color=self.embed_color
-                )
-                final_embed.set_thumbnail(url="attachment://egg_background.png")
-                egg_file = discord.File(egg_bg_path, filename="egg_background.png")
-                await self._send(interaction, embed=final_embed, file=egg_file)
+            await self.start_cocoon(interaction, "reincarnate", chao_name, reincarnation_end)
             return True
         return False
 
@@ -804,13 +770,13 @@ class ChaoLifecycle(commands.Cog):
             latest_stats.get("happiness_ticks", 0) <= 5 and
             any(int(latest_stats.get(s, 0)) >= 99 for s in ["swim_level", "fly_level", "run_level", "power_level", "stamina_level"])):
             now = datetime.now()
-            death_end = now + timedelta(seconds=60)
-            latest_stats["death_end_time"] = death_end.isoformat()
-            latest_stats["death_seconds_left"] = 60
+            death_end = now + timedelta(seconds=COCOON_SECONDS)
+            latest_stats["death_end_time"] = death_end
+            latest_stats["death_seconds_left"] = COCOON_SECONDS
             latest_stats["death_cacoon"] = 1
-            self.data_utils.save_chao_stats(chao_stats_path, chao_df, latest_stats)
+            await self.data_utils.asave_chao_stats(chao_stats_path, chao_df, latest_stats)
 
-            seconds_left = 60
+            seconds_left = COCOON_SECONDS
 
             stat_lines = []
             for stat, gain in ticks_changes.items():
@@ -837,33 +803,226 @@ class ChaoLifecycle(commands.Cog):
                 color=discord.Color.dark_red()
             )
             safe_name = chao_name.replace(" ", "_")
-            file = self.generate_death_image(latest_stats, safe_name)
+            file = generate_death_image(latest_stats, safe_name)
             embed.set_thumbnail(url=f"attachment://{file.filename}")
             await self._send(interaction, embed=embed, file=file)
 
-            await asyncio.sleep(seconds_left)
+            await self.start_cocoon(interaction, "death", chao_name, death_end)
+            return True
+        return False
+
+    # ------------------- Cocoon timers -------------------
+    async def start_cocoon(self, interaction: discord.Interaction, kind: str, chao_name: str, due: datetime):
+        """Hands a chao that just entered a cocoon to the timer loop, which finishes it at due."""
+        key = self.cocoons.add(kind, interaction.guild.id, interaction.user.id, chao_name, interaction.channel_id, due)
+        self.cocoon_followups[key] = interaction
+        await self.data_utils.run_io(self.cocoons.save)
+        self.cocoon_wake.set()
 
-            latest_stats["deaths"] = int(latest_stats.get("deaths", 0)) + 1
-            if not latest_stats.get("date_of_death"):
-                latest_stats["date_of_death"] = datetime.now().strftime("%Y-%m-%d")
-            latest_stats["dead"] = 1
-            latest_stats["hp_ticks"] = 0
-            latest_stats.pop("death_end_time", None)
-            latest_stats.pop("death_seconds_left", None)
-            latest_stats["death_cacoon"] = 0
-            self.data_utils.save_chao_stats(chao_stats_path, chao_df, latest_stats)
+    def _recover_cocoons(self):
+        """
+        Re-arms cocoons the timer file doesn't know about (e.g. started before a
+        crash lost the last save), found through the manifests' cocoon flag.
+        Blocking; run it on the I/O pool.
+        """
+        recovered = 0
+        for guild in self.bot.guilds:
+            for entry in self.data_utils.chao_manifest(guild.id):
+                if not entry["cocoon"] or CocoonTimers.key(guild.id, entry["owner"], entry["name"]) in self.cocoons:
+                    continue
+                latest_stats = self.data_utils.load_latest_chao_stats(entry["stats_path"])
+                for kind, (flag, end_col, _) in COCOON_COLUMNS.items():
+                    if latest_stats.get(flag, 0) == 1:
+                        due = coerce_datetime(latest_stats.get(end_col)) or datetime.now()
+                        self.cocoons.add(kind, guild.id, entry["owner"], entry["name"], None, due)
+                        recovered += 1
+                        break
+        return recovered
+
+    def _owned_chao(self, guild_id, user_id, chao_name):
+        """The chao's manifest entry (with its current stats_path), or None if it is gone."""
+        return next((e for e in self.data_utils.chao_manifest(guild_id, user_id) if e["name"] == chao_name), None)
+
+    async def finish_cocoon(self, key, entry):
+        """Completes one due cocoon from the chao's current stats and posts the outcome."""
+        flag, end_col, left_col = COCOON_COLUMNS[entry["kind"]]
+        chao = await self.data_utils.run_io(self._owned_chao, entry["guild_id"], entry["user_id"], entry["chao_name"])
+        if chao is None:
+            return
+        chao_stats_path = chao["stats_path"]
+        # Locked from load to save: a command's RequestContext holding the pre-finish row
+        # would otherwise commit it afterwards and put the chao back in its cocoon.
+        async with self.data_utils.io_lock(chao_stats_path):
+            chao_df = await self.data_utils.aload_chao_stats(chao_stats_path)
+            if chao_df.empty:
+                return
+            latest_stats = ChaoState.from_frame(chao_df)
+            if latest_stats.get(flag, 0) != 1:
+                return
 
-            d = latest_stats.get("date_of_death", datetime.now().strftime("%Y-%m-%d"))
+            latest_stats.pop(end_col, None)
+            latest_stats.pop(left_col, None)
+            latest_stats[flag] = 0
+            finish = {"evolve": self._finish_evolution, "reincarnate": self._finish_reincarnation,
+                      "death": self._finish_death}[entry["kind"]]
+            make_message = await finish(entry, chao, latest_stats)
+            await self.data_utils.asave_chao_stats(chao_stats_path, chao_df, latest_stats)
+        await self._post_cocoon_outcome(key, entry, make_message)
+
+    async def _finish_evolution(self, entry, chao, latest_stats):
+        chao_type = latest_stats.get("Type", "")
+        if chao_type:
+            parts = chao_type.split("_")
+            if len(parts) >= 3:
+                suffix = parts[1]
+                type_grade_mapping = {
+                    "run": "run_grade",
+                    "fly": "fly_grade",
+                    "power": "power_grade",
+                    "swim": "swim_grade",
+                    "normal": "stamina_grade"
+                }
+                stat_key = type_grade_mapping.get(suffix)
+                if stat_key:
+                    current_grade = latest_stats.get(stat_key, "F")
+                    try:
+                        new_index = min(len(self.GRADES) - 1, self.GRADES.index(current_grade) + 1)
+                        latest_stats[stat_key] = self.GRADES[new_index]
+                    except ValueError:
+                        pass
+        latest_stats["evolved"] = 1
+
+        chao_name, mention = entry["chao_name"], f"<@{entry['user_id']}>"
+        thumbnail_path = os.path.join(os.path.dirname(chao["stats_path"]), f"{chao_name}_thumbnail.png")
+
+        def make_message():
+            if not os.path.exists(thumbnail_path):
+                return {"content": f"{mention}, thumbnail file is missing for **{chao_name}**."}
+            final_embed = discord.Embed(
+                title="Chao Evolved!",
+                description=f"{mention}, your chao **{chao_name}** has finished evolving!",
+                color=self.embed_color
+            )
+            final_embed.set_thumbnail(url="attachment://chao_thumbnail.png")
+            return {"embed": final_embed, "file": discord.File(thumbnail_path, filename="chao_thumbnail.png")}
+        return make_message
+
+    async def _finish_reincarnation(self, entry, chao, latest_stats):
+        latest_stats["reincarnations"] = int(latest_stats.get("reincarnations", 0)) + 1
+        latest_stats["hatched"] = 0
+
+        # <user folder>/chao_data/<name>/<name>_stats.parquet -> <user folder>/user_data/inventory.parquet
+        user_folder = os.path.dirname(os.path.dirname(os.path.dirname(chao["stats_path"])))
+        inv_path = os.path.join(user_folder, "user_data", "inventory.parquet")
+        async with self.data_utils.io_lock(inv_path):
+            inv_df = await self.data_utils.aload_inventory(inv_path)
+            current_inv = Inventory.from_frame(inv_df) if not inv_df.empty else Inventory()
+            norm_inv = {k.lower(): v for k, v in current_inv.items()}
+            egg_key = "chao egg"
+            norm_inv[egg_key] = norm_inv.get(egg_key, 0) + 1
+            if current_inv:
+                updated_inv = {k: norm_inv.get(k.lower(), 0) for k in current_inv}
+                if "Chao Egg" not in updated_inv:
+                    updated_inv["Chao Egg"] = norm_inv[egg_key]
+            else:
+                updated_inv = {"Chao Egg": norm_inv[egg_key]}
+            await self.data_utils.asave_inventory(inv_path, inv_df, updated_inv)
+
+        chao_name, mention = entry["chao_name"], f"<@{entry['user_id']}>"
+        egg_bg_path = os.path.join(self.assets_dir, "graphics", "thumbnails", "egg_background.png")
+
+        def make_message():
+            if not os.path.exists(egg_bg_path):
+                return {"content": f"{mention}, egg background file is missing."}
+            final_embed = discord.Embed(
+                title="Chao Reincarnated!",
+                description=f"{mention}, your chao **{chao_name}** has been reborn and is now in an egg!",
+                color=self.embed_color
+            )
+            final_embed.set_thumbnail(url="attachment://egg_background.png")
+            return {"embed": final_embed, "file": discord.File(egg_bg_path, filename="egg_background.png")}
+        return make_message
+
+    async def _finish_death(self, entry, chao, latest_stats):
+        latest_stats["deaths"] = int(latest_stats.get("deaths", 0)) + 1
+        if not latest_stats.get("date_of_death"):
+            latest_stats["date_of_death"] = datetime.now().strftime("%Y-%m-%d")
+        latest_stats["dead"] = 1
+        latest_stats["hp_ticks"] = 0
+
+        chao_name, d = entry["chao_name"], latest_stats.get("date_of_death")
+        thumb = os.path.join(ASSETS_DIR, "graphics", "thumbnails", "chao_grave.png")
+
+        def make_message():
             embed = discord.Embed(
                 title=f"{chao_name} has passed...",
                 description=f"{chao_name} can no longer be interacted with.\n\n**Date of Death:** {d}",
                 color=discord.Color.dark_gray()
             )
-            thumb = os.path.join(ASSETS_DIR, "graphics", "thumbnails", "chao_grave.png")
-            file = discord.File(thumb, filename="chao_grave.png")
             embed.set_thumbnail(url="attachment://chao_grave.png")
-            return await self._send(interaction, file=file, embed=embed)
-        return False
+            return {"embed": embed, "file": discord.File(thumb, filename="chao_grave.png")}
+        return make_message
+
+    async def _post_cocoon_outcome(self, key, entry, make_message):
+        """
+        Follows up on the interaction that started the cocoon while its token is
+        still valid; otherwise (e.g. after a restart) posts in the channel the
+        command was used in, or the server's system channel, mentioning the owner.
+        """
+        interaction = self.cocoon_followups.pop(key, None)
+        if interaction is not None and not interaction.is_expired():
+            try:
+                return await interaction.followup.send(**make_message())
+            except discord.HTTPException as e:
+                print(f"[ChaoLifecycle] Cocoon follow-up for {entry['chao_name']} failed: {e}")
+
+        channel = self.bot.get_channel(entry["channel_id"]) if entry.get("channel_id") else None
+        if channel is None:
+            guild = self.bot.get_guild(entry["guild_id"])
+            channel = guild.system_channel if guild else None
+        if channel is None:
+            return
+        message = make_message()
+        mention = f"<@{entry['user_id']}>"
+        if not message.get("content", "").startswith(mention):
+            message["content"] = f"{mention} {message.get('content', '')}".rstrip()
+        try:
+            await channel.send(**message)
+        except discord.HTTPException as e:
+            print(f"[ChaoLifecycle] Cocoon outcome post for {entry['chao_name']} failed: {e}")
+
+    @tasks.loop(seconds=0)
+    async def cocoon_loop(self):
+        """Sleeps until the earliest cocoon deadline (or a new cocoon), then finishes every due cocoon."""
+        self.cocoon_wake.clear()
+        now = datetime.now()
+        next_due = self.cocoons.next_due()
+        if next_due is None or next_due > now:
+            delay = (next_due - now).total_seconds() if next_due else COCOON_MAX_SLEEP
+            try:
+                await asyncio.wait_for(self.cocoon_wake.wait(), timeout=min(delay, COCOON_MAX_SLEEP))
+            except asyncio.TimeoutError:
+                pass
+            return
+
+        for key, entry in self.cocoons.pop_due(now):
+            try:
+                await self.finish_cocoon(key, entry)
+            except Exception as e:
+                # The chao keeps its cocoon flag, so the next startup re-arms it.
+                print(f"[ChaoLifecycle] Could not finish the {entry['kind']} cocoon of {entry['chao_name']}: {e}")
+        await self.data_utils.run_io(self.cocoons.save)
+
+    @cocoon_loop.before_loop
+    async def before_cocoon_loop(self):
+        await self.bot.wait_until_ready()
+        await self.data_utils.run_io(self.cocoons.load)
+        recovered = await self.data_utils.run_io(self._recover_cocoons)
+        if recovered:
+            await self.data_utils.run_io(self.cocoons.save)
+        if len(self.cocoons):
+            print(f"[ChaoLifecycle] {len(self.cocoons)} pending cocoon(s) restored ({recovered} from chao stats).")
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(ChaoLifecycle(bot))
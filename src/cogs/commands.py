@@ -126,6 +126,11 @@ class Commands(commands.Cog):
     async def force_hp_decay(self, interaction: discord.Interaction, ticks: int, minutes: int):
         await self.chao_decay_cog.force_hp_decay(interaction, ticks=ticks, minutes=minutes)
 
+    @app_commands.command(name="decay_status", description="(Admin) Show decay timings, lag and overruns.")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def decay_status(self, interaction: discord.Interaction):
+        await self.chao_decay_cog.decay_status(interaction)
+
     @app_commands.command(name="force_life_check", description="(Admin) Force a Chao life check.")
     @app_commands.checks.has_permissions(administrator=True)
     @app_commands.describe(chao_name="Name of the Chao")
@@ -191,6 +196,12 @@ class Commands(commands.Cog):
     async def restore(self, interaction: discord.Interaction, args: str):
         await self.data_utils.restore(interaction, args=args)
 
+    @app_commands.command(name="export_dataset", description="(Admin) Export all chao and inventory history for analytics.")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.describe(incremental="Only export what changed since the last export")
+    async def export_dataset(self, interaction: discord.Interaction, incremental: bool = False):
+        await self.data_utils.export(interaction, incremental=incremental)
+
     @app_commands.command(name="goodbye", description="Send your Chao away to the faraway Chao Forest.")
     @ensure_user_initialized
     @ensure_chao_alive
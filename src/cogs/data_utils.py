@@ -1,17 +1,114 @@
 # cogs/data_utils.py
 
 import os
+import json
+import time
+import asyncio
+import threading
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from datetime import datetime
 from dateutil.parser import parse as date_parse
-from discord.ext import commands
+from discord.ext import commands, tasks
 import discord
+from config import (
+    STORAGE_BACKEND, EXPORT_DIR,
+    WRITE_BEHIND_CACHE, WRITE_BEHIND_FLUSH_SECONDS, WRITE_BEHIND_IDLE_SECONDS,
+    SEGMENT_COMPACT_MINUTES, IO_POOL_WORKERS,
+    RETENTION_ENABLED, RETENTION_DAILY_DAYS, RETENTION_WEEKLY_DAYS, RETENTION_HOURS,
+    RETENTION_PAUSE_SECONDS
+)
+from storage.backends import open_store
+from storage.export import export_dataset
+from storage.parquet_store import apply_today_row
+from storage.schema import coerce_chao_row, coerce_value, normalize_chao_frame
+from storage.segment_store import SegmentStore
+from storage.sqlite_store import SQLiteStore
+from storage.records import ChaoState, Inventory, apply_liveness
+from storage.retention import downsample, nearest_retained_date
+
+
+class _CacheEntry:
+    """Latest known state of one chao or inventory, plus its unflushed row."""
+    __slots__ = ("kind", "path", "df", "pending", "dirty", "touched")
+
+    def __init__(self, kind, path, df):
+        self.kind = kind
+        self.path = path
+        self.df = df
+        self.pending = None
+        self.dirty = False
+        self.touched = time.monotonic()
+
 
 class DataUtils(commands.Cog):
-    def __init__(self, bot: commands.Bot):
+    def __init__(self, bot: commands.Bot, database_path=None, backend=STORAGE_BACKEND):
         self.bot = bot
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
 
+        self.backend = backend
+        self.store = open_store(backend, database_path)
+        print(f"[DataUtils] Using {backend} storage backend.")
+
+        # Write-behind cache: path -> _CacheEntry
+        self.cache_enabled = WRITE_BEHIND_CACHE
+        self.cache = {}
+        self.cache_lock = threading.RLock()
+        self.cache_hits = self.cache_misses = self.cache_writes = self.cache_flushed = 0
+
+        # Path index: guild_id -> guild folder name, (guild_id, user_id) -> user folder name.
+        # Built from disk once; kept current by the guild/member/user update listeners.
+        self.database_path = database_path or os.path.join(self.base_dir, '../../database')
+        self.guild_folders = {}
+        self.user_folders = {}
+        self.path_lock = threading.RLock()
+        self.path_hits = self.path_misses = 0
+        self._build_path_index()
+
+        # Chao manifest: guild_id -> {chao_id: entry}, mirrored to <guild folder>/chao_manifest.json.
+        # Loaded (or built by one crawl) the first time a guild is enumerated.
+        self.manifests = {}
+        self.manifest_lock = threading.RLock()
+        # (guild_id, owner_id) -> set of chao names, derived from the manifests.
+        self.chao_names = {}
+
+        # Bounded pool for the async API; every blocking storage call goes through here.
+        self.io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="chao-io")
+        # Per-path asyncio locks for load -> modify -> save sequences that now span awaits.
+        self.io_locks = {}
+        # Chao stats leased to a decay worker process: loads and saves of them wait until the
+        # worker's batch is released. chao_users counts the threads inside one right now.
+        self.leased = set()
+        self.chao_users = {}
+        self.lease_cond = threading.Condition()
+
+        # Set by ChaoDecay in lazy mode: df -> df with the newest row decayed up to now.
+        self.decay_on_read = None
+        # Set by ChaoDecay: (stats_path, newest row or None if the chao moved away), called on every write.
+        self.on_chao_write = None
+
+    async def cog_load(self):
+        if self.cache_enabled:
+            self.flush_loop.start()
+        if isinstance(self.store, SegmentStore):
+            self.compact_loop.start()
+        if RETENTION_ENABLED:
+            self.retention_loop.start()
+
+    def cog_unload(self):
+        # Flush whatever is still pending before the bot goes away.
+        self.flush_loop.cancel()
+        self.compact_loop.cancel()
+        self.retention_loop.cancel()
+        if self.cache_enabled:
+            written = self.flush()
+            print(f"[DataUtils] Flushed {written} pending write(s) on shutdown.")
+        self.io_pool.shutdown(wait=True)
+        if isinstance(self.store, SQLiteStore):
+            self.store.close()
+
     def sanitize_folder_name(self, folder_name):
         """Sanitize the folder name to make it filesystem-safe."""
         return "".join([c if c.isalnum() or c in " -_()" else "_" for c in folder_name])
@@ -20,38 +117,80 @@ class DataUtils(commands.Cog):
         """Constructs the folder path for a server, ensuring it includes the sanitized server name."""
         sanitized_name = self.sanitize_folder_name(guild_name)
         folder_name = f"{guild_id} ({sanitized_name})"
-        return os.path.join(self.base_dir, '../../database', folder_name)
+        return os.path.join(self.database_path, folder_name)
+
+    # ------------------- Path index -------------------
+    @staticmethod
+    def _folder_id(folder_name):
+        """Leading ID of a '<id> (...)' folder name, or None for folders like 'Chao Forest'."""
+        head = folder_name.split(" ")[0]
+        return int(head) if head.isdigit() else None
+
+    def _build_path_index(self):
+        """Scans database/<guild>/<user> once so later lookups never list directories."""
+        os.makedirs(self.database_path, exist_ok=True)
+        for guild_folder in os.listdir(self.database_path):
+            guild_path = os.path.join(self.database_path, guild_folder)
+            guild_id = self._folder_id(guild_folder)
+            if guild_id is None or not os.path.isdir(guild_path):
+                continue
+            self.guild_folders[guild_id] = guild_folder
+            for user_folder in os.listdir(guild_path):
+                user_id = self._folder_id(user_folder)
+                if user_id is not None and os.path.isdir(os.path.join(guild_path, user_folder)):
+                    self.user_folders[(guild_id, user_id)] = user_folder
+        print(f"[DataUtils] Indexed {len(self.guild_folders)} server folder(s) "
+              f"and {len(self.user_folders)} user folder(s).")
+
+    def _rename_folder(self, current_path, correct_path):
+        """
+        Renames a guild/user folder. Pending cached writes are flushed first and
+        cached entries under the old path dropped, so nothing is written back to it.
+        """
+        if self.cache_enabled:
+            self.flush()
+        os.rename(current_path, correct_path)
+        prefix = self._cache_key(current_path) + os.sep
+        with self.cache_lock:
+            for key in [k for k in self.cache if k.startswith(prefix)]:
+                del self.cache[key]
+
+    def _resolve_folder(self, index, key, parent_path, folder_name):
+        """
+        Returns parent_path/folder_name, using the index to find the folder under
+        its current name. Only a miss (unknown or renamed folder) touches the disk.
+        """
+        with self.path_lock:
+            current_folder = index.get(key)
+            correct_path = os.path.join(parent_path, folder_name)
+            if current_folder == folder_name:
+                self.path_hits += 1
+                return correct_path
+
+            self.path_misses += 1
+            if current_folder and os.path.exists(os.path.join(parent_path, current_folder)):
+                self._rename_folder(os.path.join(parent_path, current_folder), correct_path)
+            else:
+                # Create the correct folder if it doesn't exist
+                os.makedirs(correct_path, exist_ok=True)
+            index[key] = folder_name
+            return correct_path
 
     def update_server_folder(self, guild):
         """Ensures the server folder matches the current server name and renames it if needed."""
-        base_path = os.path.join(self.base_dir, '../../database')
         sanitized_name = self.sanitize_folder_name(guild.name)
         correct_folder_name = f"{guild.id} ({sanitized_name})"
-        correct_path = os.path.join(base_path, correct_folder_name)
-
-        # Find the current folder
-        current_folder = next(
-            (f for f in os.listdir(base_path) if f.startswith(str(guild.id))),
-            None
-        )
-
-        if current_folder:
-            current_path = os.path.join(base_path, current_folder)
-            if current_folder != correct_folder_name:
-                os.rename(current_path, correct_path)
-        else:
-            # Create the correct folder if it doesn't exist
-            os.makedirs(correct_path, exist_ok=True)
-
-        return correct_path
+        return self._resolve_folder(self.guild_folders, guild.id, self.database_path, correct_folder_name)
 
     def get_user_folder(self, guild_folder, user):
         """
         Constructs the folder path for a user, ensuring it includes their ID, account name, and display name.
         """
+        guild_id = self._folder_id(os.path.basename(os.path.normpath(guild_folder)))
+
         # Ensure 'user' is a Member or User object
         if isinstance(user, str):  # If it's a user ID, resolve it to a Member object
-            guild = self.bot.get_guild(int(guild_folder.split(" ")[0]))  # Extract guild ID from folder name
+            guild = self.bot.get_guild(guild_id) if guild_id else None
             user = guild.get_member(int(user)) if guild else None
 
         if not user or not hasattr(user, "name") or not hasattr(user, "display_name"):
@@ -63,24 +202,40 @@ class DataUtils(commands.Cog):
         sanitized_display = self.sanitize_folder_name(display_name)
         folder_name = f"{user.id} ({sanitized_account}) ({sanitized_display})"
 
-        # Find the current folder if it exists
-        current_folder = next(
-            (f for f in os.listdir(guild_folder) if f.startswith(str(user.id))),
-            None
-        )
-
-        correct_path = os.path.join(guild_folder, folder_name)
-
-        # If the folder name doesn't match, rename it
-        if current_folder:
-            current_path = os.path.join(guild_folder, current_folder)
-            if current_folder != folder_name:
-                os.rename(current_path, correct_path)
-        else:
-            # Create the correct folder if it doesn't exist
-            os.makedirs(correct_path, exist_ok=True)
-
-        return correct_path
+        return self._resolve_folder(self.user_folders, (guild_id, user.id), guild_folder, folder_name)
+
+    def path_stats(self):
+        with self.path_lock:
+            return {
+                "guilds": len(self.guild_folders),
+                "users": len(self.user_folders),
+                "hits": self.path_hits,
+                "misses": self.path_misses,
+            }
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
+        if before.name != after.name and after.id in self.guild_folders:
+            await self.run_io(self.update_server_folder, after)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if (before.name, before.display_name) == (after.name, after.display_name):
+            return
+        if (after.guild.id, after.id) in self.user_folders:
+            guild_folder = await self.run_io(self.update_server_folder, after.guild)
+            await self.run_io(self.get_user_folder, guild_folder, after)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        # Account name changes arrive here rather than in on_member_update.
+        if before.name == after.name:
+            return
+        for guild in after.mutual_guilds:
+            member = guild.get_member(after.id)
+            if member and (guild.id, after.id) in self.user_folders:
+                guild_folder = await self.run_io(self.update_server_folder, guild)
+                await self.run_io(self.get_user_folder, guild_folder, member)
 
     def is_user_initialized(self, guild_id, guild_name, user):
         """
@@ -94,9 +249,9 @@ class DataUtils(commands.Cog):
         if not os.path.exists(user_folder):
             return False
 
-        # Now just check if inventory.parquet exists
+        # Now just check if the inventory exists
         inventory_path = os.path.join(user_folder, 'user_data', 'inventory.parquet')
-        return os.path.exists(inventory_path)
+        return self.data_exists(inventory_path)
 
     def get_path(self, guild_id, guild_name, user, folder, filename):
         """Returns a path under server_folder -> user_folder -> folder -> filename."""
@@ -114,115 +269,562 @@ class DataUtils(commands.Cog):
         os.makedirs(target_folder, exist_ok=True)
         return os.path.join(target_folder, filename)
 
-    def save_inventory(self, path, inventory_df, current_inventory):
+    # ------------------- Chao manifest -------------------
+    MANIFEST_FILE = "chao_manifest.json"
+    MANIFEST_FLAGS = {
+        "dead": ("dead",),
+        "hatched": ("hatched",),
+        "cocoon": ("evolve_cacoon", "reincarnate_cacoon", "death_cacoon"),
+    }
+
+    def _manifest_key(self, chao_stats_path):
         """
-        Saves the user's inventory to Parquet, either appending or overwriting today's row.
+        (guild_id, owner_id, chao_name) for database/<guild>/<user>/chao_data/<name>/<name>_stats.parquet,
+        or None for anything else (e.g. chao living in the Chao Forest).
         """
-        current_date_str = datetime.now().strftime("%Y-%m-%d")
-        current_inventory.setdefault('Chao Egg', 0)
+        rel = os.path.relpath(os.path.abspath(chao_stats_path), os.path.abspath(self.database_path))
+        parts = rel.split(os.sep)
+        if len(parts) != 5 or parts[2] != "chao_data" or parts[4] != f"{parts[3]}_stats.parquet":
+            return None
+        guild_id, owner_id = self._folder_id(parts[0]), self._folder_id(parts[1])
+        if guild_id is None or owner_id is None:
+            return None
+        return guild_id, owner_id, parts[3]
+
+    def _manifest_file(self, guild_id):
+        guild_folder = self.guild_folders.get(guild_id)
+        return os.path.join(self.database_path, guild_folder, self.MANIFEST_FILE) if guild_folder else None
+
+    def _manifest_flags(self, row, entry):
+        for flag, columns in self.MANIFEST_FLAGS.items():
+            present = [c for c in columns if c in row]
+            if present:
+                entry[flag] = any(coerce_value(c, row.get(c)) for c in present)
+        return entry
+
+    def _save_manifest(self, guild_id):
+        path = self._manifest_file(guild_id)
+        if path is None:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifests[guild_id], f)
+        os.replace(tmp_path, path)
+
+    def _load_manifest(self, guild_id):
+        """The guild's manifest, read from disk or built by crawling its folder once."""
+        with self.manifest_lock:
+            manifest = self.manifests.get(guild_id)
+            if manifest is not None:
+                return manifest
+            path = self._manifest_file(guild_id)
+            if path and os.path.exists(path):
+                with open(path, "r") as f:
+                    manifest = self.manifests[guild_id] = json.load(f)
+                for entry in manifest.values():
+                    self._index_name(guild_id, entry["owner"], entry["name"])
+                return manifest
+
+            manifest = self.manifests[guild_id] = {}
+            guild_path = os.path.dirname(path) if path else None
+            if guild_path and os.path.isdir(guild_path):
+                for user_folder in os.listdir(guild_path):
+                    chao_dir = os.path.join(guild_path, user_folder, "chao_data")
+                    if not os.path.isdir(chao_dir):
+                        continue
+                    for chao_name in os.listdir(chao_dir):
+                        stats_path = os.path.join(chao_dir, chao_name, f"{chao_name}_stats.parquet")
+                        if self._manifest_key(stats_path) and self.data_exists(stats_path):
+                            self._manifest_record(stats_path, self.load_latest_chao_stats(stats_path), save=False)
+                self._save_manifest(guild_id)
+                print(f"[DataUtils] Built chao manifest for guild {guild_id} ({len(manifest)} chao).")
+            return manifest
+
+    def _manifest_record(self, chao_stats_path, row, save=True):
+        """Adds or updates the manifest entry for a chao after a write. Only changes hit the disk."""
+        key = self._manifest_key(chao_stats_path)
+        if key is None:
+            return
+        guild_id, owner_id, chao_name = key
+        chao_id = f"{owner_id}/{chao_name}"
+        with self.manifest_lock:
+            manifest = self.manifests.get(guild_id)
+            if manifest is None:
+                if not save:
+                    return
+                manifest = self._load_manifest(guild_id)
+            old = manifest.get(chao_id)
+            entry = self._manifest_flags(row, dict(old or {
+                "id": chao_id, "owner": owner_id, "name": chao_name,
+                "path": os.path.join("chao_data", chao_name, f"{chao_name}_stats.parquet"),
+                "dead": False, "hatched": True, "cocoon": False,
+            }))
+            if old is None:
+                self._index_name(guild_id, owner_id, chao_name)
+            if entry != old:
+                manifest[chao_id] = entry
+                if save:
+                    self._save_manifest(guild_id)
+
+    def _manifest_move(self, old_stats_path, new_stats_path):
+        old_key, new_key = self._manifest_key(old_stats_path), self._manifest_key(new_stats_path)
+        with self.manifest_lock:
+            old_entry = None
+            if old_key is not None:
+                manifest = self._load_manifest(old_key[0])
+                old_entry = manifest.pop(f"{old_key[1]}/{old_key[2]}", None)
+                self._index_name(*old_key, add=False)
+                self._save_manifest(old_key[0])
+            if new_key is not None:
+                flags = {f: old_entry[f] for f in self.MANIFEST_FLAGS} if old_entry else {}
+                self._manifest_record(new_stats_path, {})
+                manifest = self.manifests[new_key[0]]
+                manifest[f"{new_key[1]}/{new_key[2]}"].update(flags)
+                self._save_manifest(new_key[0])
+
+    def _index_name(self, guild_id, owner_id, chao_name, add=True):
+        names = self.chao_names.setdefault((guild_id, owner_id), set())
+        if add:
+            names.add(chao_name)
+        else:
+            names.discard(chao_name)
 
-        if not inventory_df.empty:
-            if current_date_str in inventory_df['date'].values:
-                index = inventory_df[inventory_df['date'] == current_date_str].index[0]
-                for key, val in current_inventory.items():
-                    if key != 'date':
-                        inventory_df.at[index, key] = val
+    def owned_chao_names(self, guild_id, owner_id):
+        """
+        Names of the chao in a user's chao_data folder, from the in-memory name
+        index. Blocking on the first call for a guild; run it on the I/O pool.
+        """
+        guild_id = int(guild_id)
+        with self.manifest_lock:
+            self._load_manifest(guild_id)
+            return set(self.chao_names.get((guild_id, int(owner_id)), ()))
+
+    def chao_manifest(self, guild_id, owner_id=None):
+        """
+        Manifest entries for a guild (optionally one owner's), each a dict with
+        id, owner, name, path, dead, hatched and cocoon plus 'stats_path', the
+        absolute stats path under the owner's current folder. Blocking on the
+        first call for a guild; run it on the I/O pool.
+        """
+        guild_id = int(guild_id)
+        with self.manifest_lock:
+            entries = [dict(e) for e in self._load_manifest(guild_id).values()
+                       if owner_id is None or e["owner"] == int(owner_id)]
+        guild_folder = self.guild_folders.get(guild_id)
+        result = []
+        for entry in entries:
+            user_folder = self.user_folders.get((guild_id, entry["owner"]))
+            if not guild_folder or not user_folder:
+                continue
+            entry["folder"] = user_folder
+            entry["stats_path"] = os.path.join(self.database_path, guild_folder, user_folder, entry["path"])
+            result.append(entry)
+        return result
+
+    def chao_entry(self, guild_id, owner_id, chao_name):
+        """
+        The manifest entry (id, owner, name, path, dead, hatched, cocoon) of one
+        chao, or None if the manifest doesn't know it. A single dict lookup once
+        the guild's manifest is loaded; blocking on the first call for a guild.
+        """
+        with self.manifest_lock:
+            entry = self._load_manifest(int(guild_id)).get(f"{int(owner_id)}/{chao_name}")
+            return dict(entry) if entry else None
+
+    # ------------------- Write-behind cache -------------------
+    @staticmethod
+    def _cache_key(path):
+        return os.path.normpath(os.path.abspath(path))
+
+    def _cached_load(self, kind, path, loader):
+        key = self._cache_key(path)
+        with self.cache_lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.cache_hits += 1
+                entry.touched = time.monotonic()
+                return entry.df
+            self.cache_misses += 1
+        df = loader(path)
+        with self.cache_lock:
+            # Another caller may have populated the entry while we were reading.
+            entry = self.cache.setdefault(key, _CacheEntry(kind, path, df))
+            return entry.df
+
+    def _cached_save(self, kind, path, df, row):
+        key = self._cache_key(path)
+        with self.cache_lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                entry = self.cache[key] = _CacheEntry(kind, path, df)
+            if kind == "chao":
+                row = coerce_chao_row(dict(row))
+                entry.df = normalize_chao_frame(apply_today_row(entry.df, row))
             else:
-                current_inventory['date'] = current_date_str
-                all_cols = ['date'] + sorted([c for c in current_inventory if c != 'date'])
-                new_entry_df = pd.DataFrame([current_inventory])[all_cols]
-                inventory_df = pd.concat([inventory_df, new_entry_df], ignore_index=True).fillna(0)
+                entry.df = apply_today_row(entry.df, row)
+            entry.pending = {**(entry.pending or {}), **row}
+            entry.dirty = True
+            entry.touched = time.monotonic()
+            self.cache_writes += 1
+
+    def _write_row(self, kind, path, df, row):
+        if kind == "chao":
+            self.store.save_chao_stats(path, df.copy(), dict(row))
         else:
-            current_inventory['date'] = current_date_str
-            all_cols = ['date'] + sorted([c for c in current_inventory if c != 'date'])
-            inventory_df = pd.DataFrame([current_inventory])[all_cols]
+            self.store.save_inventory(path, df.copy(), dict(row))
+
+    def flush(self):
+        """
+        Writes every dirty cache entry to the backend. Repeated saves of the
+        same chao or inventory since the last flush become a single write.
+        Clean entries that have not been touched for a while are evicted.
+        """
+        with self.cache_lock:
+            dirty = [(key, entry) for key, entry in self.cache.items() if entry.dirty]
+
+        written = 0
+        for key, entry in dirty:
+            # Chao are written under _chao_access so a decay worker lease never overlaps a flush.
+            access = self._chao_access(entry.path) if entry.kind == "chao" else contextlib.nullcontext()
+            with access:
+                with self.cache_lock:
+                    if not entry.dirty or self.cache.get(key) is not entry:
+                        continue
+                    df, pending = entry.df, entry.pending
+                    entry.dirty, entry.pending = False, None
+                try:
+                    self._write_row(entry.kind, entry.path, df, pending)
+                    written += 1
+                except Exception as e:
+                    print(f"[DataUtils] Failed to flush {entry.path}: {e}")
+                    with self.cache_lock:
+                        entry.pending = {**pending, **(entry.pending or {})}
+                        entry.dirty = True
+        self.cache_flushed += written
+
+        cutoff = time.monotonic() - WRITE_BEHIND_IDLE_SECONDS
+        with self.cache_lock:
+            for key in [k for k, e in self.cache.items() if not e.dirty and e.touched < cutoff]:
+                del self.cache[key]
+        return written
+
+    @tasks.loop(seconds=WRITE_BEHIND_FLUSH_SECONDS)
+    async def flush_loop(self):
+        await self.run_io(self.flush)
+
+    @tasks.loop(minutes=SEGMENT_COMPACT_MINUTES)
+    async def compact_loop(self):
+        """Moves finished days out of hot segments (segments backend only)."""
+        moved = await self.run_io(self.store.compact_all, self._chao_access)
+        if moved:
+            print(f"[DataUtils] Compacted {moved} day(s) of chao history into segments.")
+
+    # ------------------- History retention -------------------
+    def history_paths(self):
+        """
+        Every stats/inventory path under the database folder as (kind, path).
+        Built from the folder layout so it works for every backend.
+        """
+        paths = []
+        for guild_folder in list(self.guild_folders.values()):
+            guild_path = os.path.join(self.database_path, guild_folder)
+            if not os.path.isdir(guild_path):
+                continue
+            for user_folder in os.listdir(guild_path):
+                user_path = os.path.join(guild_path, user_folder)
+                if not os.path.isdir(user_path):
+                    continue
+                paths.append(("inventory", os.path.join(user_path, "user_data", "inventory.parquet")))
+                chao_dir = os.path.join(user_path, "chao_data")
+                if os.path.isdir(chao_dir):
+                    for chao_name in os.listdir(chao_dir):
+                        paths.append(("chao", os.path.join(chao_dir, chao_name, f"{chao_name}_stats.parquet")))
+        return paths
+
+    def apply_retention(self, kind, path):
+        """Downsamples one history (see storage.retention). Returns the number of rows dropped."""
+        if not self.data_exists(path):
+            return 0
+        if kind != "chao":
+            df = self.load_inventory(path)
+            trimmed = downsample(df, RETENTION_DAILY_DAYS, RETENTION_WEEKLY_DAYS)
+            if len(trimmed) < len(df):
+                self.write_inventory(path, trimmed)
+            return len(df) - len(trimmed)
+
+        # Leased like a decay worker batch, so no load, save, flush or worker
+        # touches the chao between reading and rewriting its history. The
+        # history is rewritten as stored (lazily decayed values are not
+        # history) and its newest row is kept, so the manifest is unaffected.
+        self.lease_chao([path])
+        try:
+            df = self.store.load_chao_stats(path)
+            trimmed = downsample(df, RETENTION_DAILY_DAYS, RETENTION_WEEKLY_DAYS)
+            if len(trimmed) < len(df):
+                self.store.write_chao_stats(path, trimmed)
+        finally:
+            self.release_chao([path], [])
+        return len(df) - len(trimmed)
+
+    @tasks.loop(hours=RETENTION_HOURS)
+    async def retention_loop(self):
+        """
+        Low priority: one file per I/O call, under that file's io_lock, with a
+        pause in between so commands never queue behind a whole-tree sweep.
+        """
+        dropped = files = 0
+        for kind, path in await self.run_io(self.history_paths):
+            try:
+                async with self.io_lock(path):
+                    removed = await self.run_io(self.apply_retention, kind, path)
+            except Exception as e:
+                print(f"[DataUtils] Retention failed for {path}: {e}")
+                removed = 0
+            if removed:
+                dropped += removed
+                files += 1
+            await asyncio.sleep(RETENTION_PAUSE_SECONDS)
+        if dropped:
+            print(f"[DataUtils] Retention dropped {dropped} old row(s) from {files} file(s).")
+
+    @retention_loop.before_loop
+    async def before_retention_loop(self):
+        await self.bot.wait_until_ready()
+
+    def cache_stats(self):
+        with self.cache_lock:
+            return {
+                "entries": len(self.cache),
+                "dirty": sum(1 for e in self.cache.values() if e.dirty),
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "writes": self.cache_writes,
+                "flushed": self.cache_flushed,
+            }
+
+    # ------------------- Storage API -------------------
+    def data_exists(self, path):
+        """True if the backend has any stats/inventory data stored for this path."""
+        if self.cache_enabled:
+            with self.cache_lock:
+                entry = self.cache.get(self._cache_key(path))
+                if entry is not None and not entry.df.empty:
+                    return True
+        return self.store.exists(path)
 
-        inventory_df.to_parquet(path, index=False)
+    def save_inventory(self, path, inventory_df, current_inventory):
+        """
+        Saves the user's inventory, either appending or overwriting today's row.
+        With the write-behind cache enabled this only updates memory; the
+        backend write happens on the next flush.
+        """
+        if not self.cache_enabled:
+            return self.store.save_inventory(path, inventory_df, current_inventory)
+        current_inventory.setdefault('Chao Egg', 0)
+        self._cached_save("inventory", path, inventory_df, current_inventory)
 
     def load_inventory(self, path):
-        if os.path.exists(path):
-            inv_df = pd.read_parquet(path).fillna(0)
-            cols = ['date'] + [col for col in inv_df.columns if col != 'date']
-            inv_df = inv_df[cols]
-            return inv_df
-        else:
-            return pd.DataFrame(columns=['date'])
+        if not self.cache_enabled:
+            return self.store.load_inventory(path)
+        return self._cached_load("inventory", path, self.store.load_inventory)
+
+    def load_latest_inventory(self, path):
+        """Returns the newest inventory row as an Inventory record (empty if none)."""
+        inv_df = self.load_inventory(path)
+        return Inventory.from_frame(inv_df) if not inv_df.empty else Inventory()
+
+    def write_inventory(self, path, inventory_df):
+        """Replaces the user's whole inventory history with inventory_df."""
+        self.store.write_inventory(path, inventory_df)
+        if self.cache_enabled:
+            with self.cache_lock:
+                self.cache[self._cache_key(path)] = _CacheEntry("inventory", path, inventory_df)
 
     def save_chao_stats(self, chao_stats_path, chao_df, chao_stats):
         """
-        Saves Chao stats for the current date, ensuring zero-padded date.
-        Also forces any 'last_*_update' columns or time-based columns
-        ('evolution_end_time', 'death_end_time', 'reincarnation_end_time')
-        to be strings, both in the existing DataFrame and in the new row.
-        This prevents 'incompatible dtype' FutureWarnings in pandas,
-        and avoids storing "0" for missing time columns (we use "" instead).
-
-        Additionally, it replaces any existing "0" in time columns with "" 
-        to avoid parse errors like "Invalid isoformat string: '0'".
-        """
-        current_date_str = datetime.now().strftime("%Y-%m-%d")
-        new_entry = {**chao_stats, 'date': current_date_str}
-        columns = ['date'] + [col for col in new_entry if col != 'date']
-        new_entry_df = pd.DataFrame([new_entry])[columns]
-
-        # Columns that might store ISO8601 times
-        time_cols = ['evolution_end_time', 'death_end_time', 'reincarnation_end_time']
-
-        # 1) Cast those columns to str in new_entry_df (to avoid incompatible dtypes)
-        for tcol in time_cols:
-            if tcol in new_entry_df.columns:
-                new_entry_df[tcol] = new_entry_df[tcol].astype(str)
-
-        # Also cast any 'last_*_update' columns in new_entry_df
-        for col in new_entry_df.columns:
-            if col.startswith("last_") and col.endswith("_update"):
-                new_entry_df[col] = new_entry_df[col].astype(str)
-
-        # 2) If chao_df is not empty, cast these columns to str in chao_df as well
-        #    BEFORE overwriting today's row. This avoids the "incompatible dtype" warning.
-        if not chao_df.empty:
-            for tcol in time_cols:
-                if tcol in chao_df.columns:
-                    chao_df[tcol] = chao_df[tcol].astype(str)
-            for col in chao_df.columns:
-                if col.startswith("last_") and col.endswith("_update"):
-                    chao_df[col] = chao_df[col].astype(str)
-
-        # 3) Overwrite or append today's row
-        if not chao_df.empty and current_date_str in chao_df['date'].values:
-            chao_df.loc[chao_df['date'] == current_date_str, columns[1:]] = (
-                new_entry_df.iloc[0][columns[1:]].values
-            )
-        else:
-            # Use fillna("") so empty values become "", avoiding "0" in time columns
-            chao_df = pd.concat([chao_df, new_entry_df], ignore_index=True).fillna("")
-
-        # 4) Force alignment as str if present
-        if 'Alignment' in chao_df.columns:
-            chao_df['Alignment'] = chao_df['Alignment'].astype(str)
-
-        # 5) Finally, cast again to ensure everything is consistent
-        for tcol in time_cols:
-            if tcol in chao_df.columns:
-                # Replace any "0" with "", so we never parse "0" as a date/time
-                chao_df[tcol] = chao_df[tcol].replace("0", "")
-                chao_df[tcol] = chao_df[tcol].astype(str)
-
-        for col in chao_df.columns:
-            if col.startswith("last_") and col.endswith("_update"):
-                chao_df[col] = chao_df[col].astype(str)
-
-        # Save to Parquet
-        chao_df.to_parquet(chao_stats_path, index=False)
-
-    def load_chao_stats(self, chao_stats_path):
-        if os.path.exists(chao_stats_path):
-            df = pd.read_parquet(chao_stats_path).fillna(0)
-            columns = ['date'] + [c for c in df.columns if c != 'date']
-            df = df[columns]
-            return df
-        else:
-            return pd.DataFrame(columns=['date'])
+        Saves Chao stats for the current date (see ParquetStore.save_chao_stats
+        for how time columns are normalised). Deferred to the next flush when
+        the write-behind cache is enabled. Returns the bytes written to the
+        backend (0 when deferred). A chao saved at 0 hp_ticks is marked dead
+        here (chao_stats gets dead=1).
+        """
+        apply_liveness(chao_stats)
+        with self._chao_access(chao_stats_path):
+            self._manifest_record(chao_stats_path, chao_stats)
+            written = 0
+            if self.cache_enabled:
+                self._cached_save("chao", chao_stats_path, chao_df, chao_stats)
+            else:
+                written = self.store.save_chao_stats(chao_stats_path, chao_df, chao_stats) or 0
+            if self.on_chao_write is not None:
+                self.on_chao_write(chao_stats_path, chao_stats)
+            return written
+
+    def load_chao_stats(self, chao_stats_path, settle=True):
+        """
+        The chao's stats history. With lazy decay the newest row comes back
+        already decayed to now (settle=False returns what is stored).
+        """
+        with self._chao_access(chao_stats_path):
+            if not self.cache_enabled:
+                df = self.store.load_chao_stats(chao_stats_path)
+            else:
+                df = self._cached_load("chao", chao_stats_path, self.store.load_chao_stats)
+        if settle and self.decay_on_read is not None:
+            df = self.decay_on_read(df)
+        return df
+
+    def load_latest_chao_stats(self, chao_stats_path):
+        """Returns the chao's newest stats row as a ChaoState (empty if none)."""
+        chao_df = self.load_chao_stats(chao_stats_path)
+        return ChaoState.from_frame(chao_df) if not chao_df.empty else ChaoState()
+
+    def write_chao_stats(self, chao_stats_path, chao_df):
+        """Replaces the chao's whole stats history with chao_df (newest row marked dead at 0 hp_ticks)."""
+        if not chao_df.empty and apply_liveness(ChaoState.from_frame(chao_df)):
+            chao_df = chao_df.copy()
+            chao_df.loc[chao_df.index[-1], 'dead'] = 1
+        with self._chao_access(chao_stats_path):
+            self.store.write_chao_stats(chao_stats_path, chao_df)
+            if self.cache_enabled:
+                with self.cache_lock:
+                    self.cache[self._cache_key(chao_stats_path)] = _CacheEntry("chao", chao_stats_path, chao_df)
+            if not chao_df.empty:
+                latest = ChaoState.from_frame(chao_df)
+                self._manifest_record(chao_stats_path, latest)
+                if self.on_chao_write is not None:
+                    self.on_chao_write(chao_stats_path, latest)
+
+    def move_chao_stats(self, old_stats_path, new_stats_path):
+        """Call after a chao's folder was renamed or moved so the backend follows it."""
+        with self._chao_access(old_stats_path), self._chao_access(new_stats_path):
+            with self.cache_lock:
+                entry = self.cache.pop(self._cache_key(old_stats_path), None)
+            self.store.move_chao(old_stats_path, new_stats_path)
+            if entry is not None and entry.dirty:
+                self._write_row(entry.kind, new_stats_path, entry.df, entry.pending)
+            self._manifest_move(old_stats_path, new_stats_path)
+        if self.on_chao_write is not None:
+            self.on_chao_write(old_stats_path, None)
+            if self.data_exists(new_stats_path):
+                self.on_chao_write(new_stats_path, self.load_latest_chao_stats(new_stats_path))
+
+    # ------------------- Decay worker leases -------------------
+    @contextlib.contextmanager
+    def _chao_access(self, chao_stats_path):
+        """Held around every load/save of a chao; waits while a decay worker has it leased. Re-entrant."""
+        key = self._cache_key(chao_stats_path)
+        with self.lease_cond:
+            while key in self.leased:
+                self.lease_cond.wait()
+            self.chao_users[key] = self.chao_users.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self.lease_cond:
+                self.chao_users[key] -= 1
+                if not self.chao_users[key]:
+                    del self.chao_users[key]
+                self.lease_cond.notify_all()
+
+    def lease_chao(self, chao_stats_paths):
+        """
+        Hands these chao to a decay worker process: waits until nobody is
+        loading or saving any of them, writes their pending cache rows to the
+        backend (the worker reads from disk) and drops them from the cache.
+        Until release_chao, loads and saves of them block.
+        """
+        keys = {self._cache_key(p) for p in chao_stats_paths}
+        with self.lease_cond:
+            while any(k in self.leased or k in self.chao_users for k in keys):
+                self.lease_cond.wait()
+            self.leased |= keys
+        try:
+            with self.cache_lock:
+                entries = [self.cache.pop(k, None) for k in keys]
+            for entry in entries:
+                if entry is not None and entry.dirty:
+                    self._write_row(entry.kind, entry.path, entry.df, entry.pending)
+        except Exception:
+            self.release_chao(chao_stats_paths, [])
+            raise
+
+    def release_chao(self, chao_stats_paths, rows):
+        """
+        Ends a lease. rows are the (stats_path, newest row) pairs the worker
+        saved; they go through the same bookkeeping as a local save.
+        """
+        try:
+            for chao_stats_path, row in rows:
+                row = ChaoState(row)
+                self.store.note_external_save(chao_stats_path)
+                self._manifest_record(chao_stats_path, row)
+                if self.on_chao_write is not None:
+                    self.on_chao_write(chao_stats_path, row)
+        finally:
+            with self.lease_cond:
+                self.leased -= {self._cache_key(p) for p in chao_stats_paths}
+                self.lease_cond.notify_all()
+
+    # ------------------- Async storage API -------------------
+    async def run_io(self, func, *args, **kwargs):
+        """Runs blocking disk/pandas work on the I/O pool so the event loop never waits on it."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.io_pool, functools.partial(func, *args, **kwargs))
+
+    def io_lock(self, path):
+        """
+        asyncio.Lock for one inventory/stats path. Hold it around an aload_* ...
+        asave_* sequence so two handlers can't interleave and drop an update.
+        """
+        return self.io_locks.setdefault(self._cache_key(path), asyncio.Lock())
+
+    @contextlib.asynccontextmanager
+    async def io_locks_held(self, paths):
+        """Holds the io_lock of every path, taken in key order so two holders can't deadlock."""
+        async with contextlib.AsyncExitStack() as stack:
+            for key in sorted({self._cache_key(p) for p in paths}):
+                await stack.enter_async_context(self.io_locks.setdefault(key, asyncio.Lock()))
+            yield
+
+    async def adata_exists(self, path):
+        return await self.run_io(self.data_exists, path)
+
+    async def ais_user_initialized(self, guild_id, guild_name, user):
+        return await self.run_io(self.is_user_initialized, guild_id, guild_name, user)
+
+    async def aget_path(self, guild_id, guild_name, user, folder, filename):
+        return await self.run_io(self.get_path, guild_id, guild_name, user, folder, filename)
+
+    async def asave_inventory(self, path, inventory_df, current_inventory):
+        return await self.run_io(self.save_inventory, path, inventory_df, current_inventory)
+
+    async def aload_inventory(self, path):
+        return await self.run_io(self.load_inventory, path)
+
+    async def aload_latest_inventory(self, path):
+        return await self.run_io(self.load_latest_inventory, path)
+
+    async def awrite_inventory(self, path, inventory_df):
+        return await self.run_io(self.write_inventory, path, inventory_df)
+
+    async def asave_chao_stats(self, chao_stats_path, chao_df, chao_stats):
+        return await self.run_io(self.save_chao_stats, chao_stats_path, chao_df, chao_stats)
+
+    async def achao_entry(self, guild_id, owner_id, chao_name):
+        return await self.run_io(self.chao_entry, guild_id, owner_id, chao_name)
+
+    async def aload_chao_stats(self, chao_stats_path, settle=True):
+        return await self.run_io(self.load_chao_stats, chao_stats_path, settle)
+
+    async def aload_latest_chao_stats(self, chao_stats_path):
+        return await self.run_io(self.load_latest_chao_stats, chao_stats_path)
+
+    async def awrite_chao_stats(self, chao_stats_path, chao_df):
+        return await self.run_io(self.write_chao_stats, chao_stats_path, chao_df)
+
+    async def amove_chao_stats(self, old_stats_path, new_stats_path):
+        return await self.run_io(self.move_chao_stats, old_stats_path, new_stats_path)
 
     def _restore_parquet_data(self, df: pd.DataFrame, old_date: str) -> pd.DataFrame:
         if old_date not in df['date'].values:
@@ -241,6 +843,13 @@ class DataUtils(commands.Cog):
             df = pd.concat([df, new_entry_df], ignore_index=True).fillna(0)
         return df
 
+    @staticmethod
+    def _restored_label(restore_date, requested_date):
+        """Older history is kept weekly/monthly, so say when the closest snapshot was used."""
+        if restore_date == requested_date:
+            return restore_date
+        return f"{restore_date} (the closest saved snapshot before {requested_date})"
+
     async def _send(self, interaction: discord.Interaction, **kwargs):
         """
         Helper to send a response with interactions.
@@ -280,35 +889,55 @@ class DataUtils(commands.Cog):
         guild_id, user = interaction.guild.id, interaction.user
 
         if target_raw.lower() == 'inventory':
-            file_path = self.get_path(guild_id, interaction.guild.name, user, 'user_data', 'inventory.parquet')
-            inv_df = self.load_inventory(file_path)
-            try:
-                updated = self._restore_parquet_data(inv_df, date_str)
-            except ValueError:
-                return await self._send(interaction, content=f"No inventory data found for {date_str}.")
-            updated.to_parquet(file_path, index=False)
-            return await self._send(interaction, content=f"Inventory restored to {date_str}")
+            file_path = await self.aget_path(guild_id, interaction.guild.name, user, 'user_data', 'inventory.parquet')
+            async with self.io_lock(file_path):
+                inv_df = await self.aload_inventory(file_path)
+                restore_date = nearest_retained_date(inv_df, date_str)
+                if restore_date is None:
+                    return await self._send(interaction, content=f"No inventory data found for {date_str}.")
+                await self.awrite_inventory(file_path, self._restore_parquet_data(inv_df, restore_date))
+            return await self._send(interaction, content=f"Inventory restored to {self._restored_label(restore_date, date_str)}")
 
         # Else: treat as Chao name and use a subfolder for its stats file.
         chao_name = target_raw
-        chao_stats_path = self.get_path(
+        chao_stats_path = await self.aget_path(
             guild_id,
             interaction.guild.name,
             user,
             os.path.join('chao_data', chao_name),
             f"{chao_name}_stats.parquet"
         )
-        if not os.path.exists(chao_stats_path):
+        if not await self.adata_exists(chao_stats_path):
             return await self._send(interaction, content=f"No Chao stats file found for {chao_name}.")
 
-        chao_df = self.load_chao_stats(chao_stats_path)
-        try:
-            updated_chao_df = self._restore_parquet_data(chao_df, date_str)
-        except ValueError:
-            return await self._send(interaction, content=f"No Chao data found for {chao_name} on {date_str}.")
+        async with self.io_lock(chao_stats_path):
+            chao_df = await self.aload_chao_stats(chao_stats_path, settle=False)
+            restore_date = nearest_retained_date(chao_df, date_str)
+            if restore_date is None:
+                return await self._send(interaction, content=f"No Chao data found for {chao_name} on {date_str}.")
+            await self.awrite_chao_stats(chao_stats_path, self._restore_parquet_data(chao_df, restore_date))
+        return await self._send(interaction, content=f"{chao_name} restored to {self._restored_label(restore_date, date_str)}.")
 
-        updated_chao_df.to_parquet(chao_stats_path, index=False)
-        return await self._send(interaction, content=f"{chao_name} restored to {date_str}.")
+
+    async def export(self, interaction: discord.Interaction, incremental: bool = False):
+        """
+        Slash command (admin):
+        /export_dataset [incremental]
+        Flushes pending writes, then exports every history to EXPORT_DIR on the I/O pool.
+        """
+        await interaction.response.defer(thinking=True)
+        if self.cache_enabled:
+            await self.run_io(self.flush)
+        try:
+            summary = await self.run_io(export_dataset, self.store, self.database_path, EXPORT_DIR, incremental)
+        except Exception as e:
+            return await self._send(interaction, content=f"Export failed: {e}")
+        mode = "Incremental" if summary["incremental"] else "Full"
+        await self._send(
+            interaction,
+            content=(f"{mode} export finished: {summary['histories']} histories, "
+                     f"{summary['rows']} rows in {summary['partitions']} partition(s).")
+        )
 
 
 async def setup(bot: commands.Bot):
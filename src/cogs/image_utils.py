@@ -1,16 +1,94 @@
+import io
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from PIL import Image
 from discord.ext import commands
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
+
+from config import ASSETS_DIR, IMAGE_CACHE_MB  # <-- Make sure you have this in config.py
+
+
+class AssetCache:
+    """
+    Decoded images keyed by (path, mode, size), each remembering the file's
+    mtime so an edited asset is decoded again. Least recently used entries
+    are evicted once the pixel data exceeds max_bytes. get() hands out the
+    shared image, which must not be drawn on; copy() gives a private one.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (mtime, image, nbytes)
+        self.resident_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _nbytes(img):
+        return img.width * img.height * len(img.getbands())
+
+    def get(self, path, mode="RGBA", size=None):
+        """The image at path converted to mode (None keeps the file's) and resized to size."""
+        path = os.path.normpath(str(path))
+        key = (path, mode, size)
+        mtime = os.stat(path).st_mtime_ns
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is not None and cached[0] == mtime:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        with Image.open(path) as img:
+            img.load()
+            if mode and img.mode != mode:
+                img = img.convert(mode)
+            if size and img.size != tuple(size):
+                img = img.resize(size, Image.LANCZOS)
+            else:
+                img = img.copy()
+
+        nbytes = self._nbytes(img)
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.resident_bytes -= old[2]
+            if nbytes <= self.max_bytes:
+                self.entries[key] = (mtime, img, nbytes)
+                self.resident_bytes += nbytes
+                while self.resident_bytes > self.max_bytes:
+                    _, (_, _, evicted) = self.entries.popitem(last=False)
+                    self.resident_bytes -= evicted
+                    self.evictions += 1
+        return img
+
+    def copy(self, path, mode="RGBA", size=None):
+        """A private copy of get(...) that can be drawn on."""
+        return self.get(path, mode, size).copy()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "resident_bytes": self.resident_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
 
-from config import ASSETS_DIR  # <-- Make sure you have this in config.py
 
 class ImageUtils(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         # Remove manual path assembly; use ASSETS_DIR from config
         self.assets_dir = Path(ASSETS_DIR)
+        self.assets = AssetCache(IMAGE_CACHE_MB * 1024 * 1024)
 
         # Directory for digit images, "blank.png", etc.
         self.resized_dir = self.assets_dir / "resized"
@@ -30,101 +108,114 @@ class ImageUtils(commands.Cog):
 
         # Pre-load digit images 0-9 from the "resized" folder
         self.num_images = {
-            str(i): Image.open(self.resized_dir / f"{i}.png") for i in range(10)
+            str(i): self.assets.get(self.resized_dir / f"{i}.png", mode=None) for i in range(10)
         }
 
+    def cache_stats(self):
+        return self.assets.stats()
+
+    @staticmethod
+    def _encode(image: Image.Image, output_path: Optional[str] = None) -> io.BytesIO:
+        """
+        PNG-encodes a finished render into a rewound BytesIO, ready for
+        discord.File. If output_path is given the same bytes are also written
+        there (for renders that are kept on disk, like chao thumbnails).
+        """
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        if output_path:
+            with open(output_path, "wb") as f:
+                f.write(buffer.getbuffer())
+        buffer.seek(0)
+        return buffer
+
     def combine_images_with_face(
             self,
             background_path: str,
             chao_image_path: str,
             eyes_image_path: str,
             mouth_image_path: str,
-            output_path: str
-    ):
-        with Image.open(background_path).convert("RGBA") as background, \
-             Image.open(chao_image_path).convert("RGBA") as chao_img, \
-             Image.open(eyes_image_path).convert("RGBA") as eyes_img, \
-             Image.open(mouth_image_path).convert("RGBA") as mouth_img:
-
-            # Resize images
-            chao_img = chao_img.resize((70, 70), Image.LANCZOS)
-            background = background.resize((70, 70), Image.LANCZOS)
-            eyes_img = eyes_img.resize((70, 70), Image.LANCZOS)
-            mouth_img = mouth_img.resize((70, 70), Image.LANCZOS)
-
-            # Composite the images
-            chao_with_eyes = Image.alpha_composite(chao_img, eyes_img)
-            chao_with_face = Image.alpha_composite(chao_with_eyes, mouth_img)
-            final_image = Image.alpha_composite(background, chao_with_face)
-            final_image.save(output_path)
+            output_path: Optional[str] = None
+    ) -> io.BytesIO:
+        # Decoded and resized once per asset, then shared from the cache
+        background = self.assets.get(background_path, size=(70, 70))
+        chao_img = self.assets.get(chao_image_path, size=(70, 70))
+        eyes_img = self.assets.get(eyes_image_path, size=(70, 70))
+        mouth_img = self.assets.get(mouth_image_path, size=(70, 70))
+
+        # Composite the images
+        chao_with_eyes = Image.alpha_composite(chao_img, eyes_img)
+        chao_with_face = Image.alpha_composite(chao_with_eyes, mouth_img)
+        final_image = Image.alpha_composite(background, chao_with_face)
+        return self._encode(final_image, output_path)
 
     def paste_page1_image(
             self,
             template_path: str,
             overlay_path: str,
-            output_path: str,
+            output_path: Optional[str],
             tick_positions: list,
             power_ticks: int, swim_ticks: int, fly_ticks: int, run_ticks: int, stamina_ticks: int,
             power_level: int, swim_level: int, fly_level: int, run_level: int, stamina_level: int,
             power_exp: int, swim_exp: int, fly_exp: int, run_exp: int, stamina_exp: int
-    ):
+    ) -> io.BytesIO:
         """
         Generate the Page 1 stats image with ticks, levels, and EXP values for Chao stats.
         """
-        with Image.open(template_path) as template, \
-             Image.open(overlay_path).convert("RGBA") as overlay:
-
-            # ---- Paste Ticks ----
-            for pos, ticks in zip(
-                tick_positions,
-                [power_ticks, swim_ticks, fly_ticks, run_ticks, stamina_ticks]
-            ):
-                for i in range(int(ticks)):
-                    tick_pos = (pos[0] + i * self.TICK_SPACING, pos[1])
-                    template.paste(overlay, tick_pos, overlay)
-
-            # ---- Paste Levels ----
-            for pos, level in zip(
-                tick_positions,
-                [power_level, swim_level, fly_level, run_level, stamina_level]
-            ):
-                level = int(level)
-                tens = level // 10
-                ones = level % 10
-                x_offset, y_offset = self.LEVEL_POSITION_OFFSET
-
-                # Tens digit
-                tens_img = self.num_images.get(str(tens), self.num_images['0'])
-                template.paste(tens_img, (pos[0] + x_offset, pos[1] + y_offset), tens_img)
-
-                # Ones digit
-                ones_img = self.num_images.get(str(ones), self.num_images['0'])
-                template.paste(
-                    ones_img,
-                    (pos[0] + x_offset + self.LEVEL_SPACING, pos[1] + y_offset),
-                    ones_img
-                )
-
-            # ---- Paste EXP ----
-            for stat, exp_val in zip(
-                ["swim", "fly", "run", "power", "stamina"],
-                [swim_exp, fly_exp, run_exp, power_exp, stamina_exp]
-            ):
-                exp_str = f"{int(exp_val):04d}"  # zero-padded 4 digits
-                for pos, digit in zip(self.EXP_POSITIONS[stat], exp_str):
-                    digit_img = self.num_images.get(digit, self.num_images['0'])
-                    template.paste(digit_img, pos, digit_img)
-
-            template.save(output_path)
+        template = self.assets.copy(template_path, mode=None)
+        overlay = self.assets.get(overlay_path)
+
+        # ---- Paste Ticks ----
+        for pos, ticks in zip(
+            tick_positions,
+            [power_ticks, swim_ticks, fly_ticks, run_ticks, stamina_ticks]
+        ):
+            for i in range(int(ticks)):
+                tick_pos = (pos[0] + i * self.TICK_SPACING, pos[1])
+                template.paste(overlay, tick_pos, overlay)
+
+        # ---- Paste Levels ----
+        for pos, level in zip(
+            tick_positions,
+            [power_level, swim_level, fly_level, run_level, stamina_level]
+        ):
+            level = int(level)
+            tens = level // 10
+            ones = level % 10
+            x_offset, y_offset = self.LEVEL_POSITION_OFFSET
+
+            # Tens digit
+            tens_img = self.num_images.get(str(tens), self.num_images['0'])
+            template.paste(tens_img, (pos[0] + x_offset, pos[1] + y_offset), tens_img)
+
+            # Ones digit
+            ones_img = self.num_images.get(str(ones), self.num_images['0'])
+            template.paste(
+                ones_img,
+                (pos[0] + x_offset + self.LEVEL_SPACING, pos[1] + y_offset),
+                ones_img
+            )
+
+        # ---- Paste EXP ----
+        for stat, exp_val in zip(
+            ["swim", "fly", "run", "power", "stamina"],
+            [swim_exp, fly_exp, run_exp, power_exp, stamina_exp]
+        ):
+            exp_str = f"{int(exp_val):04d}"  # zero-padded 4 digits
+            for pos, digit in zip(self.EXP_POSITIONS[stat], exp_str):
+                digit_img = self.num_images.get(digit, self.num_images['0'])
+                template.paste(digit_img, pos, digit_img)
+
+        return self._encode(template, output_path)
 
     def paste_page2_image(
             self,
             template_path: str,
             overlay_path: str,
-            output_path: str,
+            output_path: Optional[str],
             stats_positions: Dict[str, Tuple[int, int]],
             stats_values: Dict[str, int]
-    ):
+    ) -> io.BytesIO:
         """
         Paste multiple stats ticks for Page 2 (belly, happiness, illness, energy, hp),
         plus numeric percentages.
@@ -132,7 +223,7 @@ class ImageUtils(commands.Cog):
         # Instead of a hard-coded path, use our pre-loaded digit images in self.num_images
         # We'll also need a 'blank.png' from the same "resized" directory:
         blank_image_path = self.resized_dir / "blank.png"
-        blank_image = Image.open(blank_image_path) if blank_image_path.exists() else None
+        blank_image = self.assets.get(blank_image_path, mode=None) if blank_image_path.exists() else None
 
         # Coordinates for the percentage display
         percentage_coords = {
@@ -143,80 +234,80 @@ class ImageUtils(commands.Cog):
             "hp": (1044, 1370)
         }
 
-        with Image.open(template_path) as template, \
-             Image.open(overlay_path).convert("RGBA") as overlay:
-
-            # ---- Paste tick marks ----
-            for stat, position in stats_positions.items():
-                ticks = stats_values.get(stat, 0)
-                for i in range(int(ticks)):
-                    tick_pos = (position[0] + i * self.TICK_SPACING, position[1])
-                    template.paste(overlay, tick_pos, overlay)
-
-            def paste_percentage(percentage: int, coords: Tuple[int, int]):
-                x_base, y_base = coords
-                if not blank_image:
-                    # if blank_image is missing, fallback logic
-                    pass
-
-                # Break into digits
-                hundreds = percentage // 100
-                tens = (percentage % 100) // 10
-                ones = percentage % 10
-
-                # If exactly 0, show "0" after two blank spaces
-                if percentage == 0:
+        template = self.assets.copy(template_path, mode=None)
+        overlay = self.assets.get(overlay_path)
+
+        # ---- Paste tick marks ----
+        for stat, position in stats_positions.items():
+            ticks = stats_values.get(stat, 0)
+            for i in range(int(ticks)):
+                tick_pos = (position[0] + i * self.TICK_SPACING, position[1])
+                template.paste(overlay, tick_pos, overlay)
+
+        def paste_percentage(percentage: int, coords: Tuple[int, int]):
+            x_base, y_base = coords
+            if not blank_image:
+                # if blank_image is missing, fallback logic
+                pass
+
+            # Break into digits
+            hundreds = percentage // 100
+            tens = (percentage % 100) // 10
+            ones = percentage % 10
+
+            # If exactly 0, show "0" after two blank spaces
+            if percentage == 0:
+                for _ in range(2):
+                    if blank_image:
+                        template.paste(blank_image, (x_base, y_base), blank_image)
+                    x_base += self.LEVEL_SPACING
+                digit_0 = self.num_images.get("0")
+                template.paste(digit_0, (x_base, y_base), digit_0)
+                return
+
+            # If 1 or 2 digit number, paste blank(s) first
+            if hundreds == 0:
+                if tens == 0:
+                    # 1-digit
                     for _ in range(2):
                         if blank_image:
                             template.paste(blank_image, (x_base, y_base), blank_image)
                         x_base += self.LEVEL_SPACING
-                    digit_0 = self.num_images.get("0")
-                    template.paste(digit_0, (x_base, y_base), digit_0)
-                    return
-
-                # If 1 or 2 digit number, paste blank(s) first
-                if hundreds == 0:
-                    if tens == 0:
-                        # 1-digit
-                        for _ in range(2):
-                            if blank_image:
-                                template.paste(blank_image, (x_base, y_base), blank_image)
-                            x_base += self.LEVEL_SPACING
-                    else:
-                        # 2-digit
-                        if blank_image:
-                            template.paste(blank_image, (x_base, y_base), blank_image)
-                        x_base += self.LEVEL_SPACING
                 else:
-                    # 3-digit
-                    digit_img = self.num_images.get(str(hundreds), self.num_images['0'])
-                    template.paste(digit_img, (x_base, y_base), digit_img)
+                    # 2-digit
+                    if blank_image:
+                        template.paste(blank_image, (x_base, y_base), blank_image)
                     x_base += self.LEVEL_SPACING
-
-                # Tens digit
-                digit_img = self.num_images.get(str(tens), self.num_images['0'])
+            else:
+                # 3-digit
+                digit_img = self.num_images.get(str(hundreds), self.num_images['0'])
                 template.paste(digit_img, (x_base, y_base), digit_img)
                 x_base += self.LEVEL_SPACING
 
-                # Ones digit
-                digit_img = self.num_images.get(str(ones), self.num_images['0'])
-                template.paste(digit_img, (x_base, y_base), digit_img)
+            # Tens digit
+            digit_img = self.num_images.get(str(tens), self.num_images['0'])
+            template.paste(digit_img, (x_base, y_base), digit_img)
+            x_base += self.LEVEL_SPACING
+
+            # Ones digit
+            digit_img = self.num_images.get(str(ones), self.num_images['0'])
+            template.paste(digit_img, (x_base, y_base), digit_img)
 
-            # Calculate/paste percentages
-            for stat, coords in percentage_coords.items():
-                ticks = stats_values.get(stat, 0)
-                # Example formula for converting ticks to percent
-                percentage = int((ticks / 10) * 100)
-                paste_percentage(percentage, coords)
+        # Calculate/paste percentages
+        for stat, coords in percentage_coords.items():
+            ticks = stats_values.get(stat, 0)
+            # Example formula for converting ticks to percent
+            percentage = int((ticks / 10) * 100)
+            paste_percentage(percentage, coords)
 
-            template.save(output_path)
+        return self._encode(template, output_path)
 
     def paste_black_market_prices_page1(
         self,
         template_path: str,
-        output_path: str,
+        output_path: Optional[str],
         fruit_prices: Dict[str, int]
-    ):
+    ) -> io.BytesIO:
         """
         Dynamically paste fruit prices onto a template for Black Market (Page 1).
         """
@@ -232,26 +323,26 @@ class ImageUtils(commands.Cog):
             "Chao Fruit":     (1220, 1430),
         }
 
-        with Image.open(template_path).convert("RGBA") as template:
-            for fruit_name, (x, y) in fruit_coords.items():
-                price = fruit_prices.get(fruit_name, 0)
-                digits_str = str(price)
-                spacing = 60
-                x_current = x
+        template = self.assets.copy(template_path)
+        for fruit_name, (x, y) in fruit_coords.items():
+            price = fruit_prices.get(fruit_name, 0)
+            digits_str = str(price)
+            spacing = 60
+            x_current = x
 
-                for digit in digits_str:
-                    digit_img = self.num_images.get(digit, self.num_images['0'])
-                    template.paste(digit_img, (x_current, y), digit_img)
-                    x_current += spacing
+            for digit in digits_str:
+                digit_img = self.num_images.get(digit, self.num_images['0'])
+                template.paste(digit_img, (x_current, y), digit_img)
+                x_current += spacing
 
-            template.save(output_path, format="PNG")
+        return self._encode(template, output_path)
 
     def paste_black_market_prices_page2(
         self,
         template_path: str,
-        output_path: str,
+        output_path: Optional[str],
         fruit_prices: Dict[str, int]
-    ):
+    ) -> io.BytesIO:
         """
         Dynamically paste fruit prices onto a template for Black Market (Page 2).
         """
@@ -265,32 +356,31 @@ class ImageUtils(commands.Cog):
             "Purple Fruit":  (1220, 1140),
         }
 
-        with Image.open(template_path).convert("RGBA") as template:
-            for fruit_name, (x, y) in fruit_coords.items():
-                price = fruit_prices.get(fruit_name, 0)
-                digits_str = str(price)
-                spacing = 60
-                x_current = x
+        template = self.assets.copy(template_path)
+        for fruit_name, (x, y) in fruit_coords.items():
+            price = fruit_prices.get(fruit_name, 0)
+            digits_str = str(price)
+            spacing = 60
+            x_current = x
 
-                for digit in digits_str:
-                    digit_img = self.num_images.get(digit, self.num_images['0'])
-                    template.paste(digit_img, (x_current, y), digit_img)
-                    x_current += spacing
+            for digit in digits_str:
+                digit_img = self.num_images.get(digit, self.num_images['0'])
+                template.paste(digit_img, (x_current, y), digit_img)
+                x_current += spacing
 
-            template.save(output_path, format="PNG")
+        return self._encode(template, output_path)
 
-    def change_image_hue(self, image_path: str, output_path: str, hue: int, saturation: float):
+    def change_image_hue(self, image_path: str, output_path: Optional[str], hue: int, saturation: float) -> io.BytesIO:
         """
         Adjust the hue/saturation of an image.
         """
-        img = Image.open(image_path).convert('RGB')
-        hsv_img = img.convert('HSV')
+        hsv_img = self.assets.get(image_path, mode='RGB').convert('HSV')
         h, s, v = hsv_img.split()
         h = h.point(lambda p: hue)
         s = s.point(lambda p: int(p * saturation))
         hsv_img = Image.merge('HSV', (h, s, v))
         rgb_img = hsv_img.convert('RGB')
-        rgb_img.save(output_path)
+        return self._encode(rgb_img, output_path)
 
 async def setup(bot):
     await bot.add_cog(ImageUtils(bot))
@@ -6,6 +6,7 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent
 ASSETS_DIR = BASE_DIR / "assets"
 GRAPHICS_DIR = ASSETS_DIR / "graphics" / "thumbnails"
+DATABASE_DIR = BASE_DIR / "database"
 
 
 # Background images
@@ -18,6 +19,89 @@ EGG_BG_PATH = GRAPHICS_DIR / "egg_background.png"
 STATS_PERSISTENT_VIEWS_FILE = "stats_persistent_views.json"
 MARKET_PERSISTENT_VIEWS_FILE = "market_persistent_views.json"
 
+# Storage backend: "parquet" (one file per chao/inventory, the default), "segments"
+# (opt-in: append-only hot/compacted parquet segments per chao) or "sqlite" (single WAL
+# database). Existing <name>_stats.parquet files are read as-is by the segments backend,
+# but the parquet backend does not read segment files, so don't switch back once chao
+# have been saved as segments; import them into SQLite instead.
+# Run `python -m storage.sqlite_store` from src/ once to import an existing parquet tree.
+STORAGE_BACKEND = "parquet"
+SQLITE_DB_PATH = DATABASE_DIR / "chao_bot.sqlite3"
+
+# Segments backend: days pile up in a chao's hot segment until SEGMENT_HOT_MAX_DAYS of
+# them are finished, then a background job (every SEGMENT_COMPACT_MINUTES) moves them
+# into an immutable segment.
+SEGMENT_HOT_MAX_DAYS = 7
+SEGMENT_COMPACT_MINUTES = 60
+
+# Write-behind cache in DataUtils: saves update memory and are flushed to the backend
+# every WRITE_BEHIND_FLUSH_SECONDS (and on shutdown). Clean entries idle longer than
+# WRITE_BEHIND_IDLE_SECONDS are dropped from memory.
+WRITE_BEHIND_CACHE = True
+WRITE_BEHIND_FLUSH_SECONDS = 30
+WRITE_BEHIND_IDLE_SECONDS = 600
+
+# Decoded image assets (templates, overlays, backgrounds, sprites, faces) kept in memory by
+# ImageUtils, keyed by path and modification time; least recently used ones are evicted
+# once they take more than IMAGE_CACHE_MB.
+IMAGE_CACHE_MB = 64
+
+# Worker threads behind DataUtils' async API (aload_*/asave_*/run_io). Keeps pandas and
+# disk I/O off the event loop; bounded so a slow disk can't spawn unbounded threads.
+IO_POOL_WORKERS = 4
+
+# History retention: chao stats and inventories keep one row per day for the last
+# RETENTION_DAILY_DAYS, then one per week up to RETENTION_WEEKLY_DAYS, then one per month.
+# A background job applies it every RETENTION_HOURS, one file at a time with
+# RETENTION_PAUSE_SECONDS between files so interactive commands keep priority.
+# Downsampling permanently deletes the dropped rows (the first pass after enabling it
+# trims all existing history), so it is off by default: back up the database folder,
+# then set RETENTION_ENABLED = True to turn it on.
+RETENTION_ENABLED = False
+RETENTION_DAILY_DAYS = 30
+RETENTION_WEEKLY_DAYS = 180
+RETENTION_HOURS = 24
+RETENTION_PAUSE_SECONDS = 0.05
+
+# Decay: "lazy" derives belly/happiness/energy/HP from the last_*_update times whenever a
+# chao is read and only persists them with the next write; "loops" rewrites each chao
+# from the decay scheduler one block at a time.
+DECAY_MODE = "lazy"
+
+# Decay workers: due chao are saved by DECAY_WORKERS separate processes, each owning the
+# guilds with guild_id % DECAY_WORKERS == its shard, so sweeps don't compete with commands
+# for the GIL. A chao is leased to its worker for one batch of at most DECAY_WORKER_BATCH
+# chao; the bot's loads and saves of it wait for that batch. 0 (the default) saves on the
+# I/O pool instead; set it to at most one less than the host's cores to opt in.
+DECAY_WORKERS = 0
+DECAY_WORKER_BATCH = 256
+
+# Decay metrics: the last DECAY_METRICS_HISTORY batches are kept for /decay_status. A batch
+# that runs longer than DECAY_OVERRUN_SECONDS, or starts that long after its earliest
+# deadline, is logged as an overrun: the population has outgrown the decay workers.
+DECAY_METRICS_HISTORY = 60
+DECAY_OVERRUN_SECONDS = 60
+
+# HP notices: when decay takes a chao's HP (out of 10) to or below one of HP_NOTIFY_THRESHOLDS,
+# its owner is told. Notices for the same owner within HP_NOTIFY_WINDOW_MINUTES become one DM
+# (or a mention in the server's system channel if DMs are closed). At most HP_NOTIFY_PER_MINUTE
+# messages go out bot-wide; the rest wait in HP_NOTICES_FILE, which survives restarts.
+HP_NOTIFY_ENABLED = True
+HP_NOTIFY_THRESHOLDS = (5, 2, 0)
+HP_NOTIFY_WINDOW_MINUTES = 10
+HP_NOTIFY_PER_MINUTE = 20
+HP_NOTICES_FILE = DATABASE_DIR / "hp_notices.json"
+
+# Cocoons: evolution, reincarnation and death take COCOON_SECONDS. Pending cocoons live in
+# COCOON_TIMERS_FILE and are finished by ChaoLifecycle's timer loop at their deadline, so a
+# restart doesn't strand a chao mid-cocoon; the outcome is posted where the command was used.
+COCOON_SECONDS = 60
+COCOON_TIMERS_FILE = DATABASE_DIR / "cocoon_timers.json"
+
+# Analytics export (/export_dataset, or `python -m storage.export` from src/): every chao
+# history and inventory as hive-partitioned parquet under EXPORT_DIR/<kind>/guild_id=/date=.
+EXPORT_DIR = BASE_DIR / "exports"
+
 
 # Chao settings
 CHAO_NAMES = [
@@ -1,26 +1,30 @@
+import io
 import os
 import shutil
-import asyncio
 import random
+import contextlib
+import threading
 import discord
 import pandas as pd
 from datetime import datetime, timedelta
 from functools import wraps
 from PIL import Image
 from pathlib import Path
+from storage.schema import coerce_datetime
 
 # Import your config paths instead of hardcoding
 from config import (
     ASSETS_DIR,
+    COCOON_SECONDS,
     HERO_BG_PATH,
     DARK_BG_PATH,
     NEUTRAL_BG_PATH
 )
+from storage.records import ChaoState, Inventory
 
 # Example: directories for cacoons/thumbnails, assuming they're under /assets/graphics/
 CACOONS_DIR = ASSETS_DIR / "graphics" / "cacoons"
 THUMBNAILS_DIR = ASSETS_DIR / "graphics" / "thumbnails"
-TEMP_DIR = ASSETS_DIR / "temp"
 
 
 # --------------------------
@@ -41,65 +45,62 @@ def safe_int(val):
     except (ValueError, TypeError):
         return 0
 
-def generate_evolution_image(safe_name: str):
+# Cocoon kind -> overlay drawn on the chao's alignment background.
+COCOON_OVERLAYS = {
+    "evolve": CACOONS_DIR / "cacoon_evolve.png",
+    "reincarnate": CACOONS_DIR / "cacoon_reincarnate.png",
+    "death": CACOONS_DIR / "cacoon_death.png",
+}
+# (kind, background path) -> encoded PNG; only 3 overlays x 3 backgrounds exist.
+_cocoon_images = {}
+_cocoon_images_lock = threading.Lock()
+
+def alignment_background(latest_stats: dict):
+    """Hero, dark or neutral background depending on the chao's alignment."""
+    alignment_val = latest_stats.get("dark_hero", 0)
+    if alignment_val > 0:
+        return HERO_BG_PATH
+    elif alignment_val < 0:
+        return DARK_BG_PATH
+    return NEUTRAL_BG_PATH
+
+def cocoon_image_bytes(kind: str, bg_path) -> bytes:
     """
-    Use NEUTRAL_BG_PATH + 'cacoon_evolve.png' overlay to show evolution.
-    Save in TEMP_DIR, return a discord.File object.
+    The cocoon overlay for 'kind' composited on bg_path, as PNG bytes.
+    Rendered on first use, then served from memory.
     """
-    TEMP_DIR.mkdir(parents=True, exist_ok=True)
-    bg_path = NEUTRAL_BG_PATH
-    overlay_img = CACOONS_DIR / "cacoon_evolve.png"
-    temp_output = TEMP_DIR / f"lifecycle_{safe_name}.png"
-
-    with Image.open(bg_path).convert("RGBA") as bg, Image.open(overlay_img).convert("RGBA") as overlay:
-        overlay = overlay.resize(bg.size)
-        Image.alpha_composite(bg, overlay).save(temp_output)
+    key = (kind, str(bg_path))
+    data = _cocoon_images.get(key)
+    if data is None:
+        with _cocoon_images_lock:
+            data = _cocoon_images.get(key)
+            if data is None:
+                with Image.open(bg_path).convert("RGBA") as bg, \
+                        Image.open(COCOON_OVERLAYS[kind]).convert("RGBA") as overlay:
+                    overlay = overlay.resize(bg.size)
+                    buffer = io.BytesIO()
+                    Image.alpha_composite(bg, overlay).save(buffer, format="PNG")
+                data = _cocoon_images[key] = buffer.getvalue()
+    return data
+
+def cocoon_file(kind: str, bg_path, safe_name: str):
+    return discord.File(io.BytesIO(cocoon_image_bytes(kind, bg_path)), filename=f"lifecycle_{safe_name}.png")
 
-    return discord.File(temp_output, filename=temp_output.name)
+def generate_evolution_image(safe_name: str):
+    """Neutral background + 'cacoon_evolve.png' overlay, as a discord.File."""
+    return cocoon_file("evolve", NEUTRAL_BG_PATH, safe_name)
 
 def generate_reincarnation_image(latest_stats: dict, safe_name: str):
     """
     Pick a background based on alignment, overlay 'cacoon_reincarnate.png'.
     """
-    alignment_val = latest_stats.get("dark_hero", 0)
-    if alignment_val > 0:
-        bg_path = HERO_BG_PATH
-    elif alignment_val < 0:
-        bg_path = DARK_BG_PATH
-    else:
-        bg_path = NEUTRAL_BG_PATH
-
-    overlay_path = CACOONS_DIR / "cacoon_reincarnate.png"
-    TEMP_DIR.mkdir(parents=True, exist_ok=True)
-    temp_output = TEMP_DIR / f"lifecycle_{safe_name}.png"
-
-    with Image.open(bg_path).convert("RGBA") as bg, Image.open(overlay_path).convert("RGBA") as overlay:
-        overlay = overlay.resize(bg.size)
-        Image.alpha_composite(bg, overlay).save(temp_output)
-
-    return discord.File(temp_output, filename=temp_output.name)
+    return cocoon_file("reincarnate", alignment_background(latest_stats), safe_name)
 
 def generate_death_image(latest_stats: dict, safe_name: str):
     """
     Pick a background based on alignment, overlay 'cacoon_death.png'.
     """
-    alignment_val = latest_stats.get("dark_hero", 0)
-    if alignment_val > 0:
-        bg_path = HERO_BG_PATH
-    elif alignment_val < 0:
-        bg_path = DARK_BG_PATH
-    else:
-        bg_path = NEUTRAL_BG_PATH
-
-    overlay_path = CACOONS_DIR / "cacoon_death.png"
-    TEMP_DIR.mkdir(parents=True, exist_ok=True)
-    temp_output = TEMP_DIR / f"lifecycle_{safe_name}.png"
-
-    with Image.open(bg_path).convert("RGBA") as bg, Image.open(overlay_path).convert("RGBA") as overlay:
-        overlay = overlay.resize(bg.size)
-        Image.alpha_composite(bg, overlay).save(temp_output)
-
-    return discord.File(temp_output, filename=temp_output.name)
+    return cocoon_file("death", alignment_background(latest_stats), safe_name)
 
 
 # --------------------------
@@ -108,36 +109,163 @@ def generate_death_image(latest_stats: dict, safe_name: str):
 
 def parse_chao_name(interaction: discord.Interaction, chao_name_raw: str, data_utils) -> str:
     """
-    Attempt to find a valid chao directory matching 'chao_name_raw'
-    within the user's 'chao_data' folder. Return the validated name if found.
+    Return the longest leading run of words in 'chao_name_raw' that names one
+    of the user's chao (so "Count Chaocula pet" finds "Count Chaocula"), or
+    None. Looked up in DataUtils' in-memory name index, not the filesystem.
     """
     if not chao_name_raw or not interaction.guild:
         return None
 
-    guild_folder = data_utils.update_server_folder(interaction.guild)
-    user_folder = data_utils.get_user_folder(guild_folder, interaction.user)
-    chao_dir = os.path.join(user_folder, "chao_data")
-
+    names = data_utils.owned_chao_names(interaction.guild.id, interaction.user.id)
     tokens = chao_name_raw.split()
     # Try chunking from longest to shortest
     for i in range(len(tokens), 0, -1):
         candidate = " ".join(tokens[:i])
-        stats_file = os.path.join(chao_dir, candidate, f"{candidate}_stats.parquet")
-        if os.path.exists(os.path.join(chao_dir, candidate)) and os.path.exists(stats_file):
+        if candidate in names:
             return candidate
 
-    # Last resort: scan subfolders
-    if os.path.exists(chao_dir):
-        for folder in os.listdir(chao_dir):
-            folder_path = os.path.join(chao_dir, folder)
-            if os.path.isdir(folder_path):
-                stats_file = os.path.join(folder_path, f"{chao_name_raw}_stats.parquet")
-                if os.path.exists(stats_file):
-                    return folder
-
     return None
 
 
+# --------------------------
+# Request Context
+# --------------------------
+
+class RequestContext:
+    """
+    What one interaction reads and writes, resolved once and shared by the
+    stacked decorators and the command body: the user's folder, chao names
+    resolved from the raw command arguments, and (loaded on first use) each
+    chao's stats frame and newest row and the user's inventory. Changes are
+    staged with stage_chao/stage_inventory and saved by commit(), which
+    request_context runs once when the outermost user of the context exits
+    normally. Every stats/inventory path loaded is held under its io_lock from
+    the load until then, so ring awards and decay saves can't land in between
+    and be overwritten.
+    """
+    KEY = "chao_request"
+
+    def __init__(self, interaction: discord.Interaction, data_utils):
+        self.interaction = interaction
+        self.data_utils = data_utils
+        self.guild_id, self.guild_name, self.user = get_guild_user_interaction(interaction)
+        self.user_folder = None
+        self.names = {}       # raw argument -> chao name (None if it matched nothing)
+        self.chao = {}        # chao name -> (stats_df, ChaoState)
+        self.inventory = None  # (inventory_df, Inventory)
+        self.dirty_chao = set()
+        self.pending_inventory = None
+        self.depth = 0
+        self.locks = contextlib.AsyncExitStack()
+        self.locked = set()
+
+    async def _hold(self, path):
+        """Takes path's io_lock (once) until release()."""
+        if path not in self.locked:
+            await self.locks.enter_async_context(self.data_utils.io_lock(path))
+            self.locked.add(path)
+
+    async def release(self):
+        """Drops everything staged and releases the io_locks taken by loads."""
+        self.dirty_chao.clear()
+        self.pending_inventory = None
+        self.locked.clear()
+        await self.locks.aclose()
+
+    async def folder(self):
+        """The user's folder (guild and user folders are resolved and renamed if needed only once)."""
+        if self.user_folder is None:
+            guild_folder = await self.data_utils.run_io(self.data_utils.update_server_folder, self.interaction.guild)
+            self.user_folder = await self.data_utils.run_io(self.data_utils.get_user_folder, guild_folder, self.user)
+        return self.user_folder
+
+    async def chao_name(self, chao_name_raw):
+        """parse_chao_name for this user, memoized per raw argument."""
+        if chao_name_raw not in self.names:
+            self.names[chao_name_raw] = await self.data_utils.run_io(
+                parse_chao_name, self.interaction, chao_name_raw, self.data_utils
+            )
+        return self.names[chao_name_raw]
+
+    async def stats_path(self, chao_name):
+        return os.path.join(await self.folder(), "chao_data", chao_name, f"{chao_name}_stats.parquet")
+
+    async def chao_dir(self, chao_name):
+        return os.path.join(await self.folder(), "chao_data", chao_name)
+
+    async def load_chao(self, chao_name):
+        """
+        (stats_df, newest row as a ChaoState) for one of the user's chao, read at
+        most once per interaction; the frame is empty if the chao has no stats.
+        Edit the returned ChaoState in place and stage_chao it to save it.
+        """
+        if chao_name not in self.chao:
+            path = await self.stats_path(chao_name)
+            await self._hold(path)
+            df = await self.data_utils.aload_chao_stats(path)
+            self.chao[chao_name] = (df, ChaoState.from_frame(df) if not df.empty else ChaoState())
+        return self.chao[chao_name]
+
+    async def chao_exists(self, chao_name):
+        df, _ = await self.load_chao(chao_name)
+        return not df.empty
+
+    def stage_chao(self, chao_name):
+        """Marks the (edited) ChaoState from load_chao to be saved at commit."""
+        self.dirty_chao.add(chao_name)
+
+    async def inventory_path(self):
+        return os.path.join(await self.folder(), "user_data", "inventory.parquet")
+
+    async def load_inventory(self):
+        """(inventory_df, newest row as an Inventory), read at most once per interaction."""
+        if self.inventory is None:
+            path = await self.inventory_path()
+            await self._hold(path)
+            df = await self.data_utils.aload_inventory(path)
+            self.inventory = (df, Inventory.from_frame(df) if not df.empty else Inventory())
+        return self.inventory
+
+    def stage_inventory(self, current_inventory):
+        """Saves current_inventory (a mapping of item -> count) as today's row at commit."""
+        self.pending_inventory = current_inventory
+
+    async def commit(self):
+        """Saves everything staged so far. Saved chao are re-read if used again."""
+        if self.pending_inventory is not None:
+            inv_df, _ = await self.load_inventory()
+            await self.data_utils.asave_inventory(await self.inventory_path(), inv_df, self.pending_inventory)
+            self.pending_inventory = None
+            self.inventory = None
+        for chao_name in sorted(self.dirty_chao):
+            df, state = self.chao.pop(chao_name)
+            await self.data_utils.asave_chao_stats(await self.stats_path(chao_name), df, state)
+        self.dirty_chao.clear()
+
+
+@contextlib.asynccontextmanager
+async def request_context(interaction: discord.Interaction, data_utils):
+    """
+    Yields the interaction's RequestContext (kept in interaction.extras),
+    creating it on first use. Staged changes are committed when the outermost
+    request_context block for the interaction exits normally; if it raises,
+    they are dropped. Either way the context's io_locks are released then.
+    """
+    ctx = interaction.extras.get(RequestContext.KEY)
+    if ctx is None:
+        ctx = interaction.extras[RequestContext.KEY] = RequestContext(interaction, data_utils)
+    ctx.depth += 1
+    try:
+        yield ctx
+        if ctx.depth == 1:
+            await ctx.commit()
+    finally:
+        ctx.depth -= 1
+        if not ctx.depth:
+            interaction.extras.pop(RequestContext.KEY, None)
+            await ctx.release()
+
+
 # --------------------------
 # Decorators
 # --------------------------
@@ -158,7 +286,7 @@ def ensure_user_initialized(func):
             )
 
         # Check if the user has run /chao
-        if not data_utils.is_user_initialized(guild_id, guild_name, user):
+        if not await data_utils.ais_user_initialized(guild_id, guild_name, user):
             return await interaction.response.send_message(
                 f"{interaction.user.mention}, please use the `/chao` command to start using the Chao Bot.",
                 ephemeral=True
@@ -177,79 +305,53 @@ def ensure_user_initialized(func):
 
 def ensure_chao_alive(func):
     """
-    Ensures the targeted chao is not dead, and updates every chao in the user's chao_data:
-    if a chao has 0 hp_ticks, mark it dead.
+    Ensures the targeted chao is not dead. Deaths are recorded when a chao is
+    saved at 0 hp_ticks, so this is one lookup in the guild's chao manifest.
     """
     @wraps(func)
     async def wrapper(self, interaction: discord.Interaction, *args, **kwargs):
         data_utils = self.data_utils
-        guild_id, guild_name, user = get_guild_user_interaction(interaction)
-
-        # Update all chao's hp/dead state
-        guild_folder = data_utils.update_server_folder(interaction.guild)
-        user_folder = data_utils.get_user_folder(guild_folder, user)
-        chao_data_dir = os.path.join(user_folder, "chao_data")
-        if os.path.exists(chao_data_dir):
-            for root, _, files in os.walk(chao_data_dir):
-                for filename in files:
-                    if filename.endswith("_stats.parquet"):
-                        stats_path = os.path.join(root, filename)
-                        chao_df = data_utils.load_chao_stats(stats_path)
-                        if not chao_df.empty:
-                            latest = chao_df.iloc[-1].to_dict()
-                            hp = safe_int(latest.get("hp_ticks", 0))
-                            if hp == 0 and safe_int(latest.get("dead", 0)) != 1:
-                                chao_df.iloc[-1, chao_df.columns.get_loc("dead")] = 1
-                                chao_df.to_parquet(stats_path, index=False)
-
-        # Check if there's a target chao
-        chao_raw = kwargs.get("chao_name") or kwargs.get("chao_name_and_fruit") or (args[0] if args else None)
-        if not chao_raw:
-            return await func(self, interaction, *args, **kwargs)
-
-        chao_name = parse_chao_name(interaction, chao_raw, data_utils)
-        if not chao_name:
-            return await interaction.response.send_message("No valid Chao name found.", ephemeral=True)
-
-        chao_dir = data_utils.get_path(guild_id, guild_name, user, "chao_data", chao_name)
-        stats_path = os.path.join(chao_dir, f"{chao_name}_stats.parquet")
-        if not os.path.exists(stats_path):
-            return await interaction.response.send_message(
-                f"{interaction.user.mention}, no Chao named **{chao_name}** exists.",
-                ephemeral=True
-            )
+        async with request_context(interaction, data_utils) as req:
+            # Check if there's a target chao
+            chao_raw = kwargs.get("chao_name") or kwargs.get("chao_name_and_fruit") or (args[0] if args else None)
+            if not chao_raw:
+                return await func(self, interaction, *args, **kwargs)
+
+            chao_name = await req.chao_name(chao_raw)
+            if not chao_name:
+                return await interaction.response.send_message("No valid Chao name found.", ephemeral=True)
+
+            entry = await data_utils.achao_entry(req.guild_id, req.user.id, chao_name)
+            if entry is None:
+                return await interaction.response.send_message(
+                    f"{interaction.user.mention}, no Chao named **{chao_name}** exists.",
+                    ephemeral=True
+                )
 
-        chao_df = data_utils.load_chao_stats(stats_path)
-        if chao_df.empty:
-            return await interaction.response.send_message(
-                f"{interaction.user.mention}, no stats found for **{chao_name}**.",
-                ephemeral=True
-            )
+            if entry["dead"]:
+                _, latest = await req.load_chao(chao_name)
+                d = latest.get("date_of_death") or datetime.now().strftime("%Y-%m-%d")
+                embed = discord.Embed(
+                    title=f"{chao_name} has passed...",
+                    description=f"{chao_name} can no longer be interacted with.\n\n**Date of Death:** {d}",
+                    color=discord.Color.dark_gray()
+                )
+                # Grave thumbnail
+                grave_img = THUMBNAILS_DIR / "chao_grave.png"
+                file = discord.File(grave_img, filename="chao_grave.png") if grave_img.exists() else None
+                if file:
+                    embed.set_thumbnail(url="attachment://chao_grave.png")
+                    await interaction.response.send_message(file=file, embed=embed)
+                else:
+                    await interaction.response.send_message(embed=embed)
+                return
 
-        latest = chao_df.iloc[-1].to_dict()
-        if safe_int(latest.get("dead", 0)) == 1 or safe_int(latest.get("hp_ticks", 0)) == 0:
-            d = latest.get("date_of_death", datetime.now().strftime("%Y-%m-%d"))
-            embed = discord.Embed(
-                title=f"{chao_name} has passed...",
-                description=f"{chao_name} can no longer be interacted with.\n\n**Date of Death:** {d}",
-                color=discord.Color.dark_gray()
-            )
-            # Grave thumbnail
-            grave_img = THUMBNAILS_DIR / "chao_grave.png"
-            file = discord.File(grave_img, filename="chao_grave.png") if grave_img.exists() else None
-            if file:
-                embed.set_thumbnail(url="attachment://chao_grave.png")
-                await interaction.response.send_message(file=file, embed=embed)
-            else:
-                await interaction.response.send_message(embed=embed)
-            return
-
-        # If the chao is alive, proceed
-        try:
-            return await func(self, interaction, *args, **kwargs)
-        except Exception as e:
-            await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
-            raise
+            # If the chao is alive, proceed
+            try:
+                return await func(self, interaction, *args, **kwargs)
+            except Exception as e:
+                await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
+                raise
 
     return wrapper
 
@@ -270,31 +372,27 @@ def ensure_chao_hatched(func):
         if not chao_raw:
             return await func(self, interaction, *args, **kwargs)
 
-        data_utils = self.data_utils
-        chao_name = parse_chao_name(interaction, chao_raw, data_utils)
-        if not chao_name:
-            return await interaction.response.send_message("No valid Chao name found.", ephemeral=True)
-
-        guild_id, guild_name, user = get_guild_user_interaction(interaction)
-        chao_dir = data_utils.get_path(guild_id, guild_name, user, 'chao_data', chao_name)
-        stats_path = os.path.join(chao_dir, f"{chao_name}_stats.parquet")
+        async with request_context(interaction, self.data_utils) as req:
+            chao_name = await req.chao_name(chao_raw)
+            if not chao_name:
+                return await interaction.response.send_message("No valid Chao name found.", ephemeral=True)
 
-        if not os.path.exists(stats_path):
-            return await interaction.response.send_message(
-                f"{interaction.user.mention}, no Chao named **{chao_name}** exists.",
-                ephemeral=True
-            )
+            chao_df, latest = await req.load_chao(chao_name)
+            if chao_df.empty:
+                return await interaction.response.send_message(
+                    f"{interaction.user.mention}, no Chao named **{chao_name}** exists.",
+                    ephemeral=True
+                )
 
-        chao_df = data_utils.load_chao_stats(stats_path)
-        if chao_df.empty or safe_int(chao_df.iloc[-1].get("hatched", 0)) == 0:
-            # If it's not hatched, optionally respond or just block:
-            return
+            if safe_int(latest.get("hatched", 0)) == 0:
+                # If it's not hatched, optionally respond or just block:
+                return
 
-        try:
-            return await func(self, interaction, *args, **kwargs)
-        except Exception as e:
-            await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
-            raise
+            try:
+                return await func(self, interaction, *args, **kwargs)
+            except Exception as e:
+                await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
+                raise
 
     return wrapper
 
@@ -315,115 +413,80 @@ def ensure_not_in_cacoon(func):
         if not chao_raw:
             return await func(self, interaction, *args, **kwargs)
 
-        data_utils = self.data_utils
-        chao_name = parse_chao_name(interaction, chao_raw, data_utils)
-        if not chao_name:
-            return await interaction.response.send_message("No valid Chao name found.", ephemeral=True)
-
-        guild_id, guild_name, user = get_guild_user_interaction(interaction)
-        chao_dir = data_utils.get_path(guild_id, guild_name, user, 'chao_data', chao_name)
-        stats_path = os.path.join(chao_dir, f"{chao_name}_stats.parquet")
-        if not os.path.exists(stats_path):
-            return await interaction.response.send_message(
-                f"{interaction.user.mention}, no Chao named **{chao_name}** exists.",
-                ephemeral=True
-            )
-
-        chao_df = data_utils.load_chao_stats(stats_path)
-        if chao_df.empty:
-            return await interaction.response.send_message(
-                f"{interaction.user.mention}, no stats found for **{chao_name}**.",
-                ephemeral=True
-            )
-
-        latest = chao_df.iloc[-1].to_dict()
-        now = datetime.now()
-
-        # --- Check if Evolving ---
-        if latest.get("evolve_cacoon", 0) == 1:
-            evolution_end_time_str = latest.get("evolution_end_time")
-            if evolution_end_time_str:
-                try:
-                    evolution_end = datetime.fromisoformat(evolution_end_time_str)
-                except:
-                    evolution_end = now + timedelta(seconds=60)
-            else:
-                evolution_end = now + timedelta(seconds=60)
-
-            remaining = (evolution_end - now).total_seconds()
-            if remaining > 0:
-                safe_name = chao_name.replace(" ", "_")
-                file = generate_evolution_image(safe_name)
-                embed = discord.Embed(
-                    title="Chao Is Evolving!",
-                    description=(
-                        f"{interaction.user.mention}, your chao **{chao_name}** is evolving. "
-                        f"You cannot interact for {int(remaining)} seconds."
-                    ),
-                    color=discord.Color.purple()
-                )
-                embed.set_thumbnail(url=f"attachment://{file.filename}")
-                await interaction.response.send_message(embed=embed, file=file)
-                await asyncio.sleep(remaining)
-                return
-
-        # --- Check if Reincarnating ---
-        if latest.get("reincarnate_cacoon", 0) == 1:
-            reincarnation_end_time_str = latest.get("reincarnation_end_time")
-            if reincarnation_end_time_str:
-                try:
-                    reincarnation_end = datetime.fromisoformat(reincarnation_end_time_str)
-                except:
-                    reincarnation_end = now + timedelta(seconds=60)
-            else:
-                reincarnation_end = now + timedelta(seconds=60)
-
-            remaining = (reincarnation_end - now).total_seconds()
-            if remaining > 0:
-                safe_name = chao_name.replace(" ", "_")
-                file = generate_reincarnation_image(latest, safe_name)
-                embed = discord.Embed(
-                    title="Chao Is Reincarnating!",
-                    description=(
-                        f"{interaction.user.mention}, your chao **{chao_name}** is reincarnating. "
-                        f"You cannot interact for {int(remaining)} seconds."
-                    ),
-                    color=discord.Color.purple()
-                )
-                embed.set_thumbnail(url=f"attachment://{file.filename}")
-                await interaction.response.send_message(embed=embed, file=file)
-                await asyncio.sleep(remaining)
-                return
+        async with request_context(interaction, self.data_utils) as req:
+            chao_name = await req.chao_name(chao_raw)
+            if not chao_name:
+                return await interaction.response.send_message("No valid Chao name found.", ephemeral=True)
 
-        # --- Check if Dying ---
-        if latest.get("death_cacoon", 0) == 1:
-            death_end_time_str = latest.get("death_end_time")
-            if death_end_time_str:
-                try:
-                    death_end = datetime.fromisoformat(death_end_time_str)
-                except:
-                    death_end = now + timedelta(seconds=60)
-            else:
-                death_end = now + timedelta(seconds=60)
-
-            remaining = (death_end - now).total_seconds()
-            if remaining > 0:
-                safe_name = chao_name.replace(" ", "_")
-                file = generate_death_image(latest, safe_name)
-                embed = discord.Embed(
-                    title="Chao Is Dying!",
-                    description=(
-                        f"{interaction.user.mention}, your chao **{chao_name}** is dying. "
-                        f"You cannot interact for {int(remaining)} seconds."
-                    ),
-                    color=discord.Color.dark_red()
+            chao_df, latest = await req.load_chao(chao_name)
+            if chao_df.empty:
+                return await interaction.response.send_message(
+                    f"{interaction.user.mention}, no Chao named **{chao_name}** exists.",
+                    ephemeral=True
                 )
-                embed.set_thumbnail(url=f"attachment://{file.filename}")
-                await interaction.response.send_message(embed=embed, file=file)
-                await asyncio.sleep(remaining)
-                return
 
-        # If no cacoon is active, proceed
-        return await func(self, interaction, *args, **kwargs)
+            now = datetime.now()
+            # --- Check if Evolving ---
+            if latest.get("evolve_cacoon", 0) == 1:
+                evolution_end = coerce_datetime(latest.get("evolution_end_time")) or now + timedelta(seconds=COCOON_SECONDS)
+
+                remaining = (evolution_end - now).total_seconds()
+                if remaining > 0:
+                    safe_name = chao_name.replace(" ", "_")
+                    file = generate_evolution_image(safe_name)
+                    embed = discord.Embed(
+                        title="Chao Is Evolving!",
+                        description=(
+                            f"{interaction.user.mention}, your chao **{chao_name}** is evolving. "
+                            f"You cannot interact for {int(remaining)} seconds."
+                        ),
+                        color=discord.Color.purple()
+                    )
+                    embed.set_thumbnail(url=f"attachment://{file.filename}")
+                    await interaction.response.send_message(embed=embed, file=file)
+                    return
+
+            # --- Check if Reincarnating ---
+            if latest.get("reincarnate_cacoon", 0) == 1:
+                reincarnation_end = coerce_datetime(latest.get("reincarnation_end_time")) or now + timedelta(seconds=COCOON_SECONDS)
+
+                remaining = (reincarnation_end - now).total_seconds()
+                if remaining > 0:
+                    safe_name = chao_name.replace(" ", "_")
+                    file = generate_reincarnation_image(latest, safe_name)
+                    embed = discord.Embed(
+                        title="Chao Is Reincarnating!",
+                        description=(
+                            f"{interaction.user.mention}, your chao **{chao_name}** is reincarnating. "
+                            f"You cannot interact for {int(remaining)} seconds."
+                        ),
+                        color=discord.Color.purple()
+                    )
+                    embed.set_thumbnail(url=f"attachment://{file.filename}")
+                    await interaction.response.send_message(embed=embed, file=file)
+                    return
+
+            # --- Check if Dying ---
+            if latest.get("death_cacoon", 0) == 1:
+                death_end = coerce_datetime(latest.get("death_end_time")) or now + timedelta(seconds=COCOON_SECONDS)
+
+                remaining = (death_end - now).total_seconds()
+                if remaining > 0:
+                    safe_name = chao_name.replace(" ", "_")
+                    file = generate_death_image(latest, safe_name)
+                    embed = discord.Embed(
+                        title="Chao Is Dying!",
+                        description=(
+                            f"{interaction.user.mention}, your chao **{chao_name}** is dying. "
+                            f"You cannot interact for {int(remaining)} seconds."
+                        ),
+                        color=discord.Color.dark_red()
+                    )
+                    embed.set_thumbnail(url=f"attachment://{file.filename}")
+                    await interaction.response.send_message(embed=embed, file=file)
+                    return
+
+            # If no cacoon is active, proceed
+            return await func(self, interaction, *args, **kwargs)
 
     return wrapper
@@ -9,6 +9,7 @@ from discord import app_commands
 from dotenv import load_dotenv
 from views.stats_view import StatsView  # Import persistent stats view loader
 from views.market_view import MarketView  # Import persistent market view loader
+from storage.records import Inventory
 
 # Global dictionary to store a sliding window of recent messages per user.
 # Key: (guild_id, user.id) -> List of normalized messages (up to 5 recent ones)
@@ -128,10 +129,10 @@ async def on_message(message: discord.Message):
 
     # If a restriction is set and the message is not in the allowed channel, still add rings, but skip processing commands
     if channel_id and message.channel.id != channel_id:
-        add_rings_for_user(message)
+        await add_rings_for_user(message)
         return
 
-    add_rings_for_user(message)
+    await add_rings_for_user(message)
 
     # Process normal prefix-based commands if needed (not slash commands)
     await bot.process_commands(message)
@@ -151,14 +152,14 @@ async def on_interaction(interaction: discord.Interaction):
         # If there's a restricted channel for this guild, we could optionally check 
         # if the user is using slash commands in that channel, etc.
         # We'll still award rings no matter what channel, but you can decide otherwise.
-        add_rings_for_slash_command(interaction)
+        await add_rings_for_slash_command(interaction)
 
     # NOTICE: We do NOT call bot.process_application_commands(interaction) here
     # because that method doesn't exist in recent discord.py versions.
     # The library automatically handles slash command invocations.
 
 
-def add_rings_for_slash_command(interaction: discord.Interaction):
+async def add_rings_for_slash_command(interaction: discord.Interaction):
     """
     Award rings for a slash (or context) command usage.
     We'll give them 5 rings for each slash command invoked, no spam check needed.
@@ -174,20 +175,21 @@ def add_rings_for_slash_command(interaction: discord.Interaction):
     guild_name = guild.name
 
     # Check if the user is initialized
-    if not data_utils.is_user_initialized(guild_id, guild_name, user):
+    if not await data_utils.ais_user_initialized(guild_id, guild_name, user):
         print(f"User {user.name} is not initialized in the Chao system.")
         return
 
     try:
-        inventory_path = data_utils.get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
-        inventory_df = data_utils.load_inventory(inventory_path)
-        if inventory_df.empty:
-            current_inventory = {'rings': 0}
-        else:
-            current_inventory = inventory_df.iloc[-1].to_dict()
-
-        current_inventory['rings'] = current_inventory.get('rings', 0) + 5
-        data_utils.save_inventory(inventory_path, inventory_df, current_inventory)
+        inventory_path = await data_utils.aget_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
+        async with data_utils.io_lock(inventory_path):
+            inventory_df = await data_utils.aload_inventory(inventory_path)
+            if inventory_df.empty:
+                current_inventory = {'rings': 0}
+            else:
+                current_inventory = Inventory.from_frame(inventory_df)
+
+            current_inventory['rings'] = current_inventory.get('rings', 0) + 5
+            await data_utils.asave_inventory(inventory_path, inventory_df, current_inventory)
         print(f"Awarded 5 rings to {user.name} for slash command usage. (Guild={guild_id})")
     except Exception as e:
         print(f"Error adding slash command rings for {user.name}: {str(e)}")
@@ -201,7 +203,7 @@ def save_restricted_channels():
         json.dump(restricted_channels, f, indent=4)
 
 
-def add_rings_for_user(message: discord.Message):
+async def add_rings_for_user(message: discord.Message):
     """
     Award 5 rings for each non-spam message a user sends.
     
@@ -222,7 +224,7 @@ def add_rings_for_user(message: discord.Message):
         return
 
     # Check if the user is initialized in the Chao system
-    if not data_utils.is_user_initialized(guild_id, guild_name, user):
+    if not await data_utils.ais_user_initialized(guild_id, guild_name, user):
         print(f"User {user.name} is not initialized in the Chao system.")
         return
 
@@ -261,25 +263,27 @@ def add_rings_for_user(message: discord.Message):
 
     try:
         # Get the inventory file path
-        inventory_path = data_utils.get_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
-
-        # Load the inventory
-        inventory_df = data_utils.load_inventory(inventory_path)
-        if inventory_df.empty:
-            print(f"Inventory is empty for user {user.name}. Initializing with 0 rings.")
-            current_inventory = {'rings': 0}
-        else:
-            current_inventory = inventory_df.iloc[-1].to_dict()
-
-        # Award 5 rings for this valid (non-spam) message
-        current_inventory['rings'] = current_inventory.get('rings', 0) + 5
-
-        # Save the updated inventory
-        data_utils.save_inventory(inventory_path, inventory_df, current_inventory)
+        inventory_path = await data_utils.aget_path(guild_id, guild_name, user, 'user_data', 'inventory.parquet')
+
+        async with data_utils.io_lock(inventory_path):
+            # Load the inventory
+            inventory_df = await data_utils.aload_inventory(inventory_path)
+            if inventory_df.empty:
+                print(f"Inventory is empty for user {user.name}. Initializing with 0 rings.")
+                current_inventory = {'rings': 0}
+            else:
+                current_inventory = Inventory.from_frame(inventory_df)
+
+            # Award 5 rings for this valid (non-spam) message
+            current_inventory['rings'] = current_inventory.get('rings', 0) + 5
+
+            # Save the updated inventory
+            await data_utils.asave_inventory(inventory_path, inventory_df, current_inventory)
         print(f"Awarded 5 rings to {user.name} (Guild={guild_id}).")
     except Exception as e:
         print(f"Error adding rings for {user.name}: {str(e)}")
 
 
-# Run the bot
-bot.run(os.getenv('DISCORD_TOKEN'))
+# Run the bot (decay worker processes import this module too; they must not start it)
+if __name__ == "__main__":
+    bot.run(os.getenv('DISCORD_TOKEN'))
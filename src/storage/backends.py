@@ -0,0 +1,23 @@
+# storage/backends.py
+
+import os
+from config import DATABASE_DIR, STORAGE_BACKEND, SQLITE_DB_PATH, SEGMENT_HOT_MAX_DAYS
+from storage.parquet_store import ParquetStore
+from storage.segment_store import SegmentStore
+from storage.sqlite_store import SQLiteStore
+
+
+def open_store(backend=STORAGE_BACKEND, database_dir=None):
+    """
+    Builds the storage backend named in config (shared by DataUtils and the CLI
+    tools). database_dir points SQLite at another tree's database file (benchmarks).
+    """
+    if backend == "sqlite":
+        if database_dir is None:
+            return SQLiteStore(SQLITE_DB_PATH, DATABASE_DIR)
+        return SQLiteStore(os.path.join(database_dir, SQLITE_DB_PATH.name), database_dir)
+    if backend == "segments":
+        return SegmentStore(SEGMENT_HOT_MAX_DAYS)
+    if backend == "parquet":
+        return ParquetStore()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
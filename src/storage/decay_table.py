@@ -0,0 +1,234 @@
+# storage/decay_table.py
+
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+import numpy as np
+from storage.schema import coerce_datetime
+
+# Column order of the ticks/last arrays; the first three are the HP guard stats.
+DECAY_STATS = ("belly", "happiness", "energy", "hp")
+HP = 3
+GUARDS = slice(0, HP)
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NO_TIME = -1                 # never-stamped last_*_update
+NEVER = np.int64(2 ** 62)    # "no deadline" / "never runs empty"
+ALREADY = np.int64(-2 ** 62)  # "was already empty when last stamped"
+
+# One chao whose decay state moved: `values` maps column -> new value (ticks as int,
+# last_*_update as datetime). `persist` is False for changes the caller need not save.
+DecayChange = namedtuple("DecayChange", "key values old_hp new_hp persist")
+
+
+def to_micros(value):
+    dt = coerce_datetime(value)
+    return NO_TIME if dt is None else (dt - EPOCH) // MICROSECOND
+
+
+def from_micros(value):
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+class DecayTable:
+    """
+    The decay-relevant columns of every scheduled chao, kept as NumPy arrays so a
+    batch of chao is decayed with a handful of array operations instead of a
+    Python loop per row. Row i holds ticks[i] and last[i] (microseconds since the
+    epoch, NO_TIME if unstamped) for belly, happiness, energy and hp, plus an
+    alive flag (dead chao don't decay). Rows are addressed by key (the stats path)
+    and reused once removed. Thread-safe.
+    """
+
+    def __init__(self, capacity=1024):
+        self.keys = [None] * capacity
+        self.rows = {}
+        self.free = list(range(capacity - 1, -1, -1))
+        self.ticks = np.zeros((capacity, 4), dtype=np.int64)
+        self.last = np.full((capacity, 4), NO_TIME, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def _grow(self):
+        old = len(self.keys)
+        self.keys.extend([None] * old)
+        self.free.extend(range(2 * old - 1, old - 1, -1))
+        self.ticks = np.concatenate([self.ticks, np.zeros((old, 4), dtype=np.int64)])
+        self.last = np.concatenate([self.last, np.full((old, 4), NO_TIME, dtype=np.int64)])
+        self.alive = np.concatenate([self.alive, np.zeros(old, dtype=bool)])
+
+    def upsert(self, key, row):
+        """Loads one chao's newest stats row (any mapping). Returns its row number."""
+        with self.lock:
+            i = self.rows.get(key)
+            if i is None:
+                if not self.free:
+                    self._grow()
+                i = self.free.pop()
+                self.rows[key] = i
+                self.keys[i] = key
+            self.ticks[i] = [int(row.get(f"{s}_ticks", 0) or 0) for s in DECAY_STATS]
+            self.last[i] = [to_micros(row.get(f"last_{s}_update")) for s in DECAY_STATS]
+            self.alive[i] = not int(row.get("dead", 0) or 0)
+            return i
+
+    def remove(self, key):
+        with self.lock:
+            i = self.rows.pop(key, None)
+            if i is not None:
+                self.keys[i] = None
+                self.alive[i] = False
+                self.free.append(i)
+
+    def row_numbers(self, keys):
+        with self.lock:
+            return np.array([self.rows[k] for k in keys if k in self.rows], dtype=np.int64)
+
+    def all_rows(self):
+        with self.lock:
+            return np.fromiter(self.rows.values(), dtype=np.int64, count=len(self.rows))
+
+    def key_at(self, rows):
+        return [self.keys[i] for i in rows]
+
+    # ------------------- Array kernels -------------------
+    @staticmethod
+    def _rates(rates):
+        """(amount, period in microseconds) arrays in DECAY_STATS order."""
+        amount = np.array([rates[s][0] for s in DECAY_STATS], dtype=np.int64)
+        period = np.array([rates[s][1] * 60_000_000 for s in DECAY_STATS], dtype=np.int64)
+        return amount, period
+
+    @staticmethod
+    def _empty_since(ticks, last, amount, period):
+        """
+        When the first guard stat runs (or ran) empty, from its own blocks:
+        ALREADY if one was empty when stamped, NEVER if none is stamped.
+        """
+        t, l = ticks[:, GUARDS], last[:, GUARDS]
+        runs_out = l + period[GUARDS] * -(-np.maximum(t, 0) // amount[GUARDS])
+        since = np.where(l == NO_TIME, NEVER, np.where(t <= 0, ALREADY, runs_out))
+        return since.min(axis=1)
+
+    @staticmethod
+    def _hp_start(last_hp, hp_from, now):
+        """Where HP blocks are counted from (mirrors settle_decay)."""
+        start = np.where(last_hp == NO_TIME, hp_from, np.maximum(last_hp, hp_from))
+        return np.where(start == ALREADY, now, start)
+
+    def _settle(self, ticks, last, now, amount, period):
+        """Closed-form lazy decay of whole arrays; same rules as chao_decay.settle_decay."""
+        ticks, last = ticks.copy(), last.copy()
+        hp_from = self._empty_since(ticks, last, amount, period)
+        unstamped = last[:, GUARDS] == NO_TIME
+        empty_now = (unstamped & (ticks[:, GUARDS] <= 0)).any(axis=1)
+        hp_from = np.where(empty_now, np.minimum(hp_from, now), hp_from)
+
+        t, l = ticks[:, GUARDS], last[:, GUARDS]
+        blocks = np.where(unstamped, 0, np.maximum(now - l, 0) // period[GUARDS])
+        ticks[:, GUARDS] = np.where(blocks > 0, np.maximum(t - blocks * amount[GUARDS], 0), t)
+        last[:, GUARDS] = np.where(unstamped, now, l + blocks * period[GUARDS])
+
+        last_hp = last[:, HP]
+        starving = hp_from <= now
+        start = self._hp_start(last_hp, hp_from, now)
+        blocks = np.where(starving & (now > start), (now - start) // period[HP], 0)
+        ticks[:, HP] = np.where(blocks > 0, np.maximum(ticks[:, HP] - blocks * amount[HP], 0), ticks[:, HP])
+        last[:, HP] = np.where(
+            blocks > 0, start + blocks * period[HP],
+            np.where(last_hp == NO_TIME, np.where(starving, start, now), last_hp))
+        return ticks, last
+
+    @staticmethod
+    def _step(ticks, last, now, amount, period):
+        """
+        One loop pass of the eager decay: at most one block per stat, with the
+        loops' HP rules (HP's clock is held at now while no guard stat is empty).
+        """
+        ticks, last = ticks.copy(), last.copy()
+        last[:, HP] = np.where((ticks[:, GUARDS] > 0).all(axis=1), now, last[:, HP])
+
+        t, l = ticks[:, GUARDS], last[:, GUARDS]
+        unstamped = l == NO_TIME
+        due = ~unstamped & (now - l >= period[GUARDS])
+        ticks[:, GUARDS] = np.where(due, np.maximum(t - amount[GUARDS], 0), t)
+        last[:, GUARDS] = np.where(unstamped, now, np.where(due, np.minimum(l + period[GUARDS], now), l))
+
+        fed = (ticks[:, GUARDS] > 0).all(axis=1)
+        last_hp = last[:, HP]
+        due = ~fed & (last_hp != NO_TIME) & (now - last_hp >= period[HP])
+        ticks[:, HP] = np.where(due, np.maximum(ticks[:, HP] - amount[HP], 0), ticks[:, HP])
+        last[:, HP] = np.where(fed | (last_hp == NO_TIME), now,
+                               np.where(due, np.minimum(last_hp + period[HP], now), last_hp))
+        return ticks, last
+
+    def _next_due(self, ticks, last, now, amount, period, lazy):
+        hp_alive = ticks[:, HP] > 0
+        if lazy:
+            unstamped = (last[:, GUARDS] == NO_TIME).any(axis=1)
+            hp_from = self._empty_since(ticks, last, amount, period)
+            start = self._hp_start(last[:, HP], hp_from, now)
+            blocks = np.where(now > start, (now - start) // period[HP], 0)
+            drop = np.where((hp_from == NEVER) | ~hp_alive, NEVER, start + period[HP] * (blocks + 1))
+            return np.where(unstamped, now, drop)
+
+        l = last[:, GUARDS]
+        due = np.where(l == NO_TIME, now, l + period[GUARDS]).min(axis=1)
+        starving = (ticks[:, GUARDS] <= 0).any(axis=1) & hp_alive
+        hp_due = np.where(last[:, HP] == NO_TIME, now, last[:, HP] + period[HP])
+        return np.minimum(due, np.where(starving, hp_due, NEVER))
+
+    # ------------------- Batch operations -------------------
+    def next_due(self, rows, now, rates, lazy):
+        """
+        Deadline per row (datetime, or None if it never needs the decay loop
+        until it is written again), in the order of rows.
+        """
+        amount, period = self._rates(rates)
+        now_us = to_micros(now)
+        with self.lock:
+            due = self._next_due(self.ticks[rows], self.last[rows], now_us, amount, period, lazy)
+            due = np.where(self.alive[rows], due, NEVER)
+        return [None if d == NEVER else from_micros(d) for d in due]
+
+    def decay(self, rows, now, rates, lazy):
+        """
+        Decays the given rows up to now (settling every elapsed block in lazy
+        mode, one block per stat otherwise) and stores the result in the table.
+        Returns a DecayChange per row that moved; lazily settled values only
+        need persisting when a clock was stamped for the first time or HP ran
+        out (the save marks the chao dead).
+        """
+        amount, period = self._rates(rates)
+        now_us = to_micros(now)
+        with self.lock:
+            rows = rows[self.alive[rows]]
+            ticks, last = self.ticks[rows], self.last[rows]
+            if lazy:
+                new_ticks, new_last = self._settle(ticks, last, now_us, amount, period)
+            else:
+                new_ticks, new_last = self._step(ticks, last, now_us, amount, period)
+            self.ticks[rows], self.last[rows] = new_ticks, new_last
+            keys = self.key_at(rows)
+
+        tick_moved = new_ticks != ticks
+        time_moved = new_last != last
+        stamped = (last == NO_TIME).any(axis=1)
+        died = (new_ticks[:, HP] == 0) & (ticks[:, HP] > 0)
+        changes = []
+        for n in np.flatnonzero(tick_moved.any(axis=1) | time_moved.any(axis=1)):
+            values = {}
+            for c in np.flatnonzero(tick_moved[n]):
+                values[f"{DECAY_STATS[c]}_ticks"] = int(new_ticks[n, c])
+            for c in np.flatnonzero(time_moved[n]):
+                values[f"last_{DECAY_STATS[c]}_update"] = from_micros(new_last[n, c])
+            changes.append(DecayChange(keys[n], values, int(ticks[n, HP]), int(new_ticks[n, HP]),
+                                       bool(stamped[n] or died[n]) or not lazy))
+        return changes
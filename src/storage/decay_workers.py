@@ -0,0 +1,72 @@
+# storage/decay_workers.py
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from storage.backends import open_store
+from storage.records import ChaoState, apply_liveness
+from storage.schema import FILE_COUNTS
+
+# The worker process' own store, opened once by _init_worker.
+_store = None
+
+
+def _init_worker(backend, database_dir):
+    global _store
+    _store = open_store(backend, database_dir)
+
+
+def persist_changes(changes):
+    """
+    Worker side: applies each (stats_path, values) on top of the chao's stored
+    newest row and saves it. Returns ([(stats_path, row dict)] for the rows
+    written, bytes written, {"read", "written"} stats files touched); the rows
+    let the bot update its manifest and decay schedule.
+    """
+    written, nbytes = [], 0
+    files_before = dict(FILE_COUNTS)
+    for stats_path, values in changes:
+        try:
+            df = _store.load_chao_stats(stats_path)
+            if df.empty:
+                continue
+            latest_stats = ChaoState.from_frame(df)
+            latest_stats.update(values)
+            apply_liveness(latest_stats)
+            nbytes += _store.save_chao_stats(stats_path, df, latest_stats) or 0
+        except Exception as e:
+            print(f"[DecayWorkers] Failed to save {stats_path}: {e}")
+            continue
+        written.append((stats_path, latest_stats.to_dict()))
+    return written, nbytes, {k: FILE_COUNTS[k] - files_before[k] for k in FILE_COUNTS}
+
+
+class DecayWorkers:
+    """
+    One single-process pool per shard, so every guild is always handled by the
+    same process and a shard's batches run in order. Processes are spawned (not
+    forked from the threaded bot) on first use.
+    """
+
+    def __init__(self, workers, backend, database_dir=None):
+        context = multiprocessing.get_context("spawn")
+        self.pools = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_worker,
+                                initargs=(backend, database_dir))
+            for _ in range(workers)
+        ]
+        # Stats files the worker processes read/written so far (they keep their own FILE_COUNTS).
+        self.file_counts = {"read": 0, "written": 0}
+
+    def __len__(self):
+        return len(self.pools)
+
+    def shard(self, guild_id):
+        return guild_id % len(self.pools)
+
+    def submit(self, shard, changes):
+        """concurrent.futures.Future of persist_changes(changes) on that shard's process."""
+        return self.pools[shard].submit(persist_changes, changes)
+
+    def shutdown(self, wait=False):
+        for pool in self.pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,169 @@
+# storage/export.py
+
+import os
+import sys
+import json
+import time
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
+from storage.schema import arrow_schema, normalize_chao_frame
+
+STATE_FILE = "_export_state.json"
+# One row group per partition file in practice; keeps readers from seeking through tiny groups.
+ROW_GROUP_SIZE = 1 << 20
+KINDS = {
+    "chao": ("chao_stats", ['user_id', 'chao_name']),
+    "inventory": ("inventory", ['user_id']),
+}
+
+
+def _folder_id(folder_name):
+    head = folder_name.split(" ")[0]
+    return int(head) if head.isdigit() else None
+
+
+def _iter_guilds(database_dir):
+    """Yields (guild_id, [(kind, user_id, chao_name, path), ...]) for every guild folder."""
+    for guild_folder in sorted(os.listdir(database_dir)):
+        guild_path = os.path.join(database_dir, guild_folder)
+        guild_id = _folder_id(guild_folder)
+        if guild_id is None or not os.path.isdir(guild_path):
+            continue
+        histories = []
+        for user_folder in sorted(os.listdir(guild_path)):
+            user_path = os.path.join(guild_path, user_folder)
+            user_id = _folder_id(user_folder)
+            if user_id is None or not os.path.isdir(user_path):
+                continue
+            histories.append(("inventory", user_id, None, os.path.join(user_path, "user_data", "inventory.parquet")))
+            chao_dir = os.path.join(user_path, "chao_data")
+            if os.path.isdir(chao_dir):
+                for chao_name in sorted(os.listdir(chao_dir)):
+                    if os.path.isdir(os.path.join(chao_dir, chao_name)):
+                        histories.append(("chao", user_id, chao_name,
+                                          os.path.join(chao_dir, chao_name, f"{chao_name}_stats.parquet")))
+        yield guild_id, histories
+
+
+def _changed_since(path, since):
+    """
+    True if any parquet file backing this history (plain file, hot segment,
+    compacted segments) was modified after `since`. Backends that keep no
+    files next to the path (SQLite) always count as changed.
+    """
+    folder = os.path.dirname(path)
+    if not os.path.isdir(folder):
+        return False
+    mtimes = [os.path.getmtime(os.path.join(folder, f)) for f in os.listdir(folder) if f.endswith(".parquet")]
+    return not mtimes or max(mtimes) > since
+
+
+def _finish_frame(kind, df):
+    return normalize_chao_frame(df) if kind == "chao" else df.fillna(0)
+
+
+def _write_partitions(out_dir, kind, guild_id, frames, merge):
+    """
+    Writes one guild's rows as <kind>/guild_id=<id>/date=<date>/part-0.parquet.
+    With merge=True rows already exported for the same owner/chao are replaced
+    and everyone else's are kept. Returns the number of partitions written.
+    """
+    folder, key_cols = KINDS[kind]
+    df = _finish_frame(kind, pd.concat(frames, ignore_index=True))
+    written = 0
+    for date, part in df.groupby('date', sort=True):
+        part_dir = os.path.join(out_dir, folder, f"guild_id={guild_id}", f"date={date}")
+        part_path = os.path.join(part_dir, "part-0.parquet")
+        if merge and os.path.exists(part_path):
+            old = pq.read_table(part_path).to_pandas()
+            old.insert(0, 'date', date)
+            new_keys = set(part[key_cols].itertuples(index=False, name=None))
+            keep = [k not in new_keys for k in old[key_cols].itertuples(index=False, name=None)]
+            part = _finish_frame(kind, pd.concat([old[keep], part], ignore_index=True))
+
+        # guild_id and date live in the directory names (hive partitioning).
+        part = part.drop(columns=['date']).reset_index(drop=True)
+        schema = arrow_schema(part) if kind == "chao" else None
+        table = pa.Table.from_pandas(part, schema=schema, preserve_index=False)
+        os.makedirs(part_dir, exist_ok=True)
+        tmp_path = f"{part_path}.tmp"
+        pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp_path, part_path)
+        written += 1
+    return written
+
+
+def export_dataset(store, database_dir, out_dir, incremental=False):
+    """
+    Streams every chao history and inventory, one guild at a time, into a
+    hive-partitioned dataset under out_dir (chao_stats/ and inventory/, each
+    partitioned by guild_id and date). A full export replaces the dataset.
+    An incremental one only reads histories whose files changed since the
+    last export and rewrites the partitions for dates on or after it; older
+    partitions are left alone. Returns a summary dict.
+    """
+    out_dir = str(out_dir)
+    state_path = os.path.join(out_dir, STATE_FILE)
+    since = None
+    if incremental and os.path.exists(state_path):
+        with open(state_path, "r") as f:
+            since = json.load(f).get("exported_at")
+    if since is None:
+        incremental = False
+        for folder, _ in KINDS.values():
+            shutil.rmtree(os.path.join(out_dir, folder), ignore_errors=True)
+    since_date = datetime.fromtimestamp(since).strftime("%Y-%m-%d") if since else None
+
+    # Taken before reading anything so writes made during the export are picked up next time.
+    started = time.time()
+    summary = {"incremental": incremental, "histories": 0, "rows": 0, "partitions": 0}
+    for guild_id, histories in _iter_guilds(database_dir):
+        frames = {"chao": [], "inventory": []}
+        for kind, user_id, chao_name, path in histories:
+            if since is not None and not _changed_since(path, since):
+                continue
+            try:
+                if not store.exists(path):
+                    continue
+                df = store.load_chao_stats(path) if kind == "chao" else store.load_inventory(path)
+            except Exception as e:
+                print(f"[export_dataset] Skipping {path}: {e}")
+                continue
+            if since_date is not None:
+                df = df[df['date'].astype(str) >= since_date]
+            if df.empty:
+                continue
+            df = df.copy()
+            df.insert(1, 'user_id', user_id)
+            if chao_name is not None:
+                df.insert(2, 'chao_name', chao_name)
+            frames[kind].append(df)
+            summary["histories"] += 1
+            summary["rows"] += len(df)
+
+        for kind, kind_frames in frames.items():
+            if kind_frames:
+                summary["partitions"] += _write_partitions(out_dir, kind, guild_id, kind_frames, incremental)
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(state_path, "w") as f:
+        json.dump({"exported_at": started, **summary}, f)
+    return summary
+
+
+if __name__ == "__main__":
+    from config import DATABASE_DIR, EXPORT_DIR
+    from storage.backends import open_store
+
+    args = [a for a in sys.argv[1:] if a != "--incremental"]
+    if len(args) > 1:
+        print("Usage: python -m storage.export [--incremental] [<out_dir>]", file=sys.stderr)
+        sys.exit(1)
+
+    out_dir = args[0] if args else EXPORT_DIR
+    summary = export_dataset(open_store(), DATABASE_DIR, out_dir, incremental="--incremental" in sys.argv)
+    print(f"[export_dataset] {'Incremental' if summary['incremental'] else 'Full'} export to {out_dir}: "
+          f"{summary['histories']} histories, {summary['rows']} rows, {summary['partitions']} partitions.")
@@ -0,0 +1,104 @@
+# storage/parquet_store.py
+
+import os
+import pandas as pd
+from datetime import datetime
+from storage.schema import coerce_chao_row, read_chao_frame, write_chao_frame
+
+
+def apply_today_row(df, row):
+    """
+    Returns df with today's row overwritten (merged with what was already
+    stored for today) or appended. Shared by the stores and the DataUtils cache.
+    """
+    current_date_str = datetime.now().strftime("%Y-%m-%d")
+    new_row = {k: v for k, v in row.items() if k != 'date'}
+    if not df.empty and current_date_str in df['date'].values:
+        old_row = df[df['date'] == current_date_str].iloc[-1].to_dict()
+        new_row = {**old_row, **new_row}
+        df = df[df['date'] != current_date_str]
+    new_row['date'] = current_date_str
+    columns = ['date'] + [c for c in df.columns if c != 'date']
+    columns += [c for c in new_row if c not in columns]
+    if df.empty:
+        return pd.DataFrame([new_row])[columns]
+    return pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)[columns]
+
+
+class ParquetStore:
+    """
+    The original storage layout: one parquet file per chao and per inventory,
+    living under database/<guild>/<user>/...
+    """
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def save_inventory(self, path, inventory_df, current_inventory):
+        """
+        Saves the user's inventory to Parquet, either appending or overwriting today's row.
+        """
+        current_date_str = datetime.now().strftime("%Y-%m-%d")
+        current_inventory.setdefault('Chao Egg', 0)
+
+        if not inventory_df.empty:
+            if current_date_str in inventory_df['date'].values:
+                index = inventory_df[inventory_df['date'] == current_date_str].index[0]
+                for key, val in current_inventory.items():
+                    if key != 'date':
+                        inventory_df.at[index, key] = val
+            else:
+                current_inventory['date'] = current_date_str
+                all_cols = ['date'] + sorted([c for c in current_inventory if c != 'date'])
+                new_entry_df = pd.DataFrame([dict(current_inventory)])[all_cols]
+                inventory_df = pd.concat([inventory_df, new_entry_df], ignore_index=True).fillna(0)
+        else:
+            current_inventory['date'] = current_date_str
+            all_cols = ['date'] + sorted([c for c in current_inventory if c != 'date'])
+            inventory_df = pd.DataFrame([dict(current_inventory)])[all_cols]
+
+        inventory_df.to_parquet(path, index=False)
+
+    def load_inventory(self, path):
+        if os.path.exists(path):
+            inv_df = pd.read_parquet(path).fillna(0)
+            cols = ['date'] + [col for col in inv_df.columns if col != 'date']
+            inv_df = inv_df[cols]
+            return inv_df
+        else:
+            return pd.DataFrame(columns=['date'])
+
+    def write_inventory(self, path, inventory_df):
+        """Replaces the whole inventory history (used by /restore)."""
+        inventory_df.to_parquet(path, index=False)
+
+    def save_chao_stats(self, chao_stats_path, chao_df, chao_stats):
+        """
+        Saves Chao stats for the current date, appending or overwriting today's
+        row. Values are coerced to the declared schema (storage/schema.py), so
+        time columns are stored as native timestamps rather than strings.
+        Returns the number of bytes written.
+        """
+        row = coerce_chao_row({k: v for k, v in chao_stats.items() if k != 'date'})
+        return write_chao_frame(apply_today_row(chao_df, row), chao_stats_path)
+
+    def load_chao_stats(self, chao_stats_path):
+        if os.path.exists(chao_stats_path):
+            return read_chao_frame(chao_stats_path)
+        else:
+            return pd.DataFrame(columns=['date'])
+
+    def write_chao_stats(self, chao_stats_path, chao_df):
+        """Replaces the whole stats history (used by /restore)."""
+        write_chao_frame(chao_df, chao_stats_path)
+
+    def move_chao(self, old_stats_path, new_stats_path):
+        """
+        Nothing to do here: the stats file lives inside the chao's folder,
+        so it has already moved along with it.
+        """
+        pass
+
+    def note_external_save(self, chao_stats_path):
+        """Called after another process (a decay worker) saved this chao. Nothing is cached here."""
+        pass
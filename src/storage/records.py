@@ -0,0 +1,183 @@
+# storage/records.py
+
+import pandas as pd
+from storage.schema import STAT_NAMES, TIME_COLS, INT_COLS, CATEGORY_COLS, STRING_COLS, coerce_value
+
+# Every column a chao has ever been saved with gets a slot; anything else lands in .extras.
+CHAO_FIELDS = tuple(dict.fromkeys(
+    STRING_COLS + CATEGORY_COLS + INT_COLS + TIME_COLS
+    + ['belly_ticks', 'happiness_ticks', 'energy_ticks', 'hp_ticks', 'illness_ticks']
+    + [f"{s}_{part}" for s in STAT_NAMES for part in ('ticks', 'level', 'exp')]
+))
+
+
+def _native(value):
+    """numpy/pandas scalar -> plain Python value (NaT/NaN -> None)."""
+    if value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+class _Record:
+    """
+    Mapping-compatible base for the slotted records: get/[]/pop/items/keys
+    behave like the row dicts the cogs used to pass around, so a record can be
+    handed to anything that took one (including the stores' save_* methods).
+    Unset fields are simply absent, exactly like a missing dict key.
+    """
+    __slots__ = ('extras',)
+    _fields = ()
+    _field_set = frozenset()
+
+    def __init__(self, values=None, **kwargs):
+        self.extras = {}
+        for source in (values or {}, kwargs):
+            for key, val in source.items():
+                self[key] = val
+
+    @classmethod
+    def from_frame(cls, df, index=-1):
+        """
+        Builds a record from one row of a stats/inventory frame, reading each
+        column's array directly instead of materialising an object-dtype row.
+        """
+        record = cls()
+        for col in df.columns:
+            record[col] = _native(df[col].iat[index])
+        return record
+
+    def _coerce(self, key, value):
+        return value
+
+    # ------------------- Mapping interface -------------------
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return self.extras[key]
+
+    def __setitem__(self, key, value):
+        value = self._coerce(key, value)
+        if key in self._field_set:
+            setattr(self, key, value)
+        else:
+            self.extras[key] = value
+
+    def __delitem__(self, key):
+        if key in self._field_set:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        else:
+            del self.extras[key]
+
+    def __contains__(self, key):
+        if key in self._field_set:
+            return hasattr(self, key)
+        return key in self.extras
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def keys(self):
+        return [f for f in self._fields if hasattr(self, f)] + list(self.extras)
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def values(self):
+        return [self[k] for k in self.keys()]
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            return getattr(self, key, default)
+        return self.extras.get(key, default)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, values=(), **kwargs):
+        items = values.items() if hasattr(values, "items") else values
+        for key, val in items:
+            self[key] = val
+        for key, val in kwargs.items():
+            self[key] = val
+
+    def copy(self):
+        return type(self)(self)
+
+    def to_dict(self):
+        return dict(self.items())
+
+
+class ChaoState(_Record):
+    """
+    One chao's stats row. Declared columns live in __slots__ with the types from
+    storage.schema (ints, strings, datetimes), so a few hundred thousand of
+    these cost far less than the dicts of numpy scalars .iloc[-1].to_dict() gave.
+    """
+    __slots__ = CHAO_FIELDS
+    _fields = CHAO_FIELDS
+    _field_set = frozenset(CHAO_FIELDS)
+
+    def _coerce(self, key, value):
+        return coerce_value(key, value)
+
+
+class Inventory(_Record):
+    """
+    One inventory row: 'date' and 'rings' are slots, every item count (fruits,
+    'Chao Egg', ...) is kept in .extras under its display name. Missing counts
+    read as 0.
+    """
+    __slots__ = ('date', 'rings')
+    _fields = ('date', 'rings')
+    _field_set = frozenset(_fields)
+
+    def _coerce(self, key, value):
+        if key == 'date':
+            return value
+        if key == 'rings':
+            return int(value or 0)
+        # Items added after an older row was written come back as NaN there.
+        return 0 if value is None else value
+
+
+def apply_liveness(row):
+    """
+    The liveness rule every chao write goes through: a chao whose hp_ticks is
+    0 is dead. Sets dead=1 on row (a ChaoState or dict) when that isn't
+    recorded yet and returns True if it did. Rows that don't carry hp_ticks
+    (partial updates) are left alone.
+    """
+    hp = row.get("hp_ticks")
+    if hp is None or int(hp) != 0 or int(row.get("dead", 0) or 0) == 1:
+        return False
+    row["dead"] = 1
+    return True
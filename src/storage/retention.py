@@ -0,0 +1,48 @@
+# storage/retention.py
+
+from datetime import datetime, date
+
+
+def _bucket(date_str, today, daily_days, weekly_days):
+    """Retention bucket for one 'YYYY-MM-DD' row: the day itself, its ISO week, or its month."""
+    try:
+        day = datetime.strptime(str(date_str), "%Y-%m-%d").date()
+    except ValueError:
+        # Rows we can't date are never merged away.
+        return str(date_str)
+    age = (today - day).days
+    if age < daily_days:
+        return day.isoformat()
+    if age < weekly_days:
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return day.strftime("%Y-%m")
+
+
+def downsample(df, daily_days, weekly_days, today=None):
+    """
+    Returns df (a chao stats or inventory history, oldest row first) with
+    daily rows kept for the last daily_days, then only the last row of each
+    ISO week until weekly_days, then only the last row of each month.
+    Frames that lose no rows are returned unchanged.
+    """
+    if df.empty or 'date' not in df.columns:
+        return df
+    today = today or date.today()
+    buckets = df['date'].map(lambda d: _bucket(d, today, daily_days, weekly_days))
+    keep = ~buckets.duplicated(keep='last')
+    if keep.all():
+        return df
+    return df[keep.values].reset_index(drop=True)
+
+
+def nearest_retained_date(df, date_str):
+    """
+    The newest stored 'date' on or before date_str (both 'YYYY-MM-DD'), or
+    None. Once history is downsampled a requested day may only survive as the
+    weekly/monthly snapshot taken before it.
+    """
+    if df.empty or 'date' not in df.columns:
+        return None
+    candidates = [d for d in df['date'].astype(str) if d <= date_str]
+    return max(candidates) if candidates else None
@@ -0,0 +1,193 @@
+# storage/schema.py
+
+import os
+import math
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
+
+# Bumped whenever the declared column types change; files without it are upgraded on read.
+SCHEMA_KEY = b"chao_stats_schema"
+SCHEMA_VERSION = b"1"
+
+STAT_NAMES = ['swim', 'fly', 'run', 'power', 'stamina']
+
+# Stats files read/written by this process since startup (for benchmarks and diagnostics).
+FILE_COUNTS = {"read": 0, "written": 0}
+_file_counts_lock = threading.Lock()
+
+# Native timestamps (missing = NaT). Older files stored these as strings.
+TIME_COLS = [
+    'last_belly_update', 'last_happiness_update', 'last_energy_update', 'last_hp_update',
+    'evolution_end_time', 'reincarnation_end_time', 'death_end_time',
+]
+
+# Plain integers (missing = 0), on top of every *_ticks / *_level / *_exp column.
+INT_COLS = [
+    'hatched', 'evolved', 'evolve_cacoon', 'reincarnate_cacoon', 'death_cacoon',
+    'dead', 'immortal', 'reincarnations', 'deaths',
+    'dark_hero', 'run_power', 'swim_fly',
+    'evolution_seconds_left', 'reincarnation_seconds_left', 'death_seconds_left',
+]
+
+# Small sets of repeated strings, stored dictionary-encoded.
+CATEGORY_COLS = ['Form', 'Type', 'Alignment', 'eyes', 'mouth'] + [f"{s}_grade" for s in STAT_NAMES]
+
+# Free-form strings ('YYYY-MM-DD' dates stay strings: they are keys and shown as-is).
+STRING_COLS = ['date', 'birth_date', 'date_of_death']
+
+ARROW_TYPES = {
+    'time': pa.timestamp('us'),
+    'int': pa.int64(),
+    'category': pa.dictionary(pa.int32(), pa.string()),
+    'string': pa.string(),
+}
+
+
+def column_kind(col):
+    """'time', 'int', 'category', 'string' or None for columns the schema doesn't declare."""
+    if col in TIME_COLS or (col.startswith("last_") and col.endswith("_update")):
+        return 'time'
+    if col in INT_COLS or col.endswith(("_ticks", "_level", "_exp")):
+        return 'int'
+    if col in CATEGORY_COLS or col.endswith("_grade"):
+        return 'category'
+    if col in STRING_COLS:
+        return 'string'
+    return None
+
+
+def coerce_datetime(value):
+    """
+    Returns a datetime for anything chao stats have ever stored as a time
+    (Timestamp, datetime, ISO string, '%Y-%m-%d %H:%M:%S'), or None when unset
+    (None, NaT, NaN, 0, "", "0") or unparseable.
+    """
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)):
+        return None
+    text = str(value).strip()
+    if text in ("", "0", "NaT", "nan", "None"):
+        return None
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def _coerce_int(value):
+    try:
+        if isinstance(value, float) and math.isnan(value):
+            return 0
+        return int(float(value))
+    except (ValueError, TypeError):
+        return 0
+
+
+def _coerce_str(value):
+    if value is None or value is pd.NaT or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    text = str(value)
+    return "" if text == "0" else text
+
+
+def coerce_value(col, value):
+    """Converts one stats value to the type declared for its column (undeclared columns pass through)."""
+    kind = column_kind(col)
+    if kind == 'time':
+        return coerce_datetime(value)
+    if kind == 'int':
+        return _coerce_int(value)
+    if kind == 'category':
+        return "" if value is None else str(value)
+    if kind == 'string':
+        return _coerce_str(value)
+    return value
+
+
+def coerce_chao_row(row):
+    """Converts a single stats row (dict) to the declared types, in place."""
+    for key, val in row.items():
+        row[key] = coerce_value(key, val)
+    return row
+
+
+def normalize_chao_frame(df):
+    """
+    Casts a stats frame to the declared dtypes. Columns that already have the
+    right dtype are left alone, so this is cheap on frames read from typed files.
+    """
+    if df.empty and len(df.columns) <= 1:
+        return df
+    df = df.copy()
+    for col in df.columns:
+        kind = column_kind(col)
+        series = df[col]
+        if kind == 'time':
+            if not pd.api.types.is_datetime64_any_dtype(series):
+                df[col] = pd.to_datetime(series.map(coerce_datetime), errors='coerce')
+        elif kind == 'int':
+            if not pd.api.types.is_integer_dtype(series):
+                df[col] = pd.to_numeric(series, errors='coerce').fillna(0).astype('int64')
+        elif kind == 'category':
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                df[col] = series.map(lambda v: "" if v is None or v != v else str(v)).astype('category')
+            elif series.isna().any():
+                if "" not in series.cat.categories:
+                    series = series.cat.add_categories([""])
+                df[col] = series.fillna("")
+        elif kind == 'string':
+            df[col] = series.map(_coerce_str).astype(object)
+        elif series.isna().any():
+            # Undeclared columns keep the old fillna(0) behaviour.
+            numeric = pd.api.types.is_numeric_dtype(series)
+            df[col] = series.fillna(0) if numeric else series.astype(object).fillna(0)
+    columns = ['date'] + [c for c in df.columns if c != 'date']
+    return df[columns].reset_index(drop=True)
+
+
+def arrow_schema(df):
+    """Declared Arrow types for known columns; anything else is inferred by pyarrow."""
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    fields = []
+    for field in inferred:
+        kind = column_kind(field.name)
+        fields.append(pa.field(field.name, ARROW_TYPES[kind]) if kind else field)
+    return pa.schema(fields, metadata={SCHEMA_KEY: SCHEMA_VERSION})
+
+
+def _count_file(kind):
+    with _file_counts_lock:
+        FILE_COUNTS[kind] += 1
+
+
+def write_chao_frame(df, path):
+    """Normalizes and writes a stats frame as a typed parquet file. Returns the file size in bytes."""
+    df = normalize_chao_frame(df)
+    table = pa.Table.from_pandas(df, schema=arrow_schema(df), preserve_index=False)
+    pq.write_table(table, path)
+    _count_file("written")
+    return os.path.getsize(path)
+
+
+def read_chao_frame(path, upgrade=True):
+    """
+    Reads a stats parquet file. Files written before the schema existed are
+    normalized and, with upgrade=True, rewritten typed so later reads skip the casts.
+    """
+    table = pq.read_table(path)
+    _count_file("read")
+    df = table.to_pandas()
+    if (table.schema.metadata or {}).get(SCHEMA_KEY) == SCHEMA_VERSION:
+        return df
+    df = normalize_chao_frame(df)
+    if upgrade:
+        write_chao_frame(df, path)
+    return df
@@ -0,0 +1,187 @@
+# storage/segment_store.py
+
+import os
+import re
+import contextlib
+import threading
+import pandas as pd
+from datetime import datetime
+from storage.parquet_store import ParquetStore, apply_today_row
+from storage.schema import coerce_chao_row, normalize_chao_frame, read_chao_frame, write_chao_frame
+
+SEGMENT_RE = re.compile(r"\.seg-(\d+)\.parquet$")
+
+
+class SegmentStore(ParquetStore):
+    """
+    Parquet storage where a chao's history is an append-only log instead of a
+    single file that is rewritten on every save.
+
+    For database/.../Chow/Chow_stats.parquet the files are:
+      Chow_stats.hot.parquet        - today's row (and any days not compacted yet)
+      Chow_stats.seg-00001.parquet  - immutable, compacted older days
+      Chow_stats.parquet            - a legacy full-history file, read as the oldest segment
+
+    A save only reads and rewrites the hot segment, so its cost does not grow
+    with the chao's age. compact() moves finished days from the hot segment into
+    a new immutable segment once enough of them have piled up. Inventories keep
+    the plain parquet layout.
+    """
+
+    def __init__(self, hot_max_days=7):
+        self.hot_max_days = hot_max_days
+        # Stats paths saved since startup; only these can have days to compact.
+        self.touched = set()
+        self.lock = threading.Lock()
+
+    # ------------------- File layout -------------------
+    @staticmethod
+    def _base(chao_stats_path):
+        return chao_stats_path[:-len(".parquet")] if chao_stats_path.endswith(".parquet") else chao_stats_path
+
+    def _hot_path(self, chao_stats_path):
+        return f"{self._base(chao_stats_path)}.hot.parquet"
+
+    def _segment_paths(self, chao_stats_path):
+        """Legacy file first, then compacted segments in order."""
+        folder = os.path.dirname(chao_stats_path)
+        prefix = os.path.basename(self._base(chao_stats_path)) + ".seg-"
+        if not os.path.isdir(folder):
+            return []
+        segments = sorted(
+            (int(SEGMENT_RE.search(f).group(1)), os.path.join(folder, f))
+            for f in os.listdir(folder)
+            if f.startswith(prefix) and SEGMENT_RE.search(f)
+        )
+        paths = [p for _, p in segments]
+        if os.path.exists(chao_stats_path):
+            paths.insert(0, chao_stats_path)
+        return paths
+
+    def _next_segment_path(self, chao_stats_path):
+        last = 0
+        for path in self._segment_paths(chao_stats_path):
+            match = SEGMENT_RE.search(path)
+            if match:
+                last = max(last, int(match.group(1)))
+        return f"{self._base(chao_stats_path)}.seg-{last + 1:05d}.parquet"
+
+    @staticmethod
+    def _read(path):
+        return read_chao_frame(path) if os.path.exists(path) else pd.DataFrame(columns=['date'])
+
+    # ------------------- Public API -------------------
+    def exists(self, path):
+        if not path.endswith("_stats.parquet"):
+            return super().exists(path)
+        return os.path.exists(self._hot_path(path)) or bool(self._segment_paths(path))
+
+    def load_chao_stats(self, chao_stats_path):
+        parts = [read_chao_frame(p) for p in self._segment_paths(chao_stats_path)]
+        hot_path = self._hot_path(chao_stats_path)
+        if os.path.exists(hot_path):
+            parts.append(read_chao_frame(hot_path))
+        parts = [p for p in parts if not p.empty]
+        if not parts:
+            return pd.DataFrame(columns=['date'])
+
+        if len(parts) == 1:
+            return parts[0]
+        # A crash between writing a segment and trimming the hot file can leave
+        # the same day in both; the later copy wins. Segments may disagree on
+        # categories/columns, so the concatenation is normalized once more.
+        df = pd.concat(parts, ignore_index=True).drop_duplicates(subset='date', keep='last')
+        return normalize_chao_frame(df)
+
+    def save_chao_stats(self, chao_stats_path, chao_df, chao_stats):
+        """
+        Overwrites or appends today's row in the hot segment. chao_df is accepted
+        for signature compatibility only; compacted days are never touched.
+        Returns the number of bytes written.
+        """
+        row = coerce_chao_row({k: v for k, v in chao_stats.items() if k != 'date'})
+        hot_path = self._hot_path(chao_stats_path)
+
+        with self.lock:
+            written = write_chao_frame(apply_today_row(self._read(hot_path), row), hot_path)
+            self.touched.add(chao_stats_path)
+        return written
+
+    def write_chao_stats(self, chao_stats_path, chao_df):
+        """
+        Replaces the whole history: everything before today becomes one fresh
+        segment and today's row (if any) becomes the hot segment.
+        """
+        current_date_str = datetime.now().strftime("%Y-%m-%d")
+        chao_df = normalize_chao_frame(chao_df)
+        with self.lock:
+            for path in self._segment_paths(chao_stats_path):
+                os.remove(path)
+            hot_path = self._hot_path(chao_stats_path)
+            if os.path.exists(hot_path):
+                os.remove(hot_path)
+
+            older = chao_df[chao_df['date'] != current_date_str]
+            today = chao_df[chao_df['date'] == current_date_str]
+            if not older.empty:
+                write_chao_frame(older, self._next_segment_path(chao_stats_path))
+            if not today.empty:
+                write_chao_frame(today, hot_path)
+
+    def move_chao(self, old_stats_path, new_stats_path):
+        """
+        /rename and /goodbye already moved (and renamed) the segment files along
+        with the folder; only the compaction bookkeeping needs to follow.
+        """
+        with self.lock:
+            if old_stats_path in self.touched:
+                self.touched.discard(old_stats_path)
+                self.touched.add(new_stats_path)
+
+    def note_external_save(self, chao_stats_path):
+        """A decay worker process appended to this chao's hot segment; compact it like our own saves."""
+        with self.lock:
+            self.touched.add(chao_stats_path)
+
+    def compact(self, chao_stats_path, force=False):
+        """
+        Moves finished days out of the hot segment into a new immutable segment.
+        Runs once the hot segment holds hot_max_days finished days (or always
+        with force=True). Returns the number of rows moved.
+        """
+        current_date_str = datetime.now().strftime("%Y-%m-%d")
+        with self.lock:
+            hot_path = self._hot_path(chao_stats_path)
+            if not os.path.exists(hot_path):
+                return 0
+            hot_df = read_chao_frame(hot_path)
+            finished = hot_df[hot_df['date'] != current_date_str]
+            if finished.empty or (len(finished) < self.hot_max_days and not force):
+                return 0
+
+            # Segment first, then trim the hot file; load() tolerates the overlap.
+            write_chao_frame(finished, self._next_segment_path(chao_stats_path))
+            remaining = hot_df[hot_df['date'] == current_date_str]
+            if remaining.empty:
+                os.remove(hot_path)
+            else:
+                write_chao_frame(remaining, hot_path)
+            return len(finished)
+
+    def compact_all(self, access=None):
+        """
+        Background job: compact every chao saved since startup. access(path), if
+        given, is a context manager held around each chao's compaction; DataUtils
+        passes its _chao_access so a decay worker process can't append to the hot
+        segment between the read and the rewrite here.
+        """
+        moved = 0
+        for chao_stats_path in list(self.touched):
+            try:
+                with access(chao_stats_path) if access else contextlib.nullcontext():
+                    moved += self.compact(chao_stats_path)
+            except Exception as e:
+                print(f"[SegmentStore] Failed to compact {chao_stats_path}: {e}")
+            if not os.path.exists(self._hot_path(chao_stats_path)):
+                self.touched.discard(chao_stats_path)
+        return moved
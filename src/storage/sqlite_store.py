@@ -0,0 +1,278 @@
+# storage/sqlite_store.py
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import threading
+import pandas as pd
+from datetime import datetime
+from storage.schema import coerce_chao_row, normalize_chao_frame
+from storage.segment_store import SegmentStore
+
+# <name>_stats.parquet (plain/legacy), <name>_stats.hot.parquet and <name>_stats.seg-NNNNN.parquet (segments).
+STATS_FILE_RE = re.compile(r"^(?P<base>.+_stats)(?:\.hot|\.seg-\d+)?\.parquet$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chao_stats (
+    guild_id  TEXT NOT NULL,
+    user_id   TEXT NOT NULL,
+    chao_name TEXT NOT NULL,
+    date      TEXT NOT NULL,
+    data      TEXT NOT NULL,
+    PRIMARY KEY (guild_id, user_id, chao_name, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS inventory (
+    guild_id  TEXT NOT NULL,
+    user_id   TEXT NOT NULL,
+    date      TEXT NOT NULL,
+    data      TEXT NOT NULL,
+    PRIMARY KEY (guild_id, user_id, date)
+) WITHOUT ROWID;
+"""
+
+
+def _json_default(value):
+    """Make numpy scalars and timestamps JSON serializable."""
+    if value is pd.NaT:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class SQLiteStore:
+    """
+    Keeps chao stats, chao history and inventories in a single WAL-mode SQLite
+    database. Rows are keyed by (guild_id, user_id, chao_name, date); the row
+    itself is stored as a JSON object since chao stats have no fixed columns.
+
+    The cogs still hand us the same database/<guild>/<user>/... paths they
+    always have, and the keys are derived from them, so nothing upstream has to
+    change. A save only touches today's row instead of rewriting the history.
+    """
+
+    def __init__(self, db_path, database_dir):
+        self.db_path = str(db_path)
+        self.database_dir = os.path.abspath(database_dir)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ------------------- Path -> key -------------------
+    def _keys(self, path):
+        """
+        Turns database/<guild_id> (name)/<user_id> (account) (display)/.../<file>
+        into (guild_id, user_id, chao_name). chao_name is None for inventories.
+        Folders without a leading ID (e.g. 'Chao Forest') are used as-is.
+        """
+        rel = os.path.relpath(os.path.abspath(path), self.database_dir)
+        parts = rel.split(os.sep)
+        if len(parts) < 3 or parts[0] == "..":
+            raise ValueError(f"Path is not inside the database folder: {path}")
+
+        def folder_key(folder):
+            head = folder.split(" ")[0]
+            return head if head.isdigit() else folder
+
+        guild_id, user_id = folder_key(parts[0]), folder_key(parts[1])
+        if parts[-1] == "inventory.parquet":
+            return guild_id, user_id, None
+        return guild_id, user_id, parts[-2]
+
+    # ------------------- Row helpers -------------------
+    def _read_rows(self, query, params):
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [{**json.loads(data), 'date': date} for date, data in rows]
+
+    @staticmethod
+    def _to_frame(records):
+        if not records:
+            return pd.DataFrame(columns=['date'])
+        df = pd.DataFrame(records).fillna(0)
+        columns = ['date'] + [c for c in df.columns if c != 'date']
+        return df[columns]
+
+    # ------------------- Public API (mirrors ParquetStore) -------------------
+    def exists(self, path):
+        guild_id, user_id, chao_name = self._keys(path)
+        with self.lock:
+            if chao_name is None:
+                row = self.conn.execute(
+                    "SELECT 1 FROM inventory WHERE guild_id=? AND user_id=? LIMIT 1",
+                    (guild_id, user_id)
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    "SELECT 1 FROM chao_stats WHERE guild_id=? AND user_id=? AND chao_name=? LIMIT 1",
+                    (guild_id, user_id, chao_name)
+                ).fetchone()
+        return row is not None
+
+    def load_inventory(self, path):
+        guild_id, user_id, _ = self._keys(path)
+        return self._to_frame(self._read_rows(
+            "SELECT date, data FROM inventory WHERE guild_id=? AND user_id=? ORDER BY date",
+            (guild_id, user_id)
+        ))
+
+    def save_inventory(self, path, inventory_df, current_inventory):
+        """
+        Upserts today's inventory row. Keys already stored for today but missing
+        from current_inventory are kept, matching the parquet behaviour.
+        """
+        guild_id, user_id, _ = self._keys(path)
+        current_date_str = datetime.now().strftime("%Y-%m-%d")
+        current_inventory.setdefault('Chao Egg', 0)
+        row = {k: v for k, v in current_inventory.items() if k != 'date'}
+
+        with self.lock, self.conn:
+            existing = self.conn.execute(
+                "SELECT data FROM inventory WHERE guild_id=? AND user_id=? AND date=?",
+                (guild_id, user_id, current_date_str)
+            ).fetchone()
+            if existing:
+                row = {**json.loads(existing[0]), **row}
+            self.conn.execute(
+                "INSERT OR REPLACE INTO inventory (guild_id, user_id, date, data) VALUES (?, ?, ?, ?)",
+                (guild_id, user_id, current_date_str, json.dumps(row, default=_json_default))
+            )
+
+    def write_inventory(self, path, inventory_df):
+        guild_id, user_id, _ = self._keys(path)
+        rows = [
+            (guild_id, user_id, str(rec.pop('date')), json.dumps(rec, default=_json_default))
+            for rec in inventory_df.to_dict('records')
+        ]
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM inventory WHERE guild_id=? AND user_id=?", (guild_id, user_id))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO inventory (guild_id, user_id, date, data) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def load_chao_stats(self, chao_stats_path):
+        guild_id, user_id, chao_name = self._keys(chao_stats_path)
+        return normalize_chao_frame(self._to_frame(self._read_rows(
+            "SELECT date, data FROM chao_stats WHERE guild_id=? AND user_id=? AND chao_name=? ORDER BY date",
+            (guild_id, user_id, chao_name)
+        )))
+
+    def save_chao_stats(self, chao_stats_path, chao_df, chao_stats):
+        """
+        Upserts today's row for this chao. chao_df is accepted for signature
+        compatibility only; older rows are never rewritten. Returns the size
+        of the stored JSON row in bytes.
+        """
+        guild_id, user_id, chao_name = self._keys(chao_stats_path)
+        current_date_str = datetime.now().strftime("%Y-%m-%d")
+        row = coerce_chao_row({k: v for k, v in chao_stats.items() if k != 'date'})
+
+        with self.lock, self.conn:
+            existing = self.conn.execute(
+                "SELECT data FROM chao_stats WHERE guild_id=? AND user_id=? AND chao_name=? AND date=?",
+                (guild_id, user_id, chao_name, current_date_str)
+            ).fetchone()
+            if existing:
+                row = {**json.loads(existing[0]), **row}
+            data = json.dumps(row, default=_json_default)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO chao_stats (guild_id, user_id, chao_name, date, data) VALUES (?, ?, ?, ?, ?)",
+                (guild_id, user_id, chao_name, current_date_str, data)
+            )
+        return len(data.encode())
+
+    def write_chao_stats(self, chao_stats_path, chao_df):
+        guild_id, user_id, chao_name = self._keys(chao_stats_path)
+        rows = [
+            (guild_id, user_id, chao_name, str(rec.pop('date')),
+             json.dumps(coerce_chao_row(rec), default=_json_default))
+            for rec in chao_df.to_dict('records')
+        ]
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM chao_stats WHERE guild_id=? AND user_id=? AND chao_name=?",
+                (guild_id, user_id, chao_name)
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO chao_stats (guild_id, user_id, chao_name, date, data) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def move_chao(self, old_stats_path, new_stats_path):
+        """Re-keys a chao's history after /rename or /goodbye moved its folder."""
+        old_keys = self._keys(old_stats_path)
+        new_keys = self._keys(new_stats_path)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE chao_stats SET guild_id=?, user_id=?, chao_name=? "
+                "WHERE guild_id=? AND user_id=? AND chao_name=?",
+                (*new_keys, *old_keys)
+            )
+
+    def note_external_save(self, chao_stats_path):
+        """Called after a decay worker process saved this chao over its own connection. WAL keeps readers consistent."""
+        pass
+
+
+def migrate_parquet_tree(database_dir, db_path):
+    """
+    One-shot import of an existing database/ parquet tree (plain or segments
+    layout) into SQLite. Each chao is found by its stats base path and read
+    through SegmentStore, which merges the legacy file, the compacted segments
+    and the hot file. Raises ValueError, before anything is imported, if the
+    tree holds parquet files that are neither. Existing rows for the same keys
+    are replaced, so it is safe to re-run.
+    """
+    chao_paths, inventory_paths, unknown = set(), [], []
+    for root, _, files in os.walk(database_dir):
+        for filename in files:
+            if not filename.endswith(".parquet"):
+                continue
+            path = os.path.join(root, filename)
+            match = STATS_FILE_RE.match(filename)
+            if filename == "inventory.parquet":
+                inventory_paths.append(path)
+            elif match:
+                chao_paths.add(os.path.join(root, f"{match.group('base')}.parquet"))
+            else:
+                unknown.append(path)
+    if unknown:
+        raise ValueError(f"Unrecognised parquet file(s) under {database_dir}: {', '.join(sorted(unknown))}")
+
+    reader = SegmentStore()
+    store = SQLiteStore(db_path, database_dir)
+    try:
+        for path in sorted(inventory_paths):
+            store.write_inventory(path, reader.load_inventory(path))
+        for path in sorted(chao_paths):
+            store.write_chao_stats(path, reader.load_chao_stats(path))
+    finally:
+        store.close()
+    print(f"[migrate_parquet_tree] Imported {len(chao_paths)} chao and {len(inventory_paths)} inventories into {db_path}")
+    return len(chao_paths), len(inventory_paths)
+
+
+if __name__ == "__main__":
+    from config import DATABASE_DIR, SQLITE_DB_PATH
+
+    if len(sys.argv) not in (1, 3):
+        print("Usage: python -m storage.sqlite_store [<database_dir> <db_path>]", file=sys.stderr)
+        sys.exit(1)
+
+    database_dir = sys.argv[1] if len(sys.argv) == 3 else DATABASE_DIR
+    db_path = sys.argv[2] if len(sys.argv) == 3 else SQLITE_DB_PATH
+    migrate_parquet_tree(database_dir, db_path)
@@ -6,14 +6,12 @@ from config import MARKET_PERSISTENT_VIEWS_FILE
 
 class MarketView(View):
     def __init__(self, embed: discord.Embed, icon_path: str, thumbnail_path: str,
-                 page_1_path: str, page_2_path: str, black_market_cog, total_pages=3, current_page: int = None,
+                 black_market_cog, total_pages=3, current_page: int = None,
                  state_file: str = MARKET_PERSISTENT_VIEWS_FILE):
         super().__init__(timeout=None)
         self.embed = embed
         self.icon_path = icon_path
         self.thumbnail_path = thumbnail_path
-        self.page_1_path = page_1_path
-        self.page_2_path = page_2_path
         self.black_market_cog = black_market_cog
         self.total_pages = total_pages
         self.state_file = state_file
@@ -79,9 +77,6 @@ class MarketView(View):
         """
         fruit_prices = self.black_market_cog.load_fruit_prices()
 
-        page_1_output_path = self.page_1_path
-        page_2_output_path = self.page_2_path
-
         attachments = [
             discord.File(self.icon_path, filename="Black_Market.png"),
             discord.File(self.thumbnail_path, filename="black_market.png"),
@@ -90,13 +85,13 @@ class MarketView(View):
 
         try:
             if self.current_page == 1:
-                self.black_market_cog.image_utils.paste_black_market_prices_page1(
+                page_image = self.black_market_cog.image_utils.paste_black_market_prices_page1(
                     self.black_market_cog.BLACK_MARKET_FRUITS_PAGE_1_PATH,
-                    page_1_output_path,
+                    None,
                     fruit_prices
                 )
                 image_filename = "black_market_fruits_page_1.png"
-                attachments.append(discord.File(page_1_output_path, filename=image_filename))
+                attachments.append(discord.File(page_image, filename=image_filename))
                 self.embed.clear_fields()
                 self.embed.description = "Buy somethin' will ya?"
                 self.embed.add_field(name="Shop Type", value="Fruits", inline=True)
@@ -104,13 +99,13 @@ class MarketView(View):
                 self.embed.set_footer(text=f"Page {self.current_page} / {self.total_pages}")
 
             elif self.current_page == 2:
-                self.black_market_cog.image_utils.paste_black_market_prices_page2(
+                page_image = self.black_market_cog.image_utils.paste_black_market_prices_page2(
                     self.black_market_cog.BLACK_MARKET_FRUITS_PAGE_2_PATH,
-                    page_2_output_path,
+                    None,
                     fruit_prices
                 )
                 image_filename = "black_market_fruits_page_2.png"
-                attachments.append(discord.File(page_2_output_path, filename=image_filename))
+                attachments.append(discord.File(page_image, filename=image_filename))
                 self.embed.clear_fields()
                 self.embed.description = "These ones are a bit more expensive:"
                 self.embed.add_field(name="Shop Type", value="Fruits", inline=True)
@@ -174,15 +169,8 @@ class MarketView(View):
             embed=discord.Embed(),  # Optionally, reconstruct or create a new embed.
             icon_path=getattr(cog, "BLACK_MARKET_ICON_PATH", ""),
             thumbnail_path=getattr(cog, "BLACK_MARKET_THUMBNAIL_PATH", ""),
-            page_1_path=getattr(cog, "BLACK_MARKET_FRUITS_PAGE_1_PATH", ""),
-            page_2_path=getattr(cog, "BLACK_MARKET_FRUITS_PAGE_2_PATH", ""),
             black_market_cog=cog,
             total_pages=view_data["total_pages"],
             current_page=view_data.get("current_page", 1),
             state_file=MARKET_PERSISTENT_VIEWS_FILE
         )
-
-    @staticmethod
-    def _write_json(file_path: str, data: dict):
-        with open(file_path, "w") as f:
-            json.dump(data, f)
@@ -6,6 +6,7 @@ from discord.ui import View, Button
 from discord.ext import commands
 from typing import List, Tuple, Dict
 from config import PAGE1_TICK_POSITIONS, PAGE2_TICK_POSITIONS, STATS_PERSISTENT_VIEWS_FILE
+from storage.records import ChaoState
 
 class StatsView(View):
     def __init__(
@@ -145,21 +146,20 @@ class StatsView(View):
         if not member:
             return await self._send(interaction, content="Error: Could not find the user in this guild.", ephemeral=True)
 
-        chao_dir = self.data_utils.get_path(self.guild_id, guild.name, member, 'chao_data', self.chao_name)
+        chao_dir = await self.data_utils.aget_path(self.guild_id, guild.name, member, 'chao_data', self.chao_name)
         chao_stats_path = os.path.join(chao_dir, f'{self.chao_name}_stats.parquet')
-        chao_df = self.data_utils.load_chao_stats(chao_stats_path)
+        chao_df = await self.data_utils.aload_chao_stats(chao_stats_path)
         if chao_df.empty:
             return await self._send(interaction, content="No stats data available for this Chao.", ephemeral=True)
-        chao_to_view = chao_df.iloc[-1].to_dict()
-        image_path = os.path.join(chao_dir, f'{self.chao_name}_stats_page_{self.current_page}.png')
+        chao_to_view = ChaoState.from_frame(chao_df)
 
         if self.current_page == 1:
             stats = ['power', 'swim', 'fly', 'run', 'stamina']
-            await asyncio.to_thread(
+            stats_page = await asyncio.to_thread(
                 self.image_utils.paste_page1_image,
                 self.template_path,
                 self.overlay_path,
-                image_path,
+                None,
                 self.page1_tick_positions,
                 *[chao_to_view.get(f"{stat}_ticks", 0) for stat in stats],
                 *[chao_to_view.get(f"{stat}_level", 0) for stat in stats],
@@ -167,11 +167,11 @@ class StatsView(View):
             )
         else:
             stats_values = {stat: chao_to_view.get(f"{stat}_ticks", 0) for stat in self.page2_tick_positions}
-            await asyncio.to_thread(
+            stats_page = await asyncio.to_thread(
                 self.image_utils.paste_page2_image,
                 self.template_page_2_path,
                 self.overlay_path,
-                image_path,
+                None,
                 self.page2_tick_positions,
                 stats_values
             )
@@ -187,7 +187,7 @@ class StatsView(View):
         await interaction.response.edit_message(
             embed=embed,
             attachments=[
-                discord.File(image_path, "stats_page.png"),
+                discord.File(stats_page, "stats_page.png"),
                 discord.File(self.icon_path, filename="Stats.png"),
                 discord.File(os.path.join(chao_dir, f'{self.chao_name}_thumbnail.png'), "chao_thumbnail.png"),
             ],
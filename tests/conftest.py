@@ -0,0 +1,30 @@
+import os
+import sys
+
+# The bot runs from src/ and imports its modules top-level (config, storage, cogs, ...).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pytest
+
+
+@pytest.fixture
+def bot():
+    from benchmarks.decay_bench import FakeBot, fake_guilds
+    return FakeBot(fake_guilds(1, 2))
+
+
+@pytest.fixture
+def data_utils(bot, tmp_path):
+    from cogs.data_utils import DataUtils
+    du = DataUtils(bot, database_path=str(tmp_path / "database"), backend="segments")
+    bot.cogs["DataUtils"] = du
+    yield du
+    du.io_pool.shutdown(wait=True)
+
+
+@pytest.fixture
+def chao_path(bot, data_utils):
+    """Stats path of a chao named Chow owned by the first fake member."""
+    guild = bot.guilds[0]
+    member = next(iter(guild.members.values()))
+    return data_utils.get_path(guild.id, guild.name, member, "chao_data/Chow", "Chow_stats.parquet")
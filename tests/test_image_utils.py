@@ -0,0 +1,55 @@
+import os
+
+from PIL import Image
+
+from cogs.image_utils import AssetCache, ImageUtils
+
+
+def png(path, color, size=(80, 80)):
+    Image.new("RGBA", size, color).save(path)
+    return str(path)
+
+
+def test_asset_cache_reuses_decodes_until_the_file_changes(tmp_path):
+    cache = AssetCache(max_bytes=1 << 20)
+    path = png(tmp_path / "a.png", (255, 0, 0, 255))
+
+    first = cache.get(path, size=(70, 70))
+    assert cache.get(path, size=(70, 70)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    png(path, (0, 255, 0, 255))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert cache.get(path, size=(70, 70)).getpixel((0, 0)) == (0, 255, 0, 255)
+    assert cache.misses == 2
+
+
+def test_asset_cache_evicts_least_recently_used(tmp_path):
+    one_image = 10 * 10 * 4
+    cache = AssetCache(max_bytes=2 * one_image)
+    paths = [png(tmp_path / f"{i}.png", (i, 0, 0, 255), size=(10, 10)) for i in range(3)]
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert cache.evictions == 1
+    assert cache.stats()["resident_bytes"] == 2 * one_image
+    cache.get(paths[0])
+    assert cache.hits == 2
+
+
+def test_combine_images_with_face_returns_a_png_buffer(tmp_path):
+    utils = ImageUtils(bot=None)
+    layers = [png(tmp_path / f"{name}.png", color) for name, color in
+              [("bg", (0, 0, 255, 255)), ("chao", (0, 0, 0, 0)), ("eyes", (0, 0, 0, 0)), ("mouth", (0, 0, 0, 0))]]
+
+    buffer = utils.combine_images_with_face(*layers)
+    assert buffer.tell() == 0
+    with Image.open(buffer) as img:
+        assert (img.format, img.size) == ("PNG", (70, 70))
+
+    output_path = tmp_path / "thumbnail.png"
+    kept = utils.combine_images_with_face(*layers, output_path=str(output_path))
+    assert output_path.read_bytes() == kept.getvalue()
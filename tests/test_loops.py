@@ -0,0 +1,188 @@
+import asyncio
+import time
+
+from benchmarks.decay_bench import generate_population
+
+
+async def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the loop's before_loop hook")
+        await asyncio.sleep(0.01)
+
+
+async def start_decay(bot, data_utils, tmp_path):
+    """Loads ChaoDecay the way the bot does and waits for its scheduler to start."""
+    from cogs.chao_decay import ChaoDecay
+
+    decay = ChaoDecay(bot, workers=0, notices_file=tmp_path / "hp_notices.json")
+    bot.cogs["ChaoDecay"] = decay
+    await decay.cog_load()
+    await wait_for(lambda: decay.started_at is not None)
+    return decay
+
+
+async def stop(cog):
+    cog.cog_unload()
+    await asyncio.sleep(0)
+
+
+def test_decay_loop_builds_schedule_on_start(bot, data_utils, tmp_path):
+    generate_population(data_utils, bot.guilds, chao_per_user=3, days=5, idle_hours=2)
+
+    async def run():
+        decay = await start_decay(bot, data_utils, tmp_path)
+        try:
+            assert len(decay.schedule) > 0
+            assert decay.schedule.next_due() is not None
+        finally:
+            await stop(decay)
+
+    asyncio.run(run())
+
+
+def test_decay_lag_counts_missed_deadlines_from_startup(bot, data_utils, tmp_path):
+    from datetime import datetime, timedelta
+
+    generate_population(data_utils, bot.guilds, chao_per_user=3, days=5, idle_hours=2)
+
+    async def run():
+        before = datetime.now()
+        decay = await start_decay(bot, data_utils, tmp_path)
+        try:
+            assert before <= decay.started_at <= datetime.now()
+            # A deadline that passed an hour before startup (the bot was down).
+            key = decay.schedule.pop_due(datetime.max)[0]
+            decay.schedule.push(key, datetime.now().replace(microsecond=0) - timedelta(hours=1))
+            decay.wake.set()
+            await wait_for(lambda: decay.sweep_history)
+            batch = decay.sweep_history[-1]
+            assert batch["chao"] >= 1
+            assert batch["lag"] < 60
+        finally:
+            await stop(decay)
+
+    asyncio.run(run())
+
+
+def test_notify_loop_restores_saved_notices(bot, data_utils, tmp_path):
+    from datetime import datetime
+    from cogs.chao_decay import HpNoticeQueue
+
+    saved = HpNoticeQueue(tmp_path / "hp_notices.json", window_minutes=60, per_minute=10)
+    saved.add(bot.guilds[0].id, 42, "Chow", 3, 3, datetime.now())
+    saved.save()
+
+    async def run():
+        decay = await start_decay(bot, data_utils, tmp_path)
+        try:
+            await wait_for(lambda: len(decay.notices))
+            assert decay.notices.get(f"{bot.guilds[0].id}:42")["chao"]["Chow"]["hp"] == 3
+        finally:
+            await stop(decay)
+        # Shutting down keeps the restored notice on disk instead of wiping the file.
+        restored = HpNoticeQueue(tmp_path / "hp_notices.json", window_minutes=60, per_minute=10)
+        restored.load()
+        assert len(restored) == 1
+
+    asyncio.run(run())
+
+
+def test_decay_waits_for_a_command_holding_the_chao(bot, data_utils, tmp_path):
+    from datetime import datetime, timedelta
+
+    generate_population(data_utils, bot.guilds, chao_per_user=1, days=5, idle_hours=2)
+
+    async def run():
+        decay = await start_decay(bot, data_utils, tmp_path)
+        try:
+            key = decay.schedule.pop_due(datetime.max)[0]
+            lock = data_utils.io_lock(key)
+            await lock.acquire()
+            decay.schedule.push(key, datetime.now().replace(microsecond=0) - timedelta(minutes=1))
+            decay.wake.set()
+            await asyncio.sleep(0.2)
+            assert not decay.sweep_history, "decayed a chao a command had loaded"
+            lock.release()
+            await wait_for(lambda: decay.sweep_history)
+            assert decay.sweep_history[-1]["chao"] >= 1
+        finally:
+            await stop(decay)
+
+    asyncio.run(run())
+
+
+def test_cocoon_timers_skip_restarted_entries():
+    from datetime import datetime, timedelta
+    from cogs.chao_lifecycle import CocoonTimers
+
+    timers = CocoonTimers("unused.json")
+    now = datetime.now().replace(microsecond=0)
+    timers.add("evolve", 1, 2, "Chow", None, now - timedelta(seconds=5))
+    # Restarting a cocoon leaves its first heap item behind as stale.
+    timers.add("evolve", 1, 2, "Chow", None, now + timedelta(seconds=60))
+    timers.add("death", 1, 2, "Bean", None, now - timedelta(seconds=1))
+
+    assert [key for key, _ in timers.pop_due(now)] == ["1:2:Bean"]
+    assert timers.next_due() == now + timedelta(seconds=60)
+    assert "1:2:Chow" in timers
+
+
+def test_cocoon_loop_restores_saved_timers(bot, data_utils, tmp_path):
+    from datetime import datetime, timedelta
+    from cogs.chao_lifecycle import ChaoLifecycle, CocoonTimers
+
+    saved = CocoonTimers(tmp_path / "cocoons.json")
+    saved.add("evolve", bot.guilds[0].id, 42, "Chow", None, datetime.now() + timedelta(hours=1))
+    saved.save()
+
+    async def run():
+        lifecycle = ChaoLifecycle(bot)
+        lifecycle.cocoons = CocoonTimers(tmp_path / "cocoons.json")
+        await lifecycle.cog_load()
+        try:
+            await wait_for(lambda: len(lifecycle.cocoons))
+            assert CocoonTimers.key(bot.guilds[0].id, 42, "Chow") in lifecycle.cocoons
+        finally:
+            await stop(lifecycle)
+
+    asyncio.run(run())
+
+
+def test_finish_cocoon_waits_for_a_command_holding_the_chao(bot, data_utils, chao_path):
+    from datetime import date
+    from types import SimpleNamespace
+
+    import pandas as pd
+    from cogs.chao_lifecycle import ChaoLifecycle, CocoonTimers
+    from decorators import request_context
+
+    guild = bot.guilds[0]
+    member = next(iter(guild.members.values()))
+    data_utils.write_chao_stats(chao_path, pd.DataFrame([{
+        "date": date.today().isoformat(), "hp_ticks": 5, "happiness_ticks": 5,
+        "Type": "neutral_run_2", "run_grade": "C", "evolve_cacoon": 1, "evolved": 0,
+    }]))
+    lifecycle = ChaoLifecycle(bot)
+    lifecycle.data_utils = data_utils
+    entry = {"kind": "evolve", "guild_id": guild.id, "user_id": member.id, "chao_name": "Chow", "channel_id": None}
+    interaction = SimpleNamespace(guild=guild, user=member, extras={})
+
+    async def run():
+        # A command that got past ensure_not_in_cacoon once the deadline passed.
+        async with request_context(interaction, data_utils) as req:
+            _, latest = await req.load_chao("Chow")
+            finishing = asyncio.create_task(
+                lifecycle.finish_cocoon(CocoonTimers.key(guild.id, member.id, "Chow"), entry)
+            )
+            await asyncio.sleep(0.1)
+            latest["happiness_ticks"] = 6
+            req.stage_chao("Chow")
+        await finishing
+
+    asyncio.run(run())
+    latest = data_utils.load_chao_stats(chao_path, settle=False).iloc[-1]
+    assert (latest["evolve_cacoon"], latest["evolved"]) == (0, 1)
+    assert latest["run_grade"] == "B"
+    assert latest["happiness_ticks"] == 6
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import threading
+from types import SimpleNamespace
+
+
+def record_renames(data_utils, monkeypatch):
+    """Wraps _rename_folder to note which thread each rename ran on."""
+    threads = []
+    rename = data_utils._rename_folder
+
+    def recorded(current_path, correct_path):
+        threads.append(threading.current_thread())
+        return rename(current_path, correct_path)
+
+    monkeypatch.setattr(data_utils, "_rename_folder", recorded)
+    return threads
+
+
+def test_member_rename_moves_the_folder_off_the_event_loop(bot, data_utils, chao_path, monkeypatch):
+    guild = bot.guilds[0]
+    member = next(iter(guild.members.values()))
+    threads = record_renames(data_utils, monkeypatch)
+    renamed = SimpleNamespace(id=member.id, name=member.name, display_name="Renamed", guild=guild)
+
+    async def run():
+        await data_utils.on_member_update(SimpleNamespace(name=member.name, display_name=member.display_name), renamed)
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(run())
+    assert len(threads) == 1 and threads[0] is not loop_thread
+    user_folder = data_utils.user_folders[(guild.id, member.id)]
+    assert user_folder.endswith("(Renamed)")
+    assert os.path.isdir(os.path.join(data_utils.update_server_folder(guild), user_folder, "chao_data", "Chow"))
+
+
+def test_guild_rename_moves_the_folder_off_the_event_loop(bot, data_utils, chao_path, monkeypatch):
+    guild = bot.guilds[0]
+    threads = record_renames(data_utils, monkeypatch)
+    renamed = SimpleNamespace(id=guild.id, name="Renamed Guild")
+
+    async def run():
+        await data_utils.on_guild_update(SimpleNamespace(name=guild.name), renamed)
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(run())
+    assert len(threads) == 1 and threads[0] is not loop_thread
+    assert data_utils.guild_folders[guild.id] == f"{guild.id} (Renamed Guild)"
+
+
+def test_chao_autocompletes_read_the_name_index(bot, data_utils, chao_path, monkeypatch):
+    from datetime import date
+
+    import pandas as pd
+    from cogs.chao import Chao
+    from cogs.chao_helper import ChaoHelper
+    from cogs.chao_lifecycle import ChaoLifecycle
+
+    data_utils.write_chao_stats(chao_path, pd.DataFrame([{"date": date.today().isoformat(), "hp_ticks": 7}]))
+    guild = bot.guilds[0]
+    interaction = SimpleNamespace(guild=guild, user=next(iter(guild.members.values())))
+    cogs = [Chao(bot), ChaoHelper(bot), ChaoLifecycle(bot)]
+    for cog in cogs:
+        cog.data_utils = data_utils
+    data_utils.owned_chao_names(guild.id, interaction.user.id)  # manifest loaded, as after startup
+
+    def no_listdir(path):
+        raise AssertionError(f"listed {path}")
+
+    monkeypatch.setattr(os, "listdir", no_listdir)
+
+    async def run():
+        return [
+            await cogs[0].rename_autocomplete(interaction, "ch"),
+            await cogs[1].stats_autocomplete(interaction, "ch"),
+            await cogs[2].feed_chao_autocomplete(interaction, "ch"),
+            await cogs[2].feed_chao_autocomplete(interaction, "zz"),
+        ]
+
+    results = asyncio.run(run())
+    assert [[c.value for c in choices] for choices in results] == [["Chow"], ["Chow"], ["Chow"], []]
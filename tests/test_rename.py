@@ -0,0 +1,49 @@
+import asyncio
+import os
+from datetime import date
+
+import pandas as pd
+
+
+class FakeResponse:
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, content=None, **kwargs):
+        self.messages.append(content)
+
+
+class FakeInteraction:
+    def __init__(self, guild, user):
+        self.guild = guild
+        self.user = user
+        self.user.mention = f"<@{user.id}>"
+        self.response = FakeResponse()
+        self.extras = {}
+
+
+def test_rename_waits_for_the_chao_and_moves_it(bot, data_utils, chao_path):
+    from cogs.chao import Chao
+
+    data_utils.write_chao_stats(chao_path, pd.DataFrame([{"date": date.today().isoformat(), "hp_ticks": 7}]))
+    guild = bot.guilds[0]
+    interaction = FakeInteraction(guild, next(iter(guild.members.values())))
+    chao = Chao(bot)
+    chao.data_utils = data_utils
+    new_path = os.path.join(os.path.dirname(os.path.dirname(chao_path)), "Bean", "Bean_stats.parquet")
+
+    async def run():
+        lock = data_utils.io_lock(chao_path)
+        await lock.acquire()
+        rename = asyncio.create_task(chao.rename(interaction, current_name="Chow", new_name="Bean"))
+        await asyncio.sleep(0.1)
+        assert not rename.done(), "renamed a chao another task had locked"
+        assert os.path.isdir(os.path.dirname(chao_path))
+        lock.release()
+        await rename
+
+    asyncio.run(run())
+    assert "successfully renamed" in interaction.response.messages[-1]
+    assert not os.path.exists(os.path.dirname(chao_path))
+    assert data_utils.load_chao_stats(new_path, settle=False)["hp_ticks"].iloc[-1] == 7
+    assert data_utils.owned_chao_names(guild.id, interaction.user.id) == {"Bean"}
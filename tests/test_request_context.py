@@ -0,0 +1,101 @@
+import asyncio
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from decorators import RequestContext, request_context
+from storage.records import Inventory
+
+
+class FakeInteraction:
+    def __init__(self, guild, user):
+        self.guild = guild
+        self.user = user
+        self.extras = {}
+
+
+@pytest.fixture
+def interaction(bot):
+    guild = bot.guilds[0]
+    return FakeInteraction(guild, next(iter(guild.members.values())))
+
+
+@pytest.fixture
+def inventory_path(bot, data_utils, interaction):
+    return data_utils.get_path(bot.guilds[0].id, bot.guilds[0].name, interaction.user, "user_data", "inventory.parquet")
+
+
+def seed_chao(data_utils, chao_path, happiness):
+    data_utils.write_chao_stats(chao_path, pd.DataFrame([
+        {"date": date.today().isoformat(), "hp_ticks": 5, "happiness_ticks": happiness}
+    ]))
+
+
+def stored_happiness(data_utils, chao_path):
+    return data_utils.load_chao_stats(chao_path, settle=False)["happiness_ticks"].iloc[-1]
+
+
+def test_request_context_commits_once_the_outermost_block_exits(data_utils, chao_path, interaction):
+    seed_chao(data_utils, chao_path, happiness=3)
+
+    async def run():
+        async with request_context(interaction, data_utils):
+            async with request_context(interaction, data_utils) as req:
+                _, latest = await req.load_chao("Chow")
+                latest["happiness_ticks"] = 4
+                req.stage_chao("Chow")
+            assert stored_happiness(data_utils, chao_path) == 3
+            assert data_utils.io_lock(chao_path).locked()
+        assert not data_utils.io_lock(chao_path).locked()
+        assert RequestContext.KEY not in interaction.extras
+
+    asyncio.run(run())
+    assert stored_happiness(data_utils, chao_path) == 4
+
+
+def test_request_context_drops_staged_changes_when_the_command_raises(data_utils, chao_path, interaction):
+    seed_chao(data_utils, chao_path, happiness=3)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            async with request_context(interaction, data_utils):
+                async with request_context(interaction, data_utils) as req:
+                    _, latest = await req.load_chao("Chow")
+                    latest["happiness_ticks"] = 9
+                    req.stage_chao("Chow")
+                    raise RuntimeError("command failed")
+        assert not data_utils.io_lock(chao_path).locked()
+        assert RequestContext.KEY not in interaction.extras
+
+    asyncio.run(run())
+    assert stored_happiness(data_utils, chao_path) == 3
+
+
+def test_request_context_keeps_a_concurrent_ring_award(data_utils, interaction, inventory_path):
+    data_utils.save_inventory(inventory_path, pd.DataFrame(), {"rings": 10, "Garden Fruit": 2})
+
+    async def feed(loaded):
+        async with request_context(interaction, data_utils) as req:
+            _, inv = await req.load_inventory()
+            loaded.set()
+            await asyncio.sleep(0.05)
+            req.stage_inventory({"rings": inv["rings"], "Garden Fruit": inv["Garden Fruit"] - 1})
+
+    async def award(loaded):
+        # The same read-modify-write main.py does for a ring award.
+        await loaded.wait()
+        async with data_utils.io_lock(inventory_path):
+            df = await data_utils.aload_inventory(inventory_path)
+            inv = Inventory.from_frame(df)
+            inv["rings"] = inv.get("rings", 0) + 5
+            await data_utils.asave_inventory(inventory_path, df, inv)
+
+    async def run():
+        loaded = asyncio.Event()
+        await asyncio.gather(feed(loaded), award(loaded))
+
+    asyncio.run(run())
+    inv = Inventory.from_frame(data_utils.load_inventory(inventory_path))
+    assert inv["rings"] == 15
+    assert inv["Garden Fruit"] == 1
@@ -0,0 +1,87 @@
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+
+from storage.retention import downsample, nearest_retained_date
+
+TODAY = date(2026, 6, 30)
+
+
+def frame(days_ago):
+    return pd.DataFrame([
+        {"date": (TODAY - timedelta(days=d)).isoformat(), "hp_ticks": d % 10}
+        for d in sorted(days_ago, reverse=True)
+    ])
+
+
+def test_downsample_keeps_daily_then_weekly_then_monthly():
+    df = frame(range(400))
+    trimmed = downsample(df, daily_days=30, weekly_days=180, today=TODAY)
+
+    dates = list(trimmed["date"])
+    assert dates == sorted(dates)
+    recent = [d for d in dates if d > (TODAY - timedelta(days=30)).isoformat()]
+    assert len(recent) == 30
+    # One row per ISO week between 30 and 180 days, one per month beyond.
+    weekly = [date.fromisoformat(d) for d in dates
+              if (TODAY - timedelta(days=180)).isoformat() < d <= (TODAY - timedelta(days=30)).isoformat()]
+    assert len({d.isocalendar()[:2] for d in weekly}) == len(weekly)
+    monthly = [d[:7] for d in dates if d <= (TODAY - timedelta(days=180)).isoformat()]
+    assert len(set(monthly)) == len(monthly)
+    # The newest row always survives.
+    assert dates[-1] == TODAY.isoformat()
+
+
+def test_downsample_returns_short_histories_unchanged():
+    df = frame(range(10))
+    assert downsample(df, 30, 180, today=TODAY) is df
+
+
+def test_nearest_retained_date():
+    df = frame([0, 7, 14])
+    assert nearest_retained_date(df, TODAY.isoformat()) == TODAY.isoformat()
+    assert nearest_retained_date(df, (TODAY - timedelta(days=10)).isoformat()) == (TODAY - timedelta(days=14)).isoformat()
+    assert nearest_retained_date(df, (TODAY - timedelta(days=30)).isoformat()) is None
+    assert nearest_retained_date(pd.DataFrame(), TODAY.isoformat()) is None
+
+
+def test_apply_retention_waits_for_leased_chao(data_utils, chao_path):
+    today = date.today()
+    history = pd.DataFrame([
+        {"date": (today - timedelta(days=d)).isoformat(), "hp_ticks": 5}
+        for d in range(365, -1, -1)
+    ])
+    data_utils.write_chao_stats(chao_path, history)
+
+    data_utils.lease_chao([chao_path])
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(dropped=data_utils.apply_retention("chao", chao_path)))
+    worker.start()
+    worker.join(timeout=0.3)
+    assert worker.is_alive(), "retention rewrote a chao leased to a decay worker"
+    data_utils.release_chao([chao_path], [])
+    worker.join(timeout=5)
+
+    assert result["dropped"] > 0
+    df = data_utils.load_chao_stats(chao_path, settle=False)
+    assert len(df) == 366 - result["dropped"]
+    assert df["date"].iloc[-1] == today.isoformat()
+
+
+def test_apply_retention_rewrites_under_lease(data_utils, chao_path, monkeypatch):
+    today = date.today()
+    data_utils.write_chao_stats(chao_path, pd.DataFrame([
+        {"date": (today - timedelta(days=d)).isoformat(), "hp_ticks": 5} for d in range(365, -1, -1)
+    ]))
+    leased_while_writing = []
+    write = data_utils.store.write_chao_stats
+
+    def checked_write(path, df):
+        leased_while_writing.append(data_utils._cache_key(path) in data_utils.leased)
+        return write(path, df)
+
+    monkeypatch.setattr(data_utils.store, "write_chao_stats", checked_write)
+    assert data_utils.apply_retention("chao", chao_path) > 0
+    assert leased_while_writing == [True]
+    assert not data_utils.leased
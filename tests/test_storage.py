@@ -0,0 +1,144 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from storage.parquet_store import ParquetStore
+from storage.schema import write_chao_frame
+from storage.segment_store import SegmentStore
+from storage.sqlite_store import SQLiteStore, migrate_parquet_tree
+
+
+def day(offset):
+    return (datetime.now() - timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+def history(offsets):
+    return pd.DataFrame([
+        {"date": day(o), "hp_ticks": 10 - o % 10, "belly_ticks": o % 10, "Type": "neutral_normal_1", "run_grade": "C"}
+        for o in offsets
+    ])
+
+
+@pytest.fixture
+def tree(tmp_path):
+    database_dir = tmp_path / "database"
+    user_dir = database_dir / "111 (Test Guild)" / "222 (tester) (Tester)"
+    (user_dir / "chao_data" / "Chow").mkdir(parents=True)
+    (user_dir / "user_data").mkdir()
+    return {
+        "database_dir": str(database_dir),
+        "stats": str(user_dir / "chao_data" / "Chow" / "Chow_stats.parquet"),
+        "inventory": str(user_dir / "user_data" / "inventory.parquet"),
+    }
+
+
+@pytest.fixture(params=["parquet", "segments", "sqlite"])
+def store(request, tree, tmp_path):
+    if request.param == "sqlite":
+        store = SQLiteStore(tmp_path / "chao.sqlite3", tree["database_dir"])
+        yield store
+        store.close()
+    elif request.param == "segments":
+        yield SegmentStore(hot_max_days=2)
+    else:
+        yield ParquetStore()
+
+
+def test_chao_stats_round_trip(store, tree):
+    path = tree["stats"]
+    store.write_chao_stats(path, history([3, 2, 1]))
+    df = store.load_chao_stats(path)
+    store.save_chao_stats(path, df, {"hp_ticks": 4, "belly_ticks": 7, "Type": "hero_run_2", "run_grade": "B"})
+    # A second save on the same day replaces today's row instead of adding one.
+    store.save_chao_stats(path, store.load_chao_stats(path), {"hp_ticks": 3})
+
+    df = store.load_chao_stats(path)
+    assert list(df["date"]) == [day(3), day(2), day(1), day(0)]
+    today = df.iloc[-1]
+    assert int(today["hp_ticks"]) == 3
+    assert int(today["belly_ticks"]) == 7
+    assert today["Type"] == "hero_run_2"
+    assert store.exists(path)
+
+
+def test_inventory_round_trip(store, tree):
+    path = tree["inventory"]
+    assert not store.exists(path)
+    store.save_inventory(path, store.load_inventory(path), {"rings": 100, "Chao Egg": 1})
+    store.save_inventory(path, store.load_inventory(path), {"rings": 40, "Chao Egg": 2})
+
+    df = store.load_inventory(path)
+    assert len(df) == 1
+    assert int(df.iloc[-1]["rings"]) == 40
+    assert int(df.iloc[-1]["Chao Egg"]) == 2
+
+
+def test_migrate_merges_segment_layout(tree, tmp_path):
+    path = tree["stats"]
+    base = path[:-len(".parquet")]
+    # Legacy full-history file, one compacted segment and today's hot file.
+    ParquetStore().write_chao_stats(path, history([6, 5, 4]))
+    write_chao_frame(history([3, 2, 1]), f"{base}.seg-00001.parquet")
+    SegmentStore().save_chao_stats(path, None, {"hp_ticks": 9})
+    ParquetStore().save_inventory(tree["inventory"], pd.DataFrame(), {"rings": 5})
+
+    db_path = tmp_path / "migrated.sqlite3"
+    assert migrate_parquet_tree(tree["database_dir"], db_path) == (1, 1)
+
+    store = SQLiteStore(db_path, tree["database_dir"])
+    try:
+        df = store.load_chao_stats(path)
+        assert list(df["date"]) == [day(o) for o in (6, 5, 4, 3, 2, 1, 0)]
+        assert int(df.iloc[-1]["hp_ticks"]) == 9
+        assert int(store.load_inventory(tree["inventory"]).iloc[-1]["rings"]) == 5
+    finally:
+        store.close()
+
+
+def test_migrate_rejects_unknown_parquet(tree, tmp_path):
+    ParquetStore().write_chao_stats(tree["stats"], history([1]))
+    stray = os.path.join(os.path.dirname(tree["stats"]), "Chow_backup.parquet")
+    history([2]).to_parquet(stray)
+
+    with pytest.raises(ValueError, match="Chow_backup.parquet"):
+        migrate_parquet_tree(tree["database_dir"], tmp_path / "migrated.sqlite3")
+    assert not os.path.exists(tmp_path / "migrated.sqlite3")
+
+
+def test_compaction_keeps_a_decay_worker_save(data_utils, chao_path, monkeypatch):
+    import threading
+    import storage.segment_store as segment_store
+    from storage.records import ChaoState
+
+    store = data_utils.store
+    hot_path = store._hot_path(chao_path)
+    write_chao_frame(history(range(8, -1, -1)), hot_path)
+    store.note_external_save(chao_path)
+
+    def worker_save():
+        # What a decay worker process does with a batch: lease, append today's row, release.
+        data_utils.lease_chao([chao_path])
+        try:
+            SegmentStore().save_chao_stats(chao_path, None, ChaoState({"hp_ticks": 1}))
+        finally:
+            data_utils.release_chao([chao_path], [])
+
+    worker = threading.Thread(target=worker_save)
+    read = segment_store.read_chao_frame
+
+    def read_then_let_the_worker_in(path):
+        df = read(path)
+        if path == hot_path and worker.ident is None:
+            worker.start()
+            worker.join(timeout=0.3)
+        return df
+
+    monkeypatch.setattr(segment_store, "read_chao_frame", read_then_let_the_worker_in)
+    assert store.compact_all(data_utils._chao_access) == 8
+    worker.join(timeout=5)
+
+    df = data_utils.load_chao_stats(chao_path, settle=False)
+    assert len(df) == 9
+    assert df["hp_ticks"].iloc[-1] == 1